@@ -34,13 +34,27 @@ class Settings:
     DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
     DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
     DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_METRICS_ENABLED: bool = os.getenv("DB_METRICS_ENABLED", "False").lower() == "true"
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "200"))  # 0 = no slow query log
+    DB_METRICS_TOP_N: int = int(os.getenv("DB_METRICS_TOP_N", "5"))
+    
+    # SQLite performance profile (applied to every new connection)
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", "268435456"))  # 256 MB
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB (64 MB)
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
     
     # Security
     ENCRYPTION_KEY: str = os.getenv("ENCRYPTION_KEY", "")
+    BLIND_INDEX_KEY: str = os.getenv("BLIND_INDEX_KEY", "")
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_EXPIRATION_HOURS: int = int(os.getenv("JWT_EXPIRATION_HOURS", "24"))
     PASSWORD_SALT_ROUNDS: int = int(os.getenv("PASSWORD_SALT_ROUNDS", "12"))
+    PASSWORD_HASH_TARGET_MS: int = int(os.getenv("PASSWORD_HASH_TARGET_MS", "0"))  # >0 = calibrate rounds to this latency
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
     
     # License
     LICENSE_SECRET_KEY: str = os.getenv(
@@ -61,6 +75,7 @@ class Settings:
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
     AI_DEFAULT_PROVIDER: str = os.getenv("AI_DEFAULT_PROVIDER", "gemini")
     AI_MAX_TOKENS: int = int(os.getenv("AI_MAX_TOKENS", "2000"))
+    AI_CACHE_SECONDS: int = int(os.getenv("AI_CACHE_SECONDS", "0"))  # >0 = reuse identical answers (disk-backed, encrypted)
     
     # E-Nabiz
     ENABIZ_ENABLED: bool = os.getenv("ENABIZ_ENABLED", "False").lower() == "true"
@@ -93,6 +108,7 @@ class Settings:
     NEWS_REFRESH_INTERVAL_MINUTES: int = int(os.getenv("NEWS_REFRESH_INTERVAL_MINUTES", "30"))
     NEWS_RETENTION_DAYS: int = int(os.getenv("NEWS_RETENTION_DAYS", "7"))
     NEWS_NOTIFICATIONS: bool = os.getenv("NEWS_NOTIFICATIONS", "True").lower() == "true"
+    NEWS_FEED_CACHE_SECONDS: int = int(os.getenv("NEWS_FEED_CACHE_SECONDS", "900"))  # 0 = always fetch
     
     # Remote Config
     REMOTE_CONFIG_URL: str = os.getenv("REMOTE_CONFIG_URL", "")
@@ -125,6 +141,12 @@ class Settings:
     RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
     RATE_LIMIT_REQUESTS: int = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
     RATE_LIMIT_WINDOW_SECONDS: int = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+    RATE_LIMIT_LOGIN_ATTEMPTS: int = int(os.getenv("RATE_LIMIT_LOGIN_ATTEMPTS", "5"))
+    RATE_LIMIT_LOGIN_WINDOW_SECONDS: int = int(os.getenv("RATE_LIMIT_LOGIN_WINDOW_SECONDS", "300"))
+    RATE_LIMIT_SMS_REQUESTS: int = int(os.getenv("RATE_LIMIT_SMS_REQUESTS", "5"))
+    RATE_LIMIT_SMS_WINDOW_SECONDS: int = int(os.getenv("RATE_LIMIT_SMS_WINDOW_SECONDS", "3600"))
+    RATE_LIMIT_MAX_IDENTIFIERS: int = int(os.getenv("RATE_LIMIT_MAX_IDENTIFIERS", "10000"))  # LRU cap
+    RATE_LIMIT_SHARDS: int = int(os.getenv("RATE_LIMIT_SHARDS", "16"))
     
     # Session
     SESSION_TIMEOUT_MINUTES: int = int(os.getenv("SESSION_TIMEOUT_MINUTES", "480"))
@@ -146,6 +168,14 @@ class Settings:
     TIME_FORMAT: str = os.getenv("TIME_FORMAT", "%H:%M")
     DATETIME_FORMAT: str = os.getenv("DATETIME_FORMAT", "%d.%m.%Y %H:%M")
     
+    # Appointments
+    APPOINTMENT_DEFAULT_MINUTES: int = int(os.getenv("APPOINTMENT_DEFAULT_MINUTES", "30"))
+    APPOINTMENT_SLOT_STEP_MINUTES: int = int(os.getenv("APPOINTMENT_SLOT_STEP_MINUTES", "15"))  # free-slot start grid
+    WORKING_HOURS: str = os.getenv("WORKING_HOURS", "09:00-18:00")  # e.g. "09:00-12:30,13:30-18:00"
+    WORKING_DAYS: str = os.getenv("WORKING_DAYS", "0,1,2,3,4,5")  # Monday = 0
+    APPOINTMENT_SERIES_MAX_OCCURRENCES: int = int(os.getenv("APPOINTMENT_SERIES_MAX_OCCURRENCES", "100"))
+    SLOT_INDEX_SECONDS: float = float(os.getenv("SLOT_INDEX_SECONDS", "60"))  # reload for other processes' writes
+    
     # Localization
     DEFAULT_LANGUAGE: str = os.getenv("DEFAULT_LANGUAGE", "tr")
     SUPPORTED_LANGUAGES: List[str] = os.getenv("SUPPORTED_LANGUAGES", "tr,en,de").split(",")
@@ -154,6 +184,19 @@ class Settings:
     ENABLE_CACHE: bool = os.getenv("ENABLE_CACHE", "True").lower() == "true"
     CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "300"))
     CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", "1000"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # 0 = count items only
+    CACHE_SHARDS: int = int(os.getenv("CACHE_SHARDS", "16"))  # ShardedLRUCache segments
+    CACHE_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", "0"))  # 0 = no sweeper
+    CACHE_SWEEP_SLICE: int = int(os.getenv("CACHE_SWEEP_SLICE", "200"))  # max removals per lock hold
+    DISK_CACHE_ENABLED: bool = os.getenv("DISK_CACHE_ENABLED", "True").lower() == "true"
+    DISK_CACHE_PATH: str = os.getenv("DISK_CACHE_PATH", "cache/disk_cache.db")  # one file per cache: disk_cache_<name>.db
+    DISK_CACHE_MAX_BYTES: int = int(os.getenv("DISK_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    DECRYPT_WORKERS: int = int(os.getenv("DECRYPT_WORKERS", "0"))  # 0 = min(4, CPU)
+    DECRYPT_PARALLEL_THRESHOLD: int = int(os.getenv("DECRYPT_PARALLEL_THRESHOLD", "2000"))
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", "1000"))  # rows per bulk_* transaction
+    DASHBOARD_CACHE_SECONDS: float = float(os.getenv("DASHBOARD_CACHE_SECONDS", "5"))
+    SETTINGS_REFRESH_SECONDS: float = float(os.getenv("SETTINGS_REFRESH_SECONDS", "2"))  # cross-process probe interval
+    USER_DIRECTORY_SECONDS: float = float(os.getenv("USER_DIRECTORY_SECONDS", "60"))  # reload for other processes' writes
     
     # 3D Model Server
     MODEL_SERVER_ENABLED: bool = os.getenv("MODEL_SERVER_ENABLED", "True").lower() == "true"
@@ -0,0 +1,122 @@
+# database/blind_index.py
+
+"""Blind index helpers for encrypted patient fields
+
+Patient TC, name and phone are stored Fernet-encrypted, which is randomized
+and therefore cannot be queried. Alongside the ciphertext we store keyed HMAC
+digests of normalized values, so equality and name-prefix lookups become
+indexed SQL queries instead of decrypting the whole table.
+"""
+
+import re
+import unicodedata
+from typing import List, Optional, Set
+
+from utils.encryption_manager import encryption_manager
+
+TC_PURPOSE = "tc"
+PHONE_PURPOSE = "phone"
+NAME_PURPOSE = "name"
+
+# Name prefixes shorter than this are not indexed (too many matches, too much leakage)
+MIN_PREFIX_LENGTH = 2
+# Longer query tokens are truncated; results are re-checked after decryption
+MAX_PREFIX_LENGTH = 12
+# Name token digests are truncated; false positives are filtered after decryption
+NAME_HASH_LENGTH = 16
+
+_NON_DIGIT = re.compile(r'\D')
+_WORD_SPLIT = re.compile(r'[^0-9a-z]+')
+
+
+def fold_text(value: Optional[str]) -> str:
+    """Lowercase and strip Turkish diacritics ("Öztürk" -> "ozturk")"""
+    if not value:
+        return ""
+    value = value.replace("ı", "i").lower()
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def normalize_tc(tc_no: Optional[str]) -> str:
+    """Keep digits only"""
+    return _NON_DIGIT.sub("", tc_no or "")
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Normalize Turkish phone numbers to 10 digits (5XXXXXXXXX)"""
+    digits = _NON_DIGIT.sub("", phone or "")
+    if len(digits) == 12 and digits.startswith("90"):
+        return digits[2:]
+    if len(digits) == 11 and digits.startswith("0"):
+        return digits[1:]
+    return digits
+
+
+def name_words(full_name: Optional[str]) -> List[str]:
+    """Split a folded name into words"""
+    return [w for w in _WORD_SPLIT.split(fold_text(full_name)) if w]
+
+
+def name_prefixes(full_name: Optional[str]) -> Set[str]:
+    """All indexed prefixes of every word in a name"""
+    prefixes = set()
+    for word in name_words(full_name):
+        for length in range(MIN_PREFIX_LENGTH, min(len(word), MAX_PREFIX_LENGTH) + 1):
+            prefixes.add(word[:length])
+    return prefixes
+
+
+def tc_hash(tc_no: Optional[str]) -> Optional[str]:
+    """Blind index for exact TC lookups"""
+    return encryption_manager.blind_index(normalize_tc(tc_no), TC_PURPOSE) or None
+
+
+def duplicate_tc_marker(patient_id: int) -> str:
+    """tc_hash of a patient whose TC an older record owns
+
+    Unique per row and never equal to a real (hex) digest, so the row stays
+    out of TC lookups without being picked up again as missing an index.
+    """
+    return f"duplicate:{patient_id}"
+
+
+def empty_tc_marker(patient_id: int) -> str:
+    """tc_hash of a patient whose TC has no digits to index
+
+    Like the markers above, keeps the row from being picked up again as
+    missing an index.
+    """
+    return f"empty:{patient_id}"
+
+
+def unreadable_tc_marker(patient_id: int) -> str:
+    """tc_hash of a patient whose encrypted columns could not be decrypted
+
+    Keeps the row from being retried on every startup; a full rebuild
+    (e.g. after restoring the right key) still picks it up.
+    """
+    return f"unreadable:{patient_id}"
+
+
+def phone_hash(phone: Optional[str]) -> Optional[str]:
+    """Blind index for exact phone lookups"""
+    return encryption_manager.blind_index(normalize_phone(phone), PHONE_PURPOSE) or None
+
+
+def name_token_hash(token: str) -> str:
+    """Blind index for one name prefix"""
+    return encryption_manager.blind_index(
+        token[:MAX_PREFIX_LENGTH], NAME_PURPOSE, length=NAME_HASH_LENGTH
+    )
+
+
+def name_token_hashes(full_name: Optional[str]) -> Set[str]:
+    """Blind indexes for all prefixes of a name"""
+    return {name_token_hash(prefix) for prefix in name_prefixes(full_name)}
+
+
+def name_matches(full_name: Optional[str], query_words: List[str]) -> bool:
+    """Check that every query word is a prefix of some word in the name"""
+    words = name_words(full_name)
+    return all(any(w.startswith(q) for w in words) for q in query_words)
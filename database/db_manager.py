@@ -1,30 +1,100 @@
 # database/db_manager.py
 
+import base64
+import threading
+import time
+from itertools import islice
+from concurrent.futures import Future
 from contextlib import contextmanager
-from typing import List, Optional, Dict, Any, Tuple
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Callable, Iterable, Mapping, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine, func, and_, or_, text
+from sqlalchemy import (
+    create_engine, func, and_, or_, case, select, insert, update, bindparam, text, inspect, event
+)
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from config import settings
 from utils.logger import get_logger
-from utils.exceptions import DatabaseException
+from utils.exceptions import DatabaseException, ConfigurationException
 from utils.security_manager import SecurityManager
+from utils.cache import ShardedLRUCache, cached, invalidate_on_commit
 
 # BU SATIRI EKLEYİN: Global security_manager nesnesi oluşturuluyor
 security_manager = SecurityManager()
 from utils.encryption_manager import encryption_manager
 from .models import (
-    Base, User, Patient, Appointment, Transaction, Product,
+    Base, User, Patient, Appointment, AppointmentSeries, Transaction, Product,
     Message, MedicalRecord, PatientFile, Setting, AuditLog,
-    NewsSource, MedicalNews, NewsKeyword, InventoryLog,
+    NewsSource, MedicalNews, NewsKeyword, InventoryLog, PatientSearchToken,
     UserRole, AppointmentStatus, PatientStatus, TransactionType
 )
+from . import blind_index
+from .projections import PatientRow
+from .results import BulkResult, UserInfo
+from .recurrence import expand_rule, format_exdates, parse_exdates
+from .slot_index import DoctorSlots, Interval, WorkingHours, free_slots, working_windows
+from .query_metrics import QueryMetrics
 
 logger = get_logger(__name__)
 
+# Allowed values for pragmas that take keywords (pragmas cannot be bound parameters)
+SQLITE_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+SQLITE_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+# Writes to these tables invalidate the dashboard snapshot
+DASHBOARD_TABLES = ("appointments", "patients", "transactions")
+SETTINGS_TAGS = ("settings",)
+USER_TAGS = ("users",)
+APPOINTMENT_TAGS = ("appointments",)
+
+
+def _chunks(rows: Iterable, size: int):
+    """Yield lists of up to size items"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def sqlite_pragmas(in_memory: bool = False) -> List[str]:
+    """Build the PRAGMA statements of the configured SQLite performance profile
+    
+    Args:
+        in_memory: In-memory databases have no journal file, so
+            journal_mode and mmap_size are skipped
+        
+    Raises:
+        ConfigurationException: If a keyword setting has an unknown value
+    """
+    journal_mode = settings.SQLITE_JOURNAL_MODE.upper()
+    synchronous = settings.SQLITE_SYNCHRONOUS.upper()
+    temp_store = settings.SQLITE_TEMP_STORE.upper()
+    
+    for name, value, allowed in (
+        ("SQLITE_JOURNAL_MODE", journal_mode, SQLITE_JOURNAL_MODES),
+        ("SQLITE_SYNCHRONOUS", synchronous, SQLITE_SYNCHRONOUS_MODES),
+        ("SQLITE_TEMP_STORE", temp_store, SQLITE_TEMP_STORES),
+    ):
+        if value not in allowed:
+            raise ConfigurationException(f"{name} must be one of {sorted(allowed)}, got {value}")
+    
+    pragmas = [f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}"]
+    if not in_memory:
+        pragmas.append(f"PRAGMA journal_mode = {journal_mode}")
+        pragmas.append(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+    pragmas += [
+        f"PRAGMA synchronous = {synchronous}",
+        f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA temp_store = {temp_store}",
+    ]
+    return pragmas
+
 
 class DatabaseManager:
     """Production-ready database manager with connection pooling and security"""
@@ -56,6 +126,18 @@ class DatabaseManager:
                         connect_args=connect_args,
                         echo=settings.DB_ECHO
                     )
+                
+                # Apply the performance profile (WAL etc.) to every connection
+                pragmas = sqlite_pragmas(in_memory=":memory:" in settings.DATABASE_URL)
+                
+                @event.listens_for(self.engine, "connect")
+                def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+                    cursor = dbapi_connection.cursor()
+                    try:
+                        for pragma in pragmas:
+                            cursor.execute(pragma)
+                    finally:
+                        cursor.close()
             else:
                 # PostgreSQL/MySQL settings
                 self.engine = create_engine(
@@ -66,15 +148,58 @@ class DatabaseManager:
                     echo=settings.DB_ECHO
                 )
             
+            # Opt-in statement counting/timing per public method
+            self.metrics = QueryMetrics(
+                type(self),
+                slow_query_ms=settings.DB_SLOW_QUERY_MS,
+                top_n=settings.DB_METRICS_TOP_N
+            )
+            if settings.DB_METRICS_ENABLED:
+                self.metrics.attach(self.engine)
+            
             # Create session factory
             session_factory = sessionmaker(bind=self.engine)
             self.Session = scoped_session(session_factory)
             
+            # Read cache for rarely written tables; commits evict the written tables' tags
+            self.query_cache = ShardedLRUCache()
+            invalidate_on_commit(session_factory)
+            
+            # Snapshots below remember the query_cache tag version they were
+            # built at, so a commit from any manager in this process drops them
+            self._dashboard_lock = threading.Lock()
+            self._dashboard_snapshot: Optional[Tuple[float, int, Dict[str, Any]]] = None
+            
+            # Immutable settings snapshot (loaded after defaults are created)
+            self._settings_lock = threading.Lock()
+            self._settings_snapshot: Optional[Mapping[str, Optional[str]]] = None
+            self._settings_version: Optional[Tuple] = None
+            self._settings_tag_version = -1
+            self._settings_checked_at = 0.0
+            
+            # User directory: (loaded_at, tag version, by id, by username)
+            self._user_directory_lock = threading.Lock()
+            self._user_directory: Optional[
+                Tuple[float, int, Dict[int, UserInfo], Dict[str, UserInfo]]
+            ] = None
+            
+            # Per-doctor appointment intervals, loaded on first use and kept
+            # current by appointment writes; state is (loaded_at, tag version)
+            self._slot_lock = threading.RLock()
+            self._slot_index: Dict[int, DoctorSlots] = {}
+            self._slot_index_state: Tuple[float, int] = (0.0, -1)
+            
             # Create tables
             Base.metadata.create_all(self.engine)
+            self._add_missing_columns()
             
             # Initialize default data
             self._initialize_defaults()
+            self._load_settings()
+            
+            # Backfill blind indexes before the unique TC index is created
+            self.backfill_patient_hashes()
+            self._create_missing_indexes()
             
             logger.info("Database initialized successfully")
             
@@ -104,6 +229,46 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def _add_missing_columns(self):
+        """Add columns introduced after the database was created
+        
+        create_all() only creates missing tables, so new nullable columns
+        on existing tables are added here with ALTER TABLE.
+        """
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                if not inspector.has_table(table.name):
+                    continue
+                
+                existing = {col['name'] for col in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    conn.execute(text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    ))
+                    logger.info(f"Schema upgraded: {table.name}.{column.name} added")
+    
+    def _create_missing_indexes(self):
+        """Create missing indexes and recreate ones whose uniqueness changed"""
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing = {
+                    index['name']: bool(index['unique'])
+                    for index in inspector.get_indexes(table.name)
+                }
+                for index in table.indexes:
+                    if index.name in existing and existing[index.name] != bool(index.unique):
+                        index.drop(conn)
+                        del existing[index.name]
+                        logger.info(f"Schema upgraded: index {index.name} recreated")
+                    if index.name not in existing:
+                        index.create(conn)
+    
     def _initialize_defaults(self):
         """Initialize default data (admin user, settings, etc.)"""
         try:
@@ -175,6 +340,11 @@ class DatabaseManager:
                     # Son girişi güncelle
                     user.last_login = datetime.now()
                     
+                    # Maliyeti hedeften farklı hash'i şeffafça yenile
+                    if security_manager.needs_rehash(user.password):
+                        user.password = security_manager.hash_password(password)
+                        logger.info(f"Password rehashed for user: {username}")
+                    
                     # Değişikliği kaydet (Bu işlem nesneyi 'expire' eder)
                     session.commit()
                     
@@ -196,6 +366,15 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Authentication error: {e}")
             return None
+    
+    def authenticate_user_async(self, username: str, password: str) -> Future:
+        """authenticate_user on the password worker pool
+        
+        Returns:
+            Future resolving to the User or None, so bcrypt never runs on
+            the UI thread
+        """
+        return security_manager.submit(self.authenticate_user, username, password)
         
     def create_user(
         self, username: str, password: str, full_name: str,
@@ -280,6 +459,67 @@ class DatabaseManager:
             logger.error(f"Failed to fetch user: {e}")
             return None
     
+    def get_user_info(self, user_id: int) -> Optional[UserInfo]:
+        """Name, role and specialty of a user from the in-memory directory"""
+        try:
+            return self._current_user_directory()[2].get(user_id)
+        except Exception as e:
+            logger.error(f"Failed to fetch user: {e}")
+            return None
+    
+    def get_user_info_by_username(self, username: str) -> Optional[UserInfo]:
+        """Directory entry by username"""
+        try:
+            return self._current_user_directory()[3].get(username)
+        except Exception as e:
+            logger.error(f"Failed to fetch user: {e}")
+            return None
+    
+    def get_users_by_ids(self, user_ids) -> Dict[int, UserInfo]:
+        """Directory entries for many users at once (unknown ids are left out)
+        
+        Lists should call this once and look names up in the result instead
+        of querying per row.
+        """
+        try:
+            by_id = self._current_user_directory()[2]
+            return {uid: by_id[uid] for uid in set(user_ids) if uid in by_id}
+        except Exception as e:
+            logger.error(f"Failed to fetch users: {e}")
+            return {}
+    
+    def get_user_name(self, user_id: int) -> str:
+        """Display name of a user ("Bilinmeyen" if not found)"""
+        info = self.get_user_info(user_id)
+        return info.full_name if info else "Bilinmeyen"
+    
+    def _current_user_directory(self) -> Tuple[float, int, Dict[int, UserInfo], Dict[str, UserInfo]]:
+        """Directory, reloaded after a users write or USER_DIRECTORY_SECONDS"""
+        directory = self._user_directory
+        if (
+            directory is not None
+            and directory[1] == self.query_cache.tags_version(USER_TAGS)
+            and time.monotonic() - directory[0] < settings.USER_DIRECTORY_SECONDS
+        ):
+            return directory
+        
+        tag_version = self.query_cache.tags_version(USER_TAGS)
+        with self.get_session() as session:
+            rows = session.query(
+                User.id, User.username, User.full_name, User.role,
+                User.specialty, User.is_active
+            ).all()
+        
+        by_id = {row[0]: UserInfo(*row) for row in rows}
+        directory = (
+            time.monotonic(), tag_version, by_id,
+            {info.username: info for info in by_id.values()}
+        )
+        with self._user_directory_lock:
+            # tag_version was read before the query, so a write during the load reloads next time
+            self._user_directory = directory
+        return directory
+    
     def update_user_password(self, user_id: int, new_password: str) -> Tuple[bool, str]:
         """Update user password
         
@@ -314,6 +554,91 @@ class DatabaseManager:
     
     # ==================== PATIENT MANAGEMENT ====================
     
+    @staticmethod
+    def _apply_patient_index(patient: Patient, **plain_values):
+        """Refresh blind indexes from plain-text values (tc_no, full_name, phone)"""
+        if 'tc_no' in plain_values:
+            patient.tc_hash = blind_index.tc_hash(plain_values['tc_no'])
+        if 'phone' in plain_values:
+            patient.phone_hash = blind_index.phone_hash(plain_values['phone'])
+        if 'full_name' in plain_values:
+            patient.search_tokens = [
+                PatientSearchToken(token_hash=token)
+                for token in sorted(blind_index.name_token_hashes(plain_values['full_name']))
+            ]
+    
+    @staticmethod
+    def _tc_hash_taken(
+        session: Session, tc_hash: Optional[str], exclude_id: Optional[int] = None
+    ) -> bool:
+        """Check whether a TC blind index is already used (index probe)"""
+        if not tc_hash:
+            return False
+        query = session.query(Patient.id).filter(Patient.tc_hash == tc_hash)
+        if exclude_id is not None:
+            query = query.filter(Patient.id != exclude_id)
+        return query.first() is not None
+    
+    @staticmethod
+    def _patient_rows_query(session: Session):
+        """Column query matching PatientRow.COLUMNS (no ORM identity map)"""
+        return session.query(*[getattr(Patient, column) for column in PatientRow.COLUMNS])
+    
+    @staticmethod
+    def _filter_patients(
+        query, source: Optional[str] = None, gender: Optional[str] = None,
+        status: Optional[str] = "active"
+    ):
+        """Apply list filters to a patient query
+        
+        Args:
+            query: Query selecting from patients
+            source: Patient source, None or "all" for any
+            gender: Gender, None or "all" for any
+            status: "active" (non-archived), "archived", a PatientStatus
+                value ("Yeni", "Aktif", "Arşiv") or None/"all" for any
+        """
+        if source and source != "all":
+            query = query.filter(Patient.source == source)
+        if gender and gender != "all":
+            query = query.filter(Patient.gender == gender)
+        
+        if status == "active":
+            query = query.filter(Patient.status != PatientStatus.ARCHIVED)
+        elif status == "archived":
+            query = query.filter(Patient.status == PatientStatus.ARCHIVED)
+        elif status and status != "all":
+            status_enum = next((s for s in PatientStatus if s.value == status), None)
+            if status_enum is None:
+                raise ValueError(f"Unknown patient status: {status}")
+            query = query.filter(Patient.status == status_enum)
+        
+        return query
+    
+    @staticmethod
+    def _patient_row(patient: Patient) -> Dict[str, Any]:
+        """Patient row as a dict, encrypted columns still encrypted"""
+        return {
+            'id': patient.id,
+            'tc_no': patient.tc_no,
+            'full_name': patient.full_name,
+            'phone': patient.phone,
+            'email': patient.email,
+            'birth_date': patient.birth_date,
+            'gender': patient.gender,
+            'address': patient.address,
+            'status': patient.status.value,
+            'source': patient.source,
+            'created_at': patient.created_at
+        }
+    
+    @classmethod
+    def _patient_to_dict(cls, patient: Patient) -> Dict[str, Any]:
+        """Decrypt a patient row into the dict shape used by the UI"""
+        return encryption_manager.decrypt_rows(
+            [cls._patient_row(patient)], PatientRow.ENCRYPTED
+        )[0]
+    
     def create_patient(
         self, tc_no: str, full_name: str, phone: str,
         birth_date: str, gender: str, address: str,
@@ -336,6 +661,10 @@ class DatabaseManager:
         """
         try:
             with self.get_session() as session:
+                # Duplicate check through the unique blind index
+                if self._tc_hash_taken(session, blind_index.tc_hash(tc_no)):
+                    return False, "Bu TC kimlik numarası zaten kayıtlı", None
+                
                 # Encrypt sensitive data
                 encrypted_tc = encryption_manager.encrypt(tc_no)
                 encrypted_name = encryption_manager.encrypt(full_name)
@@ -354,6 +683,9 @@ class DatabaseManager:
                     source=source,
                     status=PatientStatus.NEW
                 )
+                self._apply_patient_index(
+                    patient, tc_no=tc_no, full_name=full_name, phone=phone
+                )
                 
                 session.add(patient)
                 session.commit()
@@ -367,61 +699,32 @@ class DatabaseManager:
             logger.error(f"Patient creation failed: {e}")
             return False, f"Hasta kaydedilemedi: {str(e)}", None
     
-    def get_active_patients(self) -> List[Dict[str, Any]]:
-        """Get all active (non-archived) patients with decrypted data"""
+    def get_active_patients(self) -> List[PatientRow]:
+        """Get all active (non-archived) patients
+        
+        Encrypted fields are decrypted lazily on first access (see PatientRow).
+        """
         try:
             with self.get_session() as session:
-                patients = session.query(Patient).filter(
+                rows = self._patient_rows_query(session).filter(
                     Patient.status != PatientStatus.ARCHIVED
                 ).order_by(Patient.id.desc()).all()
                 
-                # Decrypt data
-                result = []
-                for p in patients:
-                    result.append({
-                        'id': p.id,
-                        'tc_no': encryption_manager.decrypt(p.tc_no),
-                        'full_name': encryption_manager.decrypt(p.full_name),
-                        'phone': encryption_manager.decrypt(p.phone),
-                        'email': p.email,
-                        'birth_date': p.birth_date,
-                        'gender': p.gender,
-                        'address': encryption_manager.decrypt(p.address),
-                        'status': p.status.value,
-                        'source': p.source,
-                        'created_at': p.created_at
-                    })
-                
-                return result
+                return [PatientRow.from_columns(row) for row in rows]
                 
         except Exception as e:
             logger.error(f"Failed to fetch patients: {e}")
             return []
     
-    def get_archived_patients(self) -> List[Dict[str, Any]]:
-        """Get archived patients"""
+    def get_archived_patients(self) -> List[PatientRow]:
+        """Get archived patients (lazily decrypted, see PatientRow)"""
         try:
             with self.get_session() as session:
-                patients = session.query(Patient).filter_by(
-                    status=PatientStatus.ARCHIVED
+                rows = self._patient_rows_query(session).filter(
+                    Patient.status == PatientStatus.ARCHIVED
                 ).order_by(Patient.id.desc()).all()
                 
-                result = []
-                for p in patients:
-                    result.append({
-                        'id': p.id,
-                        'tc_no': encryption_manager.decrypt(p.tc_no),
-                        'full_name': encryption_manager.decrypt(p.full_name),
-                        'phone': encryption_manager.decrypt(p.phone),
-                        'email': p.email,
-                        'birth_date': p.birth_date,
-                        'gender': p.gender,
-                        'address': encryption_manager.decrypt(p.address),
-                        'status': p.status.value,
-                        'source': p.source
-                    })
-                
-                return result
+                return [PatientRow.from_columns(row) for row in rows]
                 
         except Exception as e:
             logger.error(f"Failed to fetch archived patients: {e}")
@@ -436,24 +739,77 @@ class DatabaseManager:
                 if not patient:
                     return None
                 
-                return {
-                    'id': patient.id,
-                    'tc_no': encryption_manager.decrypt(patient.tc_no),
-                    'full_name': encryption_manager.decrypt(patient.full_name),
-                    'phone': encryption_manager.decrypt(patient.phone),
-                    'email': patient.email,
-                    'birth_date': patient.birth_date,
-                    'gender': patient.gender,
-                    'address': encryption_manager.decrypt(patient.address),
-                    'status': patient.status.value,
-                    'source': patient.source,
-                    'created_at': patient.created_at
-                }
+                return self._patient_to_dict(patient)
                 
         except Exception as e:
             logger.error(f"Failed to fetch patient: {e}")
             return None
     
+    def get_patient_by_tc(self, tc_no: str) -> Optional[Dict[str, Any]]:
+        """Get patient by TC number through the TC blind index"""
+        try:
+            tc_hash = blind_index.tc_hash(tc_no)
+            if not tc_hash:
+                return None
+            
+            with self.get_session() as session:
+                patient = session.query(Patient).filter_by(tc_hash=tc_hash).first()
+                return self._patient_to_dict(patient) if patient else None
+                
+        except Exception as e:
+            logger.error(f"Failed to fetch patient by TC: {e}")
+            return None
+    
+    def update_patient(self, patient_id: int, **fields) -> Tuple[bool, str]:
+        """Update patient fields, re-encrypting and re-indexing sensitive data
+        
+        Args:
+            patient_id: Patient ID
+            **fields: Any of tc_no, full_name, phone, address, email,
+                birth_date, gender, source
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        encrypted_fields = ('tc_no', 'full_name', 'phone', 'address')
+        plain_fields = ('email', 'birth_date', 'gender', 'source')
+        
+        unknown = set(fields) - set(encrypted_fields) - set(plain_fields)
+        if unknown:
+            return False, f"Geçersiz alan: {', '.join(sorted(unknown))}"
+        
+        try:
+            with self.get_session() as session:
+                patient = session.query(Patient).filter_by(id=patient_id).first()
+                if not patient:
+                    return False, "Hasta bulunamadı"
+                
+                if 'tc_no' in fields and self._tc_hash_taken(
+                    session, blind_index.tc_hash(fields['tc_no']), exclude_id=patient_id
+                ):
+                    return False, "Bu TC kimlik numarası zaten kayıtlı"
+                
+                for key in encrypted_fields:
+                    if key in fields:
+                        setattr(patient, key, encryption_manager.encrypt(fields[key]))
+                for key in plain_fields:
+                    if key in fields:
+                        setattr(patient, key, fields[key])
+                
+                self._apply_patient_index(patient, **{
+                    key: value for key, value in fields.items()
+                    if key in ('tc_no', 'full_name', 'phone')
+                })
+                
+                session.commit()
+                return True, "Hasta güncellendi"
+                
+        except IntegrityError:
+            return False, "Bu TC kimlik numarası zaten kayıtlı"
+        except Exception as e:
+            logger.error(f"Patient update failed: {e}")
+            return False, f"Hasta güncellenemedi: {str(e)}"
+    
     def archive_patient(self, patient_id: int) -> bool:
         """Archive patient"""
         try:
@@ -482,31 +838,152 @@ class DatabaseManager:
             logger.error(f"Failed to restore patient: {e}")
             return False
     
-    def search_patients(self, query: str) -> List[Dict[str, Any]]:
-        """Search patients by name, TC, or phone
+    def search_patients(
+        self, query: str, limit: Optional[int] = None,
+        source: Optional[str] = None, gender: Optional[str] = None,
+        status: Optional[str] = "active"
+    ) -> List[PatientRow]:
+        """Search patients by name prefix, exact TC or exact phone
         
-        Note: Searching encrypted data is limited. This performs client-side filtering.
-        For production, consider using searchable encryption or separate search index.
+        Encrypted columns are matched through blind indexes (see
+        database/blind_index.py), so only the returned rows are decrypted.
+        
+        Args:
+            query: Name words (prefix match), TC number or phone number
+            limit: Maximum number of results
+            source, gender, status: Same filters as list_patients()
+            
+        Returns:
+            List of patient rows, newest first
         """
         try:
-            # Get all active patients
-            all_patients = self.get_active_patients()
+            words = blind_index.name_words(query)
+            if not words:
+                return []
             
-            # Filter by query (case-insensitive)
-            query = query.lower()
-            results = [
-                p for p in all_patients
-                if query in p['full_name'].lower()
-                or query in p['tc_no']
-                or query in p['phone']
-            ]
-            
-            return results
+            with self.get_session() as session:
+                patients = self._filter_patients(
+                    self._patient_rows_query(session), source, gender, status
+                )
+                
+                is_numeric = all(word.isdigit() for word in words)
+                if is_numeric:
+                    patients = patients.filter(or_(
+                        Patient.tc_hash == blind_index.tc_hash(query),
+                        Patient.phone_hash == blind_index.phone_hash(query)
+                    ))
+                else:
+                    token_hashes = {
+                        blind_index.name_token_hash(word) for word in words
+                        if len(word) >= blind_index.MIN_PREFIX_LENGTH
+                    }
+                    if not token_hashes:
+                        return []
+                    
+                    matching_ids = session.query(PatientSearchToken.patient_id).filter(
+                        PatientSearchToken.token_hash.in_(token_hashes)
+                    ).group_by(PatientSearchToken.patient_id).having(
+                        func.count(func.distinct(PatientSearchToken.token_hash)) == len(token_hashes)
+                    )
+                    patients = patients.filter(Patient.id.in_(matching_ids))
+                
+                results = []
+                for values in patients.order_by(Patient.id.desc()):
+                    row = PatientRow.from_columns(values)
+                    # Drop truncated-hash collisions and over-long query tokens
+                    if not is_numeric and not blind_index.name_matches(row.full_name, words):
+                        continue
+                    
+                    results.append(row)
+                    if limit and len(results) >= limit:
+                        break
+                
+                return results
             
         except Exception as e:
             logger.error(f"Patient search failed: {e}")
             return []
     
+    def list_patients(
+        self, cursor: Optional[str] = None, limit: int = 50,
+        source: Optional[str] = None, gender: Optional[str] = None,
+        status: Optional[str] = "active", order: str = "desc"
+    ) -> Tuple[List[PatientRow], Optional[str]]:
+        """List patients page by page with filters applied in SQL
+        
+        Uses keyset pagination on Patient.id, so every page costs the same
+        regardless of how deep the caller has scrolled.
+        
+        Args:
+            cursor: Token returned by the previous call (None for first page)
+            limit: Page size (max 500)
+            source, gender, status: Filters, see _filter_patients()
+            order: "desc" (newest first) or "asc"
+            
+        Returns:
+            Tuple of (patient rows, next cursor or None on the last page)
+        """
+        try:
+            if order not in ("asc", "desc"):
+                raise ValueError(f"Unknown order: {order}")
+            limit = max(1, min(int(limit), 500))
+            
+            with self.get_session() as session:
+                query = self._filter_patients(
+                    self._patient_rows_query(session), source, gender, status
+                )
+                
+                if cursor:
+                    last_id = self._decode_patient_cursor(cursor, order)
+                    if order == "desc":
+                        query = query.filter(Patient.id < last_id)
+                    else:
+                        query = query.filter(Patient.id > last_id)
+                
+                id_order = Patient.id.desc() if order == "desc" else Patient.id.asc()
+                rows = query.order_by(id_order).limit(limit + 1).all()
+                
+                page = [PatientRow.from_columns(row) for row in rows[:limit]]
+                next_cursor = None
+                if len(rows) > limit:
+                    next_cursor = self._encode_patient_cursor(page[-1].id, order)
+                
+                return page, next_cursor
+                
+        except Exception as e:
+            logger.error(f"Failed to list patients: {e}")
+            return [], None
+    
+    @staticmethod
+    def _encode_patient_cursor(last_id: int, order: str) -> str:
+        """Opaque pagination token"""
+        return base64.urlsafe_b64encode(f"{order}:{last_id}".encode()).decode()
+    
+    @staticmethod
+    def _decode_patient_cursor(cursor: str, order: str) -> int:
+        """Decode a pagination token, checking it was issued for this order"""
+        try:
+            token_order, last_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        if token_order != order:
+            raise ValueError("Cursor was issued for a different order")
+        return int(last_id)
+    
+    def count_patients(
+        self, source: Optional[str] = None, gender: Optional[str] = None,
+        status: Optional[str] = "active"
+    ) -> int:
+        """Count patients matching the list_patients() filters"""
+        try:
+            with self.get_session() as session:
+                return self._filter_patients(
+                    session.query(func.count(Patient.id)), source, gender, status
+                ).scalar() or 0
+        except Exception as e:
+            logger.error(f"Failed to count patients: {e}")
+            return 0
+    
     def get_patient_count(self) -> int:
         """Get total patient count"""
         try:
@@ -518,29 +995,36 @@ class DatabaseManager:
             logger.error(f"Failed to count patients: {e}")
             return 0
     
-    def get_patient_sources(self) -> List[Tuple[str, int]]:
-        """Get patient distribution by source"""
+    def get_patient_sources(self, status: Optional[str] = "active") -> List[Tuple[str, int]]:
+        """Get patient distribution by source (cached until patients change)
+        
+        Args:
+            status: Patient status filter, as in list_patients()
+        """
         try:
-            with self.get_session() as session:
-                results = session.query(
-                    Patient.source,
-                    func.count(Patient.id)
-                ).filter(
-                    Patient.status != PatientStatus.ARCHIVED
-                ).group_by(Patient.source).all()
-                
-                return [(source, count) for source, count in results]
-                
+            # New list each call; the cached one is shared between callers
+            return list(self._patient_sources(status))
         except Exception as e:
             logger.error(f"Failed to get patient sources: {e}")
             return []
     
+    @cached(tags=("patients",), cache_attr="query_cache")
+    def _patient_sources(self, status: Optional[str]) -> List[Tuple[str, int]]:
+        with self.get_session() as session:
+            results = self._filter_patients(
+                session.query(Patient.source, func.count(Patient.id)), status=status
+            ).group_by(Patient.source).all()
+            
+            return [(source, count) for source, count in results]
+    
     # ==================== APPOINTMENT MANAGEMENT ====================
     
     def create_appointment(
         self, patient_id: int, doctor_id: int,
         appointment_date: datetime, notes: str = "",
-        active_user_id: Optional[int] = None
+        active_user_id: Optional[int] = None,
+        duration_minutes: Optional[int] = None,
+        allow_overlap: bool = False
     ) -> Tuple[bool, str, Optional[int]]:
         """Create new appointment
         
@@ -550,33 +1034,472 @@ class DatabaseManager:
             appointment_date: Appointment datetime
             notes: Optional notes
             active_user_id: ID of user creating the appointment
+            duration_minutes: Length (default APPOINTMENT_DEFAULT_MINUTES)
+            allow_overlap: Book even if the doctor is busy at that time
             
         Returns:
             Tuple of (success, message, appointment_id)
         """
         try:
-            with self.get_session() as session:
-                # Encrypt notes
-                encrypted_notes = encryption_manager.encrypt(notes) if notes else ""
+            duration = (
+                settings.APPOINTMENT_DEFAULT_MINUTES if duration_minutes is None else duration_minutes
+            )
+            if duration <= 0:
+                return False, "Geçersiz randevu süresi", None
+            end = appointment_date + timedelta(minutes=duration)
+            
+            with self._slot_write():
+                slots = self._doctor_slots(doctor_id)
+                if not allow_overlap:
+                    conflicts = slots.overlapping(appointment_date, end)
+                    if conflicts:
+                        busy_from, busy_to, _ = conflicts[0]
+                        return False, (
+                            f"Doktorun bu saatte başka randevusu var "
+                            f"({busy_from:%H:%M}-{busy_to:%H:%M})"
+                        ), None
+                
+                with self.get_session() as session:
+                    # Encrypt notes
+                    encrypted_notes = encryption_manager.encrypt(notes) if notes else ""
+                    
+                    appointment = Appointment(
+                        patient_id=patient_id,
+                        doctor_id=doctor_id,
+                        appointment_date=appointment_date,
+                        duration_minutes=duration,
+                        notes=encrypted_notes,
+                        active_user_id=active_user_id,
+                        status=AppointmentStatus.WAITING
+                    )
+                    
+                    session.add(appointment)
+                    # The INSERT takes SQLite's write lock, so no other writer can
+                    # book between this check and the commit
+                    session.flush()
+                    if not allow_overlap:
+                        stored = self._stored_overlaps(
+                            session, doctor_id, appointment_date, end,
+                            Appointment.id != appointment.id
+                        )
+                        if stored:
+                            session.rollback()
+                            # Written elsewhere since the index was loaded
+                            self._slot_index.pop(doctor_id, None)
+                            busy_from, busy_to, _ = stored[0]
+                            return False, (
+                                f"Doktorun bu saatte başka randevusu var "
+                                f"({busy_from:%H:%M}-{busy_to:%H:%M})"
+                            ), None
+                    session.commit()
+                    appointment_id = appointment.id
                 
-                appointment = Appointment(
-                    patient_id=patient_id,
-                    doctor_id=doctor_id,
-                    appointment_date=appointment_date,
-                    notes=encrypted_notes,
-                    active_user_id=active_user_id,
-                    status=AppointmentStatus.WAITING
+                slots.add(appointment_date, end, appointment_id)
+            
+            logger.info(f"Appointment created: ID {appointment_id}")
+            return True, "Randevu oluşturuldu", appointment_id
+                
+        except Exception as e:
+            logger.error(f"Appointment creation failed: {e}")
+            return False, f"Randevu oluşturulamadı: {str(e)}", None
+    
+    def find_conflicts(
+        self, doctor_id: int, start: datetime,
+        duration_minutes: Optional[int] = None,
+        exclude_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Doctor's appointments overlapping a proposed booking
+        
+        Args:
+            doctor_id: Doctor ID
+            start: Proposed start
+            duration_minutes: Proposed length (default APPOINTMENT_DEFAULT_MINUTES)
+            exclude_id: Appointment being moved (not a conflict with itself)
+            
+        Returns:
+            List of {'id', 'start', 'end'} dicts, in start order
+        """
+        try:
+            end = start + timedelta(minutes=duration_minutes or settings.APPOINTMENT_DEFAULT_MINUTES)
+            with self._slot_lock:
+                self._sync_slot_index()
+                conflicts = self._doctor_slots(doctor_id).overlapping(start, end, exclude_id)
+            return [
+                {'id': appointment_id, 'start': busy_from, 'end': busy_to}
+                for busy_from, busy_to, appointment_id in conflicts
+            ]
+        except Exception as e:
+            logger.error(f"Failed to check appointment conflicts: {e}")
+            return []
+    
+    def find_free_slots(
+        self, doctor_id: int, start: datetime, end: datetime,
+        duration: Optional[int] = None,
+        working_hours: Optional[WorkingHours] = None,
+        step_minutes: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[datetime, datetime]]:
+        """Free (start, end) slots of a doctor, earliest first
+        
+        Example: next free 20 minute slot this week
+            db.find_free_slots(doctor_id, now, now + timedelta(days=7), 20, limit=1)
+        
+        Args:
+            doctor_id: Doctor ID
+            start, end: Search range
+            duration: Slot length in minutes (default APPOINTMENT_DEFAULT_MINUTES)
+            working_hours: "09:00-12:30,13:30-18:00", (time, time) pairs or a
+                {weekday: ranges} mapping (default WORKING_HOURS on WORKING_DAYS)
+            step_minutes: Grid of candidate starts (default APPOINTMENT_SLOT_STEP_MINUTES)
+            limit: Stop after this many slots
+            
+        Returns:
+            List of (slot_start, slot_end) tuples
+        """
+        try:
+            working_days = [int(day) for day in settings.WORKING_DAYS.split(",") if day.strip()]
+            windows = working_windows(
+                start, end, working_hours or settings.WORKING_HOURS, working_days
+            )
+            with self._slot_lock:
+                self._sync_slot_index()
+                return free_slots(
+                    self._doctor_slots(doctor_id), windows,
+                    timedelta(minutes=duration or settings.APPOINTMENT_DEFAULT_MINUTES),
+                    timedelta(minutes=step_minutes or settings.APPOINTMENT_SLOT_STEP_MINUTES),
+                    limit
+                )
+        except Exception as e:
+            logger.error(f"Failed to find free slots: {e}")
+            return []
+    
+    def create_appointment_series(
+        self, patient_id: int, doctor_id: int, start: datetime, rule: str,
+        notes: str = "", active_user_id: Optional[int] = None,
+        duration_minutes: Optional[int] = None,
+        exdates: Optional[List[datetime]] = None,
+        skip_conflicts: bool = False
+    ) -> Tuple[bool, str, Optional[int]]:
+        """Create a recurring series (physiotherapy, dialysis, ...)
+        
+        Every occurrence is checked against the slot index in one pass and
+        inserted with a single executemany in one transaction, then checked
+        again against the stored appointments before committing; the notes
+        are encrypted once for the whole series.
+        
+        Example: 20 sessions, Mondays and Thursdays at 10:00
+            db.create_appointment_series(
+                patient_id, doctor_id, datetime(2030, 1, 7, 10, 0),
+                "FREQ=WEEKLY;BYDAY=MO,TH;COUNT=20"
+            )
+        
+        Args:
+            patient_id: Patient ID
+            doctor_id: Doctor ID
+            start: First occurrence; its time of day applies to all
+            rule: RRULE, e.g. "FREQ=WEEKLY;COUNT=10"
+            notes: Optional notes for every occurrence
+            active_user_id: ID of user creating the series
+            duration_minutes: Length of each (default APPOINTMENT_DEFAULT_MINUTES)
+            exdates: Occurrences to leave out (holidays etc.)
+            skip_conflicts: Leave out clashing occurrences instead of failing
+            
+        Returns:
+            Tuple of (success, message, series_id)
+        """
+        try:
+            duration = (
+                settings.APPOINTMENT_DEFAULT_MINUTES if duration_minutes is None else duration_minutes
+            )
+            if duration <= 0:
+                return False, "Geçersiz randevu süresi", None
+            length = timedelta(minutes=duration)
+            
+            try:
+                skipped = list(exdates or ())
+                occurrences = expand_rule(
+                    rule, start, skipped, settings.APPOINTMENT_SERIES_MAX_OCCURRENCES
                 )
+            except ValueError as e:
+                return False, f"Geçersiz tekrar kuralı: {e}", None
+            
+            if not occurrences:
+                return False, "Tekrar kuralı hiç randevu üretmiyor", None
+            if any(later < earlier + length for earlier, later in zip(occurrences, occurrences[1:])):
+                return False, "Serideki randevular birbiriyle çakışıyor", None
+            
+            with self._slot_write():
+                slots = self._doctor_slots(doctor_id)
+                clashes = slots.conflicts([(begin, begin + length) for begin in occurrences])
+                if clashes:
+                    clash_dates = [occurrences[position] for position in sorted(clashes)]
+                    if not skip_conflicts:
+                        return False, self._series_clash_message(clash_dates), None
+                    
+                    # Clashing occurrences become series exceptions
+                    skipped += clash_dates
+                    occurrences = [
+                        begin for position, begin in enumerate(occurrences)
+                        if position not in clashes
+                    ]
+                    if not occurrences:
+                        return False, "Serideki tüm randevular çakışıyor", None
+                
+                encrypted_notes = encryption_manager.encrypt(notes) if notes else ""
                 
-                session.add(appointment)
+                with self.get_session() as session:
+                    series = AppointmentSeries(
+                        patient_id=patient_id,
+                        doctor_id=doctor_id,
+                        active_user_id=active_user_id,
+                        rule=rule.strip(),
+                        start_date=start,
+                        duration_minutes=duration,
+                        notes=encrypted_notes,
+                        exdates=format_exdates(skipped),
+                        is_active=True
+                    )
+                    session.add(series)
+                    session.flush()
+                    series_id = series.id
+                    
+                    session.execute(insert(Appointment), [{
+                        'patient_id': patient_id,
+                        'doctor_id': doctor_id,
+                        'active_user_id': active_user_id,
+                        'appointment_date': begin,
+                        'duration_minutes': duration,
+                        'status': AppointmentStatus.WAITING,
+                        'notes': encrypted_notes,
+                        'reminder_sent': False,
+                        'series_id': series_id
+                    } for begin in occurrences])
+                    
+                    # The INSERTs hold SQLite's write lock; re-check what is stored
+                    # in case another process booked since the index was loaded
+                    stored = DoctorSlots(self._stored_overlaps(
+                        session, doctor_id, occurrences[0], occurrences[-1] + length,
+                        Appointment.series_id.is_distinct_from(series_id)
+                    )).conflicts([(begin, begin + length) for begin in occurrences])
+                    if stored:
+                        self._slot_index.pop(doctor_id, None)
+                        clash_dates = [occurrences[position] for position in sorted(stored)]
+                        if not skip_conflicts or len(clash_dates) == len(occurrences):
+                            session.rollback()
+                            if not skip_conflicts:
+                                return False, self._series_clash_message(clash_dates), None
+                            return False, "Serideki tüm randevular çakışıyor", None
+                        
+                        session.query(Appointment).filter(
+                            Appointment.series_id == series_id,
+                            Appointment.appointment_date.in_(clash_dates)
+                        ).delete(synchronize_session=False)
+                        skipped += clash_dates
+                        series.exdates = format_exdates(skipped)
+                    
+                    created = session.query(
+                        Appointment.id, Appointment.appointment_date
+                    ).filter(Appointment.series_id == series_id).all()
+                
+                for appointment_id, begin in created:
+                    slots.add(begin, begin + length, appointment_id)
+            
+            logger.info(f"Appointment series created: ID {series_id} ({len(created)} appointments)")
+            skipped_note = f", {len(skipped)} tarih atlandı" if skipped else ""
+            return True, f"{len(created)} randevu oluşturuldu{skipped_note}", series_id
+            
+        except Exception as e:
+            logger.error(f"Appointment series creation failed: {e}")
+            return False, f"Randevu serisi oluşturulamadı: {str(e)}", None
+    
+    @staticmethod
+    def _series_clash_message(clash_dates: List[datetime]) -> str:
+        listed = ", ".join(f"{begin:%d.%m.%Y %H:%M}" for begin in clash_dates[:5])
+        more = f" (+{len(clash_dates) - 5})" if len(clash_dates) > 5 else ""
+        return f"Doktorun şu saatlerde başka randevusu var: {listed}{more}"
+    
+    def get_appointment_series(self, series_id: int) -> Optional[Dict[str, Any]]:
+        """Series rule, exceptions and its appointments"""
+        try:
+            with self.get_session() as session:
+                series = session.query(AppointmentSeries).filter_by(id=series_id).first()
+                if not series:
+                    return None
+                
+                appointments = session.query(
+                    Appointment.id, Appointment.appointment_date, Appointment.status
+                ).filter(
+                    Appointment.series_id == series_id
+                ).order_by(Appointment.appointment_date).all()
+                
+                return {
+                    'id': series.id,
+                    'patient_id': series.patient_id,
+                    'doctor_id': series.doctor_id,
+                    'rule': series.rule,
+                    'start_date': series.start_date,
+                    'duration_minutes': series.duration_minutes,
+                    'notes': encryption_manager.decrypt(series.notes) if series.notes else "",
+                    'exdates': parse_exdates(series.exdates),
+                    'is_active': series.is_active,
+                    'appointments': [{
+                        'id': appointment_id,
+                        'appointment_date': begin,
+                        'status': status.value if status else None
+                    } for appointment_id, begin, status in appointments]
+                }
+        except Exception as e:
+            logger.error(f"Failed to fetch appointment series: {e}")
+            return None
+    
+    def add_series_exception(self, series_id: int, occurrence_date: datetime) -> bool:
+        """Skip one occurrence of a series (cancel it and record the exdate)"""
+        try:
+            with self._slot_write(), self.get_session() as session:
+                series = session.query(AppointmentSeries).filter_by(id=series_id).first()
+                if not series:
+                    return False
+                
+                appointment = session.query(Appointment).filter(
+                    Appointment.series_id == series_id,
+                    Appointment.appointment_date == occurrence_date
+                ).first()
+                if appointment is None:
+                    return False
+                
+                appointment.status = AppointmentStatus.CANCELLED
+                series.exdates = format_exdates(parse_exdates(series.exdates) + [occurrence_date])
+                appointment_id = appointment.id
+                session.commit()
+                
+                slots = self._slot_index.get(series.doctor_id)
+                if slots is not None:
+                    slots.remove(appointment_id)
+                return True
+        except Exception as e:
+            logger.error(f"Failed to add series exception: {e}")
+            return False
+    
+    def cancel_appointment_series(
+        self, series_id: int, from_date: Optional[datetime] = None
+    ) -> int:
+        """Cancel a series' waiting appointments from from_date (default now) on
+        
+        Returns:
+            Number of appointments cancelled
+        """
+        try:
+            with self._slot_write(), self.get_session() as session:
+                series = session.query(AppointmentSeries).filter_by(id=series_id).first()
+                if not series:
+                    return 0
+                
+                appointment_ids = [row[0] for row in session.query(Appointment.id).filter(
+                    Appointment.series_id == series_id,
+                    Appointment.appointment_date >= (from_date or datetime.now()),
+                    Appointment.status == AppointmentStatus.WAITING
+                ).all()]
+                
+                if appointment_ids:
+                    session.query(Appointment).filter(
+                        Appointment.id.in_(appointment_ids)
+                    ).update(
+                        {Appointment.status: AppointmentStatus.CANCELLED},
+                        synchronize_session=False
+                    )
+                series.is_active = False
                 session.commit()
                 
-                logger.info(f"Appointment created: ID {appointment.id}")
-                return True, "Randevu oluşturuldu", appointment.id
+                slots = self._slot_index.get(series.doctor_id)
+                if slots is not None:
+                    for appointment_id in appointment_ids:
+                        slots.remove(appointment_id)
                 
+                logger.info(f"Appointment series {series_id} cancelled ({len(appointment_ids)} appointments)")
+                return len(appointment_ids)
         except Exception as e:
-            logger.error(f"Appointment creation failed: {e}")
-            return False, f"Randevu oluşturulamadı: {str(e)}", None
+            logger.error(f"Failed to cancel appointment series: {e}")
+            return 0
+    
+    def _sync_slot_index(self) -> None:
+        """Drop the slot index after an outside appointments write or
+        SLOT_INDEX_SECONDS (caller holds _slot_lock)"""
+        loaded_at, tag_version = self._slot_index_state
+        current = self.query_cache.tags_version(APPOINTMENT_TAGS)
+        if tag_version != current or time.monotonic() - loaded_at >= settings.SLOT_INDEX_SECONDS:
+            self._slot_index.clear()
+            self._slot_index_state = (time.monotonic(), current)
+    
+    def _doctor_slots(self, doctor_id: int) -> DoctorSlots:
+        """Interval index of one doctor, loaded on first use (caller holds _slot_lock)"""
+        slots = self._slot_index.get(doctor_id)
+        if slots is None:
+            default = settings.APPOINTMENT_DEFAULT_MINUTES
+            with self.get_session() as session:
+                rows = session.query(
+                    Appointment.id, Appointment.appointment_date, Appointment.duration_minutes
+                ).filter(
+                    Appointment.doctor_id == doctor_id,
+                    Appointment.status != AppointmentStatus.CANCELLED
+                ).all()
+            slots = DoctorSlots(
+                (begin, begin + timedelta(minutes=minutes or default), appointment_id)
+                for appointment_id, begin, minutes in rows
+            )
+            self._slot_index[doctor_id] = slots
+        return slots
+    
+    def _stored_overlaps(
+        self, session, doctor_id: int, start: datetime, end: datetime, exclude
+    ) -> List[Interval]:
+        """Overlapping appointments as stored, for the check that must not trust the index
+        
+        Args:
+            exclude: Criterion leaving out the rows being written (own ID or series)
+        """
+        default = settings.APPOINTMENT_DEFAULT_MINUTES
+        active = and_(
+            Appointment.doctor_id == doctor_id,
+            Appointment.status != AppointmentStatus.CANCELLED,
+            exclude
+        )
+        longest = session.query(
+            func.max(func.coalesce(Appointment.duration_minutes, default))
+        ).filter(active).scalar()
+        if longest is None:
+            return []
+        
+        rows = session.query(
+            Appointment.id, Appointment.appointment_date, Appointment.duration_minutes
+        ).filter(
+            active,
+            Appointment.appointment_date < end,
+            Appointment.appointment_date > start - timedelta(minutes=max(longest, default))
+        ).order_by(Appointment.appointment_date).all()
+        return [
+            (begin, begin + timedelta(minutes=minutes or default), appointment_id)
+            for appointment_id, begin, minutes in rows
+            if begin + timedelta(minutes=minutes or default) > start
+        ]
+    
+    @contextmanager
+    def _slot_write(self):
+        """Serialize an appointment write with the slot index
+        
+        The body updates the index itself after committing, so its own
+        commit is adopted here instead of forcing a reload. A body that
+        raises drops the index.
+        """
+        with self._slot_lock:
+            self._sync_slot_index()
+            try:
+                yield
+            except BaseException:
+                self._slot_index.clear()
+                raise
+            self._slot_index_state = (
+                self._slot_index_state[0], self.query_cache.tags_version(APPOINTMENT_TAGS)
+            )
     
     def get_todays_appointments(self) -> List[Dict[str, Any]]:
         """Get today's appointments"""
@@ -594,18 +1517,16 @@ class DatabaseManager:
                     )
                 ).order_by(Appointment.appointment_date).all()
                 
-                result = []
-                for appt, patient in appointments:
-                    result.append({
-                        'id': appt.id,
-                        'patient_name': encryption_manager.decrypt(patient.full_name),
-                        'patient_id': patient.id,
-                        'appointment_date': appt.appointment_date,
-                        'status': appt.status.value,
-                        'notes': encryption_manager.decrypt(appt.notes) if appt.notes else ""
-                    })
+                result = [{
+                    'id': appt.id,
+                    'patient_name': patient.full_name,
+                    'patient_id': patient.id,
+                    'appointment_date': appt.appointment_date,
+                    'status': appt.status.value,
+                    'notes': appt.notes
+                } for appt, patient in appointments]
                 
-                return result
+                return encryption_manager.decrypt_rows(result, ('patient_name', 'notes'))
                 
         except Exception as e:
             logger.error(f"Failed to fetch today's appointments: {e}")
@@ -626,30 +1547,92 @@ class DatabaseManager:
                     )
                 ).order_by(Appointment.appointment_date).all()
                 
-                result = []
-                for appt, patient, doctor in appointments:
-                    result.append({
-                        'id': appt.id,
-                        'patient_name': encryption_manager.decrypt(patient.full_name),
-                        'patient_tc': encryption_manager.decrypt(patient.tc_no),
-                        'doctor_name': doctor.full_name,
-                        'appointment_date': appt.appointment_date,
-                        'status': appt.status.value,
-                        'notes': encryption_manager.decrypt(appt.notes) if appt.notes else ""
-                    })
-                
-                return result
+                result = [{
+                    'id': appt.id,
+                    'patient_name': patient.full_name,
+                    'patient_tc': patient.tc_no,
+                    'doctor_name': doctor.full_name,
+                    'appointment_date': appt.appointment_date,
+                    'status': appt.status.value,
+                    'notes': appt.notes
+                } for appt, patient, doctor in appointments]
+                
+                return encryption_manager.decrypt_rows(
+                    result, ('patient_name', 'patient_tc', 'notes')
+                )
                 
         except Exception as e:
             logger.error(f"Failed to fetch appointments: {e}")
             return []
     
+    def get_day_schedule(self, date, doctor_id: int = None) -> List[Dict[str, Any]]:
+        """Appointments of one day with patient and doctor names
+        
+        One joined query and one batched decrypt, so a day view renders
+        without a lookup per appointment.
+        
+        Args:
+            date: Day (date or datetime)
+            doctor_id: Only this doctor's appointments
+            
+        Returns:
+            Rows ordered by time: id, appointment_date, status, notes,
+            patient_id, patient_name, doctor_id, doctor_name
+        """
+        try:
+            day = date.date() if isinstance(date, datetime) else date
+            start = datetime.combine(day, datetime.min.time())
+            end = start + timedelta(days=1)
+            
+            with self.get_session() as session:
+                query = session.query(
+                    Appointment.id, Appointment.appointment_date, Appointment.status,
+                    Appointment.notes, Appointment.patient_id, Patient.full_name,
+                    Appointment.doctor_id, User.full_name
+                ).join(Patient, Appointment.patient_id == Patient.id).join(
+                    User, Appointment.doctor_id == User.id
+                ).filter(
+                    Appointment.appointment_date >= start,
+                    Appointment.appointment_date < end
+                )
+                if doctor_id:
+                    query = query.filter(Appointment.doctor_id == doctor_id)
+                
+                result = [{
+                    'id': appt_id,
+                    'appointment_date': appointment_date,
+                    'status': status.value if status else None,
+                    'notes': notes,
+                    'patient_id': patient_id,
+                    'patient_name': patient_name,
+                    'doctor_id': appt_doctor_id,
+                    'doctor_name': doctor_name
+                } for (
+                    appt_id, appointment_date, status, notes,
+                    patient_id, patient_name, appt_doctor_id, doctor_name
+                ) in query.order_by(Appointment.appointment_date).all()]
+            
+            return encryption_manager.decrypt_rows(result, ('patient_name', 'notes'))
+            
+        except Exception as e:
+            logger.error(f"Failed to fetch day schedule: {e}")
+            return []
+    
     def update_appointment_status(
-        self, appointment_id: int, status: str
+        self, appointment_id: int, status: str, allow_overlap: bool = False
     ) -> bool:
-        """Update appointment status"""
+        """Update appointment status
+        
+        Restoring a cancelled appointment books its slot again, so it fails
+        when the doctor has been booked at that time since.
+        
+        Args:
+            appointment_id: Appointment ID
+            status: New status (name or value)
+            allow_overlap: Restore even if the doctor is busy at that time
+        """
         try:
-            with self.get_session() as session:
+            with self._slot_write(), self.get_session() as session:
                 appointment = session.query(Appointment).filter_by(id=appointment_id).first()
                 if appointment:
                     try:
@@ -663,8 +1646,37 @@ class DatabaseManager:
                         else:
                             return False
                     
+                    was_cancelled = appointment.status == AppointmentStatus.CANCELLED
+                    restoring = was_cancelled and status_enum != AppointmentStatus.CANCELLED
                     appointment.status = status_enum
+                    doctor_id = appointment.doctor_id
+                    begin = appointment.appointment_date
+                    end = begin + timedelta(
+                        minutes=appointment.duration_minutes or settings.APPOINTMENT_DEFAULT_MINUTES
+                    )
+                    
+                    if restoring and not allow_overlap:
+                        # The slot may have been booked while this one was cancelled
+                        if self._doctor_slots(doctor_id).overlapping(begin, end, ignore_id=appointment_id):
+                            session.rollback()
+                            return False
+                        session.flush()
+                        if self._stored_overlaps(
+                            session, doctor_id, begin, end, Appointment.id != appointment_id
+                        ):
+                            session.rollback()
+                            # Written elsewhere since the index was loaded
+                            self._slot_index.pop(doctor_id, None)
+                            return False
                     session.commit()
+                    
+                    # Cancelling frees the slot, restoring books it again
+                    slots = self._slot_index.get(doctor_id)
+                    if slots is not None:
+                        if status_enum == AppointmentStatus.CANCELLED:
+                            slots.remove(appointment_id)
+                        elif restoring:
+                            slots.add(begin, end, appointment_id)
                     return True
                 return False
         except Exception as e:
@@ -674,11 +1686,14 @@ class DatabaseManager:
     def delete_appointment(self, appointment_id: int) -> bool:
         """Delete appointment"""
         try:
-            with self.get_session() as session:
+            with self._slot_write(), self.get_session() as session:
                 appointment = session.query(Appointment).filter_by(id=appointment_id).first()
                 if appointment:
+                    slots = self._slot_index.get(appointment.doctor_id)
                     session.delete(appointment)
                     session.commit()
+                    if slots is not None:
+                        slots.remove(appointment_id)
                     return True
                 return False
         except Exception as e:
@@ -703,17 +1718,15 @@ class DatabaseManager:
                     )
                 ).all()
                 
-                result = []
-                for appt, patient in appointments:
-                    result.append({
-                        'id': appt.id,
-                        'patient_name': encryption_manager.decrypt(patient.full_name),
-                        'phone': encryption_manager.decrypt(patient.phone),
-                        'email': patient.email,
-                        'appointment_date': appt.appointment_date
-                    })
+                result = [{
+                    'id': appt.id,
+                    'patient_name': patient.full_name,
+                    'phone': patient.phone,
+                    'email': patient.email,
+                    'appointment_date': appt.appointment_date
+                } for appt, patient in appointments]
                 
-                return result
+                return encryption_manager.decrypt_rows(result, ('patient_name', 'phone'))
                 
         except Exception as e:
             logger.error(f"Failed to fetch pending reminders: {e}")
@@ -883,28 +1896,31 @@ class DatabaseManager:
             return False, "Ürün eklenemedi"
     
     def get_inventory(self) -> List[Dict[str, Any]]:
-        """Get all inventory products"""
+        """Get all inventory products (cached until products change)"""
         try:
-            with self.get_session() as session:
-                products = session.query(Product).order_by(Product.name).all()
-                
-                result = []
-                for p in products:
-                    result.append({
-                        'id': p.id,
-                        'name': p.name,
-                        'unit': p.unit,
-                        'quantity': p.quantity,
-                        'threshold': p.threshold,
-                        'is_low_stock': p.quantity <= p.threshold
-                    })
-                
-                return result
-                
+            return [dict(product) for product in self._inventory()]
         except Exception as e:
             logger.error(f"Failed to fetch inventory: {e}")
             return []
     
+    @cached(tags=("products",), cache_attr="query_cache")
+    def _inventory(self) -> List[Dict[str, Any]]:
+        with self.get_session() as session:
+            products = session.query(Product).order_by(Product.name).all()
+            
+            result = []
+            for p in products:
+                result.append({
+                    'id': p.id,
+                    'name': p.name,
+                    'unit': p.unit,
+                    'quantity': p.quantity,
+                    'threshold': p.threshold,
+                    'is_low_stock': p.quantity <= p.threshold
+                })
+            
+            return result
+    
     def update_product_quantity(
         self, product_id: int, quantity_change: int,
         user_id: int = None, patient_id: int = None
@@ -1018,35 +2034,95 @@ class DatabaseManager:
     # ==================== SETTINGS ====================
     
     def get_setting(self, key: str) -> Optional[str]:
-        """Get setting value"""
+        """Get setting value from the in-memory snapshot"""
         try:
-            with self.get_session() as session:
-                setting = session.query(Setting).filter_by(key=key).first()
-                return setting.value if setting else None
+            return self._current_settings().get(key)
         except Exception as e:
             logger.error(f"Failed to get setting: {e}")
             return None
     
+    def get_settings_snapshot(self) -> Mapping[str, Optional[str]]:
+        """Read-only view of all settings
+        
+        The mapping never changes; later writes replace the snapshot, so a
+        caller can read several keys consistently from one object.
+        """
+        try:
+            return self._current_settings()
+        except Exception as e:
+            logger.error(f"Failed to get settings: {e}")
+            return MappingProxyType({})
+    
     def set_setting(self, key: str, value: str) -> bool:
-        """Set setting value (upsert)"""
+        """Set setting value (upsert) and swap in a new snapshot"""
         try:
             with self.get_session() as session:
                 setting = session.query(Setting).filter_by(key=key).first()
                 
+                # updated_at is set on inserts too, it drives the version probe
                 if setting:
                     setting.value = value
                     setting.updated_at = datetime.now()
                 else:
-                    setting = Setting(key=key, value=value)
+                    setting = Setting(key=key, value=value, updated_at=datetime.now())
                     session.add(setting)
                 
                 session.commit()
-                return True
+            
+            with self._settings_lock:
+                current = self._settings_snapshot or {}
+                self._settings_snapshot = MappingProxyType({**current, key: value})
+                self._settings_tag_version = self.query_cache.tags_version(SETTINGS_TAGS)
+                # Re-read on the next probe in case another process wrote too
+                self._settings_version = None
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to set setting: {e}")
             return False
     
+    def _current_settings(self) -> Mapping[str, Optional[str]]:
+        """Snapshot, reloaded when stale or when the version probe changes
+        
+        The probe runs at most every SETTINGS_REFRESH_SECONDS and picks up
+        writes from other processes (e.g. tv_launcher.py).
+        """
+        snapshot = self._settings_snapshot
+        if snapshot is None or self._settings_tag_version != self.query_cache.tags_version(SETTINGS_TAGS):
+            return self._load_settings()
+        
+        if time.monotonic() - self._settings_checked_at >= settings.SETTINGS_REFRESH_SECONDS:
+            with self.get_session() as session:
+                version = self._settings_probe(session)
+            if version != self._settings_version:
+                return self._load_settings()
+            self._settings_checked_at = time.monotonic()
+        
+        return snapshot
+    
+    def _load_settings(self) -> Mapping[str, Optional[str]]:
+        """Read the whole settings table into a new immutable snapshot"""
+        tag_version = self.query_cache.tags_version(SETTINGS_TAGS)
+        with self.get_session() as session:
+            # Probe first: a write in between makes the next probe reload
+            version = self._settings_probe(session)
+            values = dict(session.query(Setting.key, Setting.value).all())
+        
+        snapshot = MappingProxyType(values)
+        with self._settings_lock:
+            self._settings_snapshot = snapshot
+            self._settings_version = version
+            self._settings_tag_version = tag_version
+            self._settings_checked_at = time.monotonic()
+        return snapshot
+    
+    @staticmethod
+    def _settings_probe(session: Session) -> Tuple:
+        """Cheap settings version: row count and latest update time"""
+        return tuple(session.query(
+            func.count(Setting.key), func.max(Setting.updated_at)
+        ).one())
+    
     def is_module_active(self, module_key: str) -> bool:
         """Check if module is active"""
         value = self.get_setting(module_key)
@@ -1108,6 +2184,285 @@ class DatabaseManager:
             logger.error(f"Failed to fetch audit logs: {e}")
             return []
     
+    # ==================== BULK WRITES ====================
+    
+    def bulk_create_patients(
+        self, patients: Iterable[Mapping[str, Any]], chunk_size: Optional[int] = None
+    ) -> BulkResult:
+        """Create many patients (imports)
+        
+        Args:
+            patients: Dicts with create_patient's arguments (tc_no, full_name,
+                phone, birth_date, gender, address, email, source)
+            chunk_size: Rows per transaction (default BULK_CHUNK_SIZE)
+            
+        Returns:
+            BulkResult; TCs already registered or repeated in the input are
+            reported as failures
+        """
+        seen_hashes = set()
+        
+        def prepare(session, chunk):
+            failures, candidates = {}, []
+            for position, row in chunk:
+                tc_no = str(row.get('tc_no') or '').strip()
+                full_name = str(row.get('full_name') or '').strip()
+                if not tc_no or not full_name:
+                    failures[position] = "TC kimlik numarası ve ad soyad zorunlu"
+                    continue
+                tc_hash = blind_index.tc_hash(tc_no)
+                if tc_hash is None:
+                    failures[position] = "TC kimlik numarası rakam içermiyor"
+                    continue
+                if tc_hash in seen_hashes:
+                    failures[position] = "TC kimlik numarası listede tekrarlanıyor"
+                    continue
+                seen_hashes.add(tc_hash)
+                candidates.append((position, row, tc_no, full_name, tc_hash))
+            
+            taken = {
+                tc_hash for (tc_hash,) in session.query(Patient.tc_hash).filter(
+                    Patient.tc_hash.in_([c[4] for c in candidates])
+                )
+            } if candidates else set()
+            
+            accepted = []
+            for candidate in candidates:
+                if candidate[4] in taken:
+                    failures[candidate[0]] = "Bu TC kimlik numarası zaten kayıtlı"
+                else:
+                    accepted.append(candidate)
+            
+            # One encryption call for the whole chunk
+            encrypted = iter(encryption_manager.encrypt_many([
+                value for _, row, tc_no, full_name, _ in accepted
+                for value in (tc_no, full_name, row.get('phone'), row.get('address'))
+            ]))
+            records = []
+            for position, row, tc_no, full_name, tc_hash in accepted:
+                records.append((position, ({
+                    'tc_no': next(encrypted),
+                    'full_name': next(encrypted),
+                    'phone': next(encrypted),
+                    'address': next(encrypted),
+                    'email': row.get('email'),
+                    'birth_date': row.get('birth_date'),
+                    'gender': row.get('gender'),
+                    'source': row.get('source') or "Diğer",
+                    'status': PatientStatus.NEW,
+                    'tc_hash': tc_hash,
+                    'phone_hash': blind_index.phone_hash(row.get('phone')),
+                }, sorted(blind_index.name_token_hashes(full_name)))))
+            return records, failures
+        
+        def write(session, records):
+            ids = session.execute(
+                insert(Patient).returning(Patient.id, sort_by_parameter_order=True),
+                [values for values, _ in records]
+            ).scalars().all()
+            tokens = [
+                {'patient_id': patient_id, 'token_hash': token}
+                for patient_id, (_, patient_tokens) in zip(ids, records)
+                for token in patient_tokens
+            ]
+            if tokens:
+                session.execute(insert(PatientSearchToken), tokens)
+            return ids
+        
+        return self._bulk_write("patients", patients, prepare, write, chunk_size)
+    
+    def bulk_create_transactions(
+        self, transactions: Iterable[Mapping[str, Any]], chunk_size: Optional[int] = None
+    ) -> BulkResult:
+        """Create many financial transactions
+        
+        Args:
+            transactions: Dicts with create_transaction's arguments
+                (transaction_type, category, amount, description, date)
+            chunk_size: Rows per transaction (default BULK_CHUNK_SIZE)
+        """
+        def prepare(session, chunk):
+            records, failures = [], {}
+            now = datetime.now()
+            for position, row in chunk:
+                try:
+                    amount = float(row['amount'])
+                except (KeyError, TypeError, ValueError):
+                    failures[position] = "Geçersiz tutar"
+                    continue
+                
+                transaction_type = row.get('transaction_type') or row.get('type')
+                if isinstance(transaction_type, TransactionType):
+                    type_enum = transaction_type
+                else:
+                    try:
+                        type_enum = TransactionType[str(transaction_type).upper()]
+                    except KeyError:
+                        type_enum = TransactionType.INCOME if transaction_type == "Gelir" else TransactionType.EXPENSE
+                
+                records.append((position, {
+                    'type': type_enum,
+                    'category': row.get('category') or "Genel",
+                    'amount': amount,
+                    'description': row.get('description'),
+                    'transaction_date': row.get('date') or now,
+                }))
+            return records, failures
+        
+        def write(session, records):
+            return session.execute(
+                insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                records
+            ).scalars().all()
+        
+        return self._bulk_write("transactions", transactions, prepare, write, chunk_size)
+    
+    def bulk_add_audit_logs(
+        self, logs: Iterable[Mapping[str, Any]], chunk_size: Optional[int] = None
+    ) -> BulkResult:
+        """Add many audit log entries
+        
+        Args:
+            logs: Dicts with add_audit_log's arguments
+                (user_id, action_type, description, ip_address)
+            chunk_size: Rows per transaction (default BULK_CHUNK_SIZE)
+        """
+        def prepare(session, chunk):
+            records, failures = [], {}
+            for position, row in chunk:
+                if not row.get('action_type'):
+                    failures[position] = "İşlem türü zorunlu"
+                    continue
+                records.append((position, {
+                    'user_id': row.get('user_id'),
+                    'action_type': row['action_type'],
+                    'description': row.get('description'),
+                    'ip_address': row.get('ip_address'),
+                }))
+            return records, failures
+        
+        def write(session, records):
+            return session.execute(
+                insert(AuditLog).returning(AuditLog.id, sort_by_parameter_order=True),
+                records
+            ).scalars().all()
+        
+        return self._bulk_write("audit_logs", logs, prepare, write, chunk_size)
+    
+    def bulk_add_inventory_logs(
+        self, movements: Iterable[Mapping[str, Any]], chunk_size: Optional[int] = None
+    ) -> BulkResult:
+        """Apply many stock movements (bulk update_product_quantity)
+        
+        Args:
+            movements: Dicts with product_id, quantity (signed change),
+                user_id and patient_id
+            chunk_size: Rows per transaction (default BULK_CHUNK_SIZE)
+        """
+        def prepare(session, chunk):
+            records, failures = [], {}
+            product_ids = {row.get('product_id') for _, row in chunk}
+            known = {
+                product_id for (product_id,) in
+                session.query(Product.id).filter(Product.id.in_(product_ids))
+            }
+            for position, row in chunk:
+                if row.get('product_id') not in known:
+                    failures[position] = "Ürün bulunamadı"
+                    continue
+                try:
+                    quantity = int(row['quantity'])
+                except (KeyError, TypeError, ValueError):
+                    failures[position] = "Geçersiz miktar"
+                    continue
+                records.append((position, {
+                    'product_id': row['product_id'],
+                    'user_id': row.get('user_id'),
+                    'patient_id': row.get('patient_id'),
+                    'quantity': quantity,
+                }))
+            return records, failures
+        
+        def write(session, records):
+            ids = session.execute(
+                insert(InventoryLog).returning(InventoryLog.id, sort_by_parameter_order=True),
+                records
+            ).scalars().all()
+            
+            # One UPDATE per product, however many movements it had
+            deltas: Dict[int, int] = {}
+            for record in records:
+                deltas[record['product_id']] = deltas.get(record['product_id'], 0) + record['quantity']
+            products = Product.__table__
+            session.execute(
+                update(products).where(products.c.id == bindparam('product'))
+                .values(quantity=products.c.quantity + bindparam('delta')),
+                [{'product': product_id, 'delta': delta} for product_id, delta in deltas.items()]
+            )
+            return ids
+        
+        return self._bulk_write("inventory_logs", movements, prepare, write, chunk_size)
+    
+    def _bulk_write(
+        self, label: str, rows: Iterable[Mapping[str, Any]],
+        prepare: Callable, write: Callable, chunk_size: Optional[int]
+    ) -> BulkResult:
+        """Validate and insert rows in chunks, one transaction per chunk
+        
+        Args:
+            label: Name for logging
+            rows: Input rows
+            prepare: (session, [(position, row)]) -> ([(position, record)], {position: reason})
+            write: (session, [record]) -> new ids in record order
+            chunk_size: Rows per transaction (default BULK_CHUNK_SIZE)
+        
+        A chunk whose insert fails is retried row by row in savepoints, so
+        one bad row is reported instead of losing its neighbours.
+        """
+        ids: Dict[int, int] = {}
+        failures: Dict[int, str] = {}
+        total = 0
+        
+        for chunk in _chunks(enumerate(rows), chunk_size or settings.BULK_CHUNK_SIZE):
+            total += len(chunk)
+            records: List[Tuple[int, Any]] = []
+            new_ids: List[int] = []
+            try:
+                with self.get_session() as session:
+                    records, rejected = prepare(session, chunk)
+                    failures.update(rejected)
+                    if records:
+                        new_ids = write(session, [record for _, record in records])
+                ids.update(zip((position for position, _ in records), new_ids))
+            except Exception as e:
+                if not records:
+                    # prepare() itself failed: the whole chunk is lost
+                    failures.update((position, str(e)) for position, _ in chunk)
+                    continue
+                logger.warning(f"Bulk {label} chunk failed, retrying row by row: {e}")
+                self._bulk_write_rows(records, write, ids, failures)
+        
+        logger.info(f"Bulk {label}: {len(ids)} inserted, {len(failures)} failed of {total}")
+        return BulkResult(total, ids, dict(sorted(failures.items())))
+    
+    def _bulk_write_rows(
+        self, records: List[Tuple[int, Any]], write: Callable,
+        ids: Dict[int, int], failures: Dict[int, str]
+    ) -> None:
+        """Internal: insert records one by one, each in its own savepoint"""
+        try:
+            with self.get_session() as session:
+                for position, record in records:
+                    try:
+                        with session.begin_nested():
+                            ids[position] = write(session, [record])[0]
+                    except Exception as e:
+                        failures[position] = str(getattr(e, 'orig', None) or e)
+        except Exception as e:
+            for position, _ in records:
+                ids.pop(position, None)
+                failures.setdefault(position, str(e))
+    
     # ==================== MEDICAL NEWS ====================
     
     def add_news_article(
@@ -1146,38 +2501,43 @@ class DatabaseManager:
         self, limit: int = 20, offset: int = 0,
         unread_only: bool = False
     ) -> List[Dict[str, Any]]:
-        """Get medical news articles"""
+        """Get medical news articles (cached until news change)"""
         try:
-            with self.get_session() as session:
-                query = session.query(MedicalNews)
-                
-                if unread_only:
-                    query = query.filter(MedicalNews.is_read == False)
-                
-                articles = query.order_by(
-                    MedicalNews.published_date.desc()
-                ).limit(limit).offset(offset).all()
-                
-                result = []
-                for article in articles:
-                    result.append({
-                        'id': article.id,
-                        'title': article.title,
-                        'summary': article.summary,
-                        'link': article.link,
-                        'source': article.source,
-                        'image_url': article.image_url,
-                        'is_read': article.is_read,
-                        'is_saved': article.is_saved,
-                        'published_date': article.published_date
-                    })
-                
-                return result
-                
+            return [dict(article) for article in self._news_articles(limit, offset, unread_only)]
         except Exception as e:
             logger.error(f"Failed to fetch news articles: {e}")
             return []
     
+    @cached(tags=("medical_news",), cache_attr="query_cache")
+    def _news_articles(
+        self, limit: int, offset: int, unread_only: bool
+    ) -> List[Dict[str, Any]]:
+        with self.get_session() as session:
+            query = session.query(MedicalNews)
+            
+            if unread_only:
+                query = query.filter(MedicalNews.is_read == False)
+            
+            articles = query.order_by(
+                MedicalNews.published_date.desc()
+            ).limit(limit).offset(offset).all()
+            
+            result = []
+            for article in articles:
+                result.append({
+                    'id': article.id,
+                    'title': article.title,
+                    'summary': article.summary,
+                    'link': article.link,
+                    'source': article.source,
+                    'image_url': article.image_url,
+                    'is_read': article.is_read,
+                    'is_saved': article.is_saved,
+                    'published_date': article.published_date
+                })
+            
+            return result
+    
     def mark_news_read(self, news_id: int = None, mark_all: bool = False) -> bool:
         """Mark news as read"""
         try:
@@ -1321,68 +2681,247 @@ class DatabaseManager:
     # ==================== STATISTICS & DASHBOARD ====================
     
     def get_dashboard_stats(self) -> Dict[str, Any]:
-        """Get dashboard statistics"""
+        """Get dashboard statistics
+        
+        All figures come from one aggregate query. The result is kept for
+        DASHBOARD_CACHE_SECONDS and dropped as soon as appointments,
+        patients or transactions are written.
+        
+        Returns:
+            Dict with 'today_appointments', 'waiting', 'completed',
+            'total_patients', 'month_income' and 'status_breakdown'
+        """
+        version = self.query_cache.tags_version(DASHBOARD_TABLES)
+        snapshot = self._dashboard_snapshot
+        if snapshot and snapshot[1] == version and snapshot[0] > time.monotonic():
+            return self._copy_dashboard_stats(snapshot[2])
+        
         try:
-            with self.get_session() as session:
-                # Today's appointments
-                today = datetime.now().date()
-                tomorrow = today + timedelta(days=1)
-                
-                today_appts = session.query(Appointment).filter(
-                    and_(
-                        Appointment.appointment_date >= today,
-                        Appointment.appointment_date < tomorrow
-                    )
-                ).count()
-                
-                # Total patients
-                total_patients = session.query(Patient).filter(
-                    Patient.status != PatientStatus.ARCHIVED
-                ).count()
-                
-                # This month's income
-                month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0)
-                month_income = session.query(
-                    func.sum(Transaction.amount)
-                ).filter(
-                    and_(
-                        Transaction.type == TransactionType.INCOME,
-                        Transaction.transaction_date >= month_start
-                    )
-                ).scalar() or 0
-                
-                # Appointment status breakdown
-                status_breakdown = session.query(
-                    Appointment.status,
-                    func.count(Appointment.id)
-                ).filter(
-                    and_(
-                        Appointment.appointment_date >= today,
-                        Appointment.appointment_date < tomorrow
-                    )
-                ).group_by(Appointment.status).all()
-                
-                return {
-                    'today_appointments': today_appts,
-                    'total_patients': total_patients,
-                    'month_income': month_income,
-                    'status_breakdown': [
-                        {'status': status.value, 'count': count}
-                        for status, count in status_breakdown
-                    ]
-                }
-                
+            stats = self._query_dashboard_stats()
         except Exception as e:
             logger.error(f"Failed to get dashboard stats: {e}")
             return {
                 'today_appointments': 0,
+                'waiting': 0,
+                'completed': 0,
                 'total_patients': 0,
                 'month_income': 0,
                 'status_breakdown': []
             }
+        
+        with self._dashboard_lock:
+            # Skip caching if a write committed while we were querying
+            if version == self.query_cache.tags_version(DASHBOARD_TABLES):
+                self._dashboard_snapshot = (
+                    time.monotonic() + settings.DASHBOARD_CACHE_SECONDS, version, stats
+                )
+        return self._copy_dashboard_stats(stats)
+    
+    @staticmethod
+    def _copy_dashboard_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+        return {**stats, 'status_breakdown': [dict(s) for s in stats['status_breakdown']]}
+    
+    def _query_dashboard_stats(self) -> Dict[str, Any]:
+        """Dashboard figures in a single round trip (conditional aggregation)"""
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        tomorrow = today + timedelta(days=1)
+        month_start = today.replace(day=1)
+        statuses = list(AppointmentStatus)
+        
+        total_patients = select(func.count(Patient.id)).where(
+            Patient.status != PatientStatus.ARCHIVED
+        ).scalar_subquery()
+        month_income = select(func.coalesce(func.sum(Transaction.amount), 0)).where(
+            Transaction.type == TransactionType.INCOME,
+            Transaction.transaction_date >= month_start
+        ).scalar_subquery()
+        
+        query = select(
+            func.count(Appointment.id),
+            *[
+                func.coalesce(func.sum(case((Appointment.status == status, 1), else_=0)), 0)
+                for status in statuses
+            ],
+            total_patients,
+            month_income
+        ).where(
+            Appointment.appointment_date >= today,
+            Appointment.appointment_date < tomorrow
+        )
+        
+        with self.get_session() as session:
+            row = session.execute(query).one()
+        
+        today_count = row[0]
+        status_counts = dict(zip(statuses, row[1:1 + len(statuses)]))
+        
+        return {
+            'today_appointments': today_count,
+            'waiting': status_counts[AppointmentStatus.WAITING],
+            'completed': status_counts[AppointmentStatus.COMPLETED],
+            'total_patients': row[-2],
+            'month_income': row[-1],
+            'status_breakdown': [
+                {'status': status.value, 'count': count}
+                for status, count in status_counts.items() if count
+            ]
+        }
+    
+    # ==================== DIAGNOSTICS ====================
+    
+    def enable_db_metrics(self, slow_query_ms: float = None) -> None:
+        """Start collecting query metrics at runtime
+        
+        Args:
+            slow_query_ms: Override the slow query log threshold
+        """
+        if slow_query_ms is not None:
+            self.metrics.slow_query_ms = slow_query_ms
+        self.metrics.attach(self.engine)
+    
+    def disable_db_metrics(self) -> None:
+        """Stop collecting query metrics (collected data is kept)"""
+        self.metrics.detach()
+    
+    def get_db_metrics(self, reset: bool = False) -> Dict[str, Any]:
+        """Snapshot of SQL statement counts and timings
+        
+        Statements are grouped by the outermost public DatabaseManager
+        method that issued them; everything else is reported as '<other>'.
+        
+        Args:
+            reset: Clear the collected metrics after taking the snapshot
+            
+        Returns:
+            Dict with totals and per-method 'statements', 'total_ms',
+            'avg_ms', 'max_ms' and 'slowest' statements, plus the
+            query_cache statistics under 'cache'
+        """
+        snapshot = self.metrics.snapshot()
+        snapshot['cache'] = self.query_cache.get_stats()
+        if reset:
+            self.metrics.reset()
+        return snapshot
     
     # ==================== CLEANUP & MAINTENANCE ====================
     
+    def backfill_patient_hashes(self) -> Dict[str, int]:
+        """Prepare an existing database for the unique TC blind index
+        
+        Older versions could store the same TC hash on several patients.
+        The oldest record keeps it, the others are cleared, then every
+        patient without a TC hash is (re)indexed; the cleared duplicates
+        get a duplicate marker there, so later startups skip them.
+        
+        Returns:
+            Dict with 'released' and 'indexed' counts
+        """
+        released = 0
+        
+        try:
+            with self.get_session() as session:
+                duplicates = session.query(
+                    Patient.tc_hash, func.min(Patient.id)
+                ).filter(
+                    Patient.tc_hash.isnot(None)
+                ).group_by(Patient.tc_hash).having(func.count(Patient.id) > 1).all()
+                
+                for tc_hash, keep_id in duplicates:
+                    released += session.query(Patient).filter(
+                        Patient.tc_hash == tc_hash,
+                        Patient.id != keep_id
+                    ).update({'tc_hash': None}, synchronize_session=False)
+            
+            if released:
+                logger.warning(f"Released {released} duplicate TC blind indexes")
+                
+        except Exception as e:
+            logger.error(f"Duplicate TC cleanup failed: {e}")
+        
+        indexed = self.rebuild_patient_search_index(only_missing=True)
+        return {'released': released, 'indexed': indexed}
+    
+    def rebuild_patient_search_index(
+        self, only_missing: bool = False, batch_size: int = 500
+    ) -> int:
+        """Recompute patient blind indexes from the encrypted columns
+        
+        Rows are processed oldest first; when two share a TC, the older
+        record owns it and the newer one gets a duplicate marker.
+        
+        Args:
+            only_missing: Only process rows without a TC blind index (rows
+                marked as duplicates, empty or unreadable are not retried)
+            batch_size: Rows decrypted per transaction
+            
+        Returns:
+            Number of patients re-indexed
+        """
+        rebuilt = 0
+        last_id = 0
+        claimed = set()
+        
+        try:
+            while True:
+                with self.get_session() as session:
+                    query = session.query(Patient).filter(Patient.id > last_id)
+                    if only_missing:
+                        query = query.filter(Patient.tc_hash.is_(None))
+                    
+                    patients = query.order_by(Patient.id).limit(batch_size).all()
+                    if not patients:
+                        break
+                    
+                    for patient in patients:
+                        last_id = patient.id
+                        try:
+                            tc_no = encryption_manager.decrypt(patient.tc_no)
+                            self._apply_patient_index(
+                                patient,
+                                full_name=encryption_manager.decrypt(patient.full_name),
+                                phone=encryption_manager.decrypt(patient.phone)
+                            )
+                        except RuntimeError as e:
+                            # Marked so later startups do not decrypt it again
+                            patient.tc_hash = blind_index.unreadable_tc_marker(patient.id)
+                            logger.warning(f"Blind index skipped for patient {patient.id}: {e}")
+                            continue
+                        
+                        tc_hash = blind_index.tc_hash(tc_no)
+                        if tc_hash is None:
+                            patient.tc_hash = blind_index.empty_tc_marker(patient.id)
+                            rebuilt += 1
+                            continue
+                        
+                        owner = None
+                        if tc_hash not in claimed:
+                            with session.no_autoflush:
+                                owner = session.query(Patient).filter(
+                                    Patient.tc_hash == tc_hash, Patient.id != patient.id
+                                ).first()
+                        if owner is not None and owner.id > patient.id:
+                            # The older record owns the TC; take it from the newer one
+                            owner.tc_hash = blind_index.duplicate_tc_marker(owner.id)
+                            session.flush()
+                            logger.warning(f"Duplicate TC number on patient {owner.id}, marked as duplicate")
+                            owner = None
+                        if tc_hash in claimed or owner is not None:
+                            # Keep the unique index valid; an older record owns the TC
+                            patient.tc_hash = blind_index.duplicate_tc_marker(patient.id)
+                            logger.warning(f"Duplicate TC number on patient {patient.id}, marked as duplicate")
+                        else:
+                            patient.tc_hash = tc_hash
+                            claimed.add(tc_hash)
+                        rebuilt += 1
+            
+            if rebuilt:
+                logger.info(f"Patient search index rebuilt for {rebuilt} patients")
+            return rebuilt
+            
+        except Exception as e:
+            logger.error(f"Patient search index rebuild failed: {e}")
+            return rebuilt
+    
     def cleanup_old_data(self):
         """Clean up old data based on retention policies"""
         try:
@@ -3,7 +3,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Text, Float, DateTime, 
-    Boolean, ForeignKey, Table, Enum
+    Boolean, ForeignKey, Table, Enum, Index
 )
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
@@ -74,7 +74,7 @@ class Patient(Base):
     __tablename__ = "patients"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    tc_no = Column(String(255), unique=True, nullable=False, index=True)  # Encrypted
+    tc_no = Column(String(255), nullable=False, index=True)  # Encrypted (uniqueness via tc_hash)
     full_name = Column(String(255), nullable=False)  # Encrypted
     phone = Column(String(255))  # Encrypted
     email = Column(String(100))
@@ -84,6 +84,10 @@ class Patient(Base):
     status = Column(Enum(PatientStatus), default=PatientStatus.NEW)
     source = Column(String(50), default="Diğer")  # How they found us
     
+    # Blind indexes (keyed HMAC of normalized values, see database/blind_index.py)
+    tc_hash = Column(String(64), unique=True, index=True)
+    phone_hash = Column(String(64), index=True)
+    
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
     
@@ -91,11 +95,32 @@ class Patient(Base):
     appointments = relationship("Appointment", back_populates="patient")
     medical_records = relationship("MedicalRecord", back_populates="patient")
     files = relationship("PatientFile", back_populates="patient")
+    search_tokens = relationship(
+        "PatientSearchToken", back_populates="patient", cascade="all, delete-orphan"
+    )
     
     def __repr__(self):
         return f"<Patient(id={self.id}, status={self.status.value})>"
 
 
+class PatientSearchToken(Base):
+    """Blind index of patient name prefixes for encrypted name search"""
+    __tablename__ = "patient_search_tokens"
+    __table_args__ = (
+        Index("ix_patient_search_tokens_token_patient", "token_hash", "patient_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False)
+    
+    # Relationships
+    patient = relationship("Patient", back_populates="search_tokens")
+    
+    def __repr__(self):
+        return f"<PatientSearchToken(patient_id={self.patient_id})>"
+
+
 class Appointment(Base):
     """Appointment scheduling"""
     __tablename__ = "appointments"
@@ -106,9 +131,11 @@ class Appointment(Base):
     active_user_id = Column(Integer, ForeignKey("users.id"))  # Who created it
     
     appointment_date = Column(DateTime, nullable=False, index=True)
+    duration_minutes = Column(Integer)  # NULL = APPOINTMENT_DEFAULT_MINUTES
     status = Column(Enum(AppointmentStatus), default=AppointmentStatus.WAITING)
     notes = Column(Text)  # Encrypted
     reminder_sent = Column(Boolean, default=False)
+    series_id = Column(Integer, ForeignKey("appointment_series.id"), index=True)  # Recurring series
     
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
@@ -116,11 +143,37 @@ class Appointment(Base):
     # Relationships
     patient = relationship("Patient", back_populates="appointments")
     doctor = relationship("User", back_populates="appointments", foreign_keys=[doctor_id])
+    series = relationship("AppointmentSeries", back_populates="appointments")
     
     def __repr__(self):
         return f"<Appointment(id={self.id}, date={self.appointment_date}, status={self.status.value})>"
 
 
+class AppointmentSeries(Base):
+    """Recurring appointments (RRULE) expanded into Appointment rows"""
+    __tablename__ = "appointment_series"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, index=True)
+    doctor_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    active_user_id = Column(Integer, ForeignKey("users.id"))  # Who created it
+    
+    rule = Column(String(255), nullable=False)  # e.g. FREQ=WEEKLY;BYDAY=MO,TH;COUNT=20
+    start_date = Column(DateTime, nullable=False)  # DTSTART
+    duration_minutes = Column(Integer, nullable=False)
+    notes = Column(Text)  # Encrypted
+    exdates = Column(Text, default="")  # Skipped occurrences, comma separated
+    is_active = Column(Boolean, default=True)
+    
+    created_at = Column(DateTime, server_default=func.now())
+    
+    # Relationships
+    appointments = relationship("Appointment", back_populates="series")
+    
+    def __repr__(self):
+        return f"<AppointmentSeries(id={self.id}, rule={self.rule})>"
+
+
 class MedicalRecord(Base):
     """Medical examination records"""
     __tablename__ = "medical_records"
@@ -0,0 +1,118 @@
+# database/projections.py
+
+"""Lightweight read-only row objects returned by list queries
+
+Encrypted columns are kept as ciphertext and decrypted on first access,
+so a caller that only shows the patient name pays for one decrypt per row.
+"""
+
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from utils.encryption_manager import encryption_manager
+
+
+class _EncryptedField:
+    """Descriptor that decrypts a slot on first read and memoizes the result"""
+    __slots__ = ('slot', 'bit')
+
+    def __init__(self, slot: str, bit: int):
+        self.slot = slot
+        self.bit = bit
+
+    def __get__(self, row, owner=None):
+        if row is None:
+            return self
+        value = getattr(row, self.slot)
+        if not row._decrypted & self.bit:
+            value = encryption_manager.decrypt(value)
+            setattr(row, self.slot, value)
+            row._decrypted |= self.bit
+        return value
+
+
+class PatientRow:
+    """Patient list projection with lazily decrypted tc_no, full_name, phone, address
+
+    Supports attribute access (``row.full_name``) and read-only dict access
+    (``row['full_name']``, ``row.get('phone')``) for existing callers.
+    """
+
+    # Column order used by queries building rows with from_columns()
+    COLUMNS: Tuple[str, ...] = (
+        'id', 'tc_no', 'full_name', 'phone', 'email', 'birth_date',
+        'gender', 'address', 'status', 'source', 'created_at'
+    )
+    ENCRYPTED: Tuple[str, ...] = ('tc_no', 'full_name', 'phone', 'address')
+
+    __slots__ = (
+        'id', 'email', 'birth_date', 'gender', 'status', 'source', 'created_at',
+        '_tc_no', '_full_name', '_phone', '_address', '_decrypted'
+    )
+
+    tc_no = _EncryptedField('_tc_no', 1)
+    full_name = _EncryptedField('_full_name', 2)
+    phone = _EncryptedField('_phone', 4)
+    address = _EncryptedField('_address', 8)
+
+    def __init__(
+        self, id: int, tc_no: Optional[str], full_name: Optional[str],
+        phone: Optional[str], email: Optional[str], birth_date: Optional[str],
+        gender: Optional[str], address: Optional[str], status: Any,
+        source: Optional[str], created_at: Any
+    ):
+        self.id = id
+        self._tc_no = tc_no
+        self._full_name = full_name
+        self._phone = phone
+        self.email = email
+        self.birth_date = birth_date
+        self.gender = gender
+        self._address = address
+        self.status = getattr(status, 'value', status)
+        self.source = source
+        self.created_at = created_at
+        self._decrypted = 0
+
+    @classmethod
+    def from_columns(cls, values) -> "PatientRow":
+        """Build a row from a result tuple ordered like COLUMNS"""
+        return cls(*values)
+
+    def set_plain(self, field: str, value: str) -> None:
+        """Store an already decrypted value so it is not decrypted again"""
+        descriptor = type(self).__dict__[field]
+        setattr(self, descriptor.slot, value)
+        self._decrypted |= descriptor.bit
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully decrypted dict (remaining fields decrypted in one batch)"""
+        pending = [
+            type(self).__dict__[field] for field in self.ENCRYPTED
+            if not self._decrypted & type(self).__dict__[field].bit
+        ]
+        plain = encryption_manager.decrypt_many([getattr(self, d.slot) for d in pending])
+        for descriptor, value in zip(pending, plain):
+            setattr(self, descriptor.slot, value)
+            self._decrypted |= descriptor.bit
+        return {key: getattr(self, key) for key in self.COLUMNS}
+
+    # Dict-style read access
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.COLUMNS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.COLUMNS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.COLUMNS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.COLUMNS)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.COLUMNS
+
+    def __repr__(self):
+        return f"<PatientRow(id={self.id}, status={self.status})>"
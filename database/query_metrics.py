@@ -0,0 +1,169 @@
+# database/query_metrics.py
+
+"""Opt-in SQL statement counting and timing
+
+Listens to the engine's cursor events and attributes every statement to the
+public DatabaseManager method that issued it, so a page render can be
+measured in statements and milliseconds instead of reading DB_ECHO output.
+"""
+
+import heapq
+import sys
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Statements issued outside a public method (startup, maintenance, raw sessions)
+UNATTRIBUTED = "<other>"
+
+
+class QueryMetrics:
+    """Per-method statement counts, total time and slowest statements"""
+
+    def __init__(self, owner: type, slow_query_ms: float = 200.0, top_n: int = 5):
+        """Initialize metrics
+
+        Args:
+            owner: Class whose public methods statements are grouped by
+            slow_query_ms: Statements slower than this are logged (0 disables)
+            top_n: Number of slowest statements kept per method
+        """
+        self.slow_query_ms = slow_query_ms
+        self.top_n = top_n
+        self._engine: Optional[Engine] = None
+        self._lock = Lock()
+        self._methods: Dict[str, Dict[str, Any]] = {}
+        self._started_at = time.time()
+
+        # Code objects of public methods -> method name
+        self._codes = {}
+        for klass in reversed(owner.__mro__):
+            for name, attr in vars(klass).items():
+                if name.startswith('_'):
+                    continue
+                func = getattr(attr, '__func__', attr)
+                code = getattr(func, '__code__', None)
+                if code is not None:
+                    self._codes[code] = name
+
+    def attach(self, engine: Engine) -> None:
+        """Start listening to an engine's cursor events"""
+        if self._engine is not None:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+        self._engine = engine
+
+    def detach(self) -> None:
+        """Stop listening (collected metrics are kept)"""
+        if self._engine is None:
+            return
+        event.remove(self._engine, "before_cursor_execute", self._before_execute)
+        event.remove(self._engine, "after_cursor_execute", self._after_execute)
+        event.remove(self._engine, "handle_error", self._on_error)
+        self._engine = None
+
+    @property
+    def attached(self) -> bool:
+        return self._engine is not None
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start_time')
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        method = self._caller()
+        self.record(method, statement, elapsed_ms)
+
+        if self.slow_query_ms and elapsed_ms >= self.slow_query_ms:
+            logger.warning(
+                f"Slow query ({elapsed_ms:.1f} ms) in {method}: "
+                f"{' '.join(statement.split())[:300]}"
+            )
+
+    def _on_error(self, context):
+        # A failed statement gets no after_cursor_execute; drop its start time
+        # so pooled connections do not accumulate them
+        conn = context.connection
+        if conn is None or context.execution_context is None:
+            return
+        starts = conn.info.get('query_start_time')
+        if starts:
+            starts.pop()
+
+    def _caller(self) -> str:
+        """Outermost public method on the current call stack"""
+        method = UNATTRIBUTED
+        frame = sys._getframe(2)
+        while frame is not None:
+            name = self._codes.get(frame.f_code)
+            if name is not None:
+                method = name
+            frame = frame.f_back
+        return method
+
+    def record(self, method: str, statement: str, elapsed_ms: float) -> None:
+        """Add one executed statement to a method's totals"""
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = {
+                    'statements': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'slowest': []  # min-heap of (ms, statement)
+                }
+            stats['statements'] += 1
+            stats['total_ms'] += elapsed_ms
+            if elapsed_ms > stats['max_ms']:
+                stats['max_ms'] = elapsed_ms
+
+            entry = (elapsed_ms, statement)
+            if len(stats['slowest']) < self.top_n:
+                heapq.heappush(stats['slowest'], entry)
+            elif elapsed_ms > stats['slowest'][0][0]:
+                heapq.heapreplace(stats['slowest'], entry)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the collected metrics, busiest methods first"""
+        with self._lock:
+            methods = {}
+            for name, stats in sorted(
+                self._methods.items(), key=lambda item: item[1]['total_ms'], reverse=True
+            ):
+                methods[name] = {
+                    'statements': stats['statements'],
+                    'total_ms': round(stats['total_ms'], 3),
+                    'avg_ms': round(stats['total_ms'] / stats['statements'], 3),
+                    'max_ms': round(stats['max_ms'], 3),
+                    'slowest': [
+                        {'ms': round(ms, 3), 'statement': statement}
+                        for ms, statement in sorted(stats['slowest'], reverse=True)
+                    ]
+                }
+
+            return {
+                'enabled': self.attached,
+                'since': self._started_at,
+                'slow_query_ms': self.slow_query_ms,
+                'statements': sum(m['statements'] for m in methods.values()),
+                'total_ms': round(sum(m['total_ms'] for m in methods.values()), 3),
+                'methods': methods
+            }
+
+    def reset(self) -> None:
+        """Clear collected metrics"""
+        with self._lock:
+            self._methods.clear()
+            self._started_at = time.time()
@@ -0,0 +1,58 @@
+# database/recurrence.py
+
+"""RRULE expansion for recurring appointment series
+
+Series are stored as an RFC 5545 rule ("FREQ=WEEKLY;BYDAY=MO,TH;COUNT=20")
+plus a start and a list of excluded dates; this module turns those into the
+concrete appointment times.
+"""
+
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, List, Optional
+
+from dateutil.rrule import rruleset, rrulestr
+
+EXDATE_FORMAT = "%Y-%m-%dT%H:%M"
+
+
+def expand_rule(
+    rule: str, start: datetime, exdates: Iterable[datetime] = (),
+    max_occurrences: int = 100
+) -> List[datetime]:
+    """Occurrences of a rule, without the excluded dates
+
+    Args:
+        rule: RRULE body, with or without the "RRULE:" prefix
+        start: First occurrence (DTSTART); its time of day applies to all
+        exdates: Occurrences to leave out
+        max_occurrences: Upper bound, so rules without COUNT/UNTIL are refused
+
+    Raises:
+        ValueError: If the rule is invalid or yields more than max_occurrences
+    """
+    body = rule.strip()
+    if body.upper().startswith("RRULE:"):
+        body = body[len("RRULE:"):]
+    if not body:
+        raise ValueError("Empty recurrence rule")
+
+    occurrences = rruleset()
+    occurrences.rrule(rrulestr(body, dtstart=start.replace(second=0, microsecond=0)))
+    for exdate in exdates:
+        occurrences.exdate(exdate)
+
+    expanded = list(islice(occurrences, max_occurrences + 1))
+    if len(expanded) > max_occurrences:
+        raise ValueError(f"Recurrence rule yields more than {max_occurrences} occurrences")
+    return expanded
+
+
+def format_exdates(exdates: Iterable[datetime]) -> str:
+    """Serialize excluded dates for AppointmentSeries.exdates"""
+    return ",".join(sorted({exdate.strftime(EXDATE_FORMAT) for exdate in exdates}))
+
+
+def parse_exdates(value: Optional[str]) -> List[datetime]:
+    """Parse AppointmentSeries.exdates"""
+    return [datetime.strptime(part, EXDATE_FORMAT) for part in (value or "").split(",") if part]
@@ -0,0 +1,30 @@
+# database/results.py
+
+"""Plain result records returned by DatabaseManager
+
+Unlike the projections, these hold already plain values: nothing in
+them is encrypted or decrypted on access.
+"""
+
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class UserInfo(NamedTuple):
+    """Directory entry for a user: what lists need to show a name, no secrets"""
+    id: int
+    username: str
+    full_name: str
+    role: Any  # UserRole
+    specialty: Optional[str]
+    is_active: bool
+
+
+class BulkResult(NamedTuple):
+    """Outcome of a bulk_* write, keyed by position in the input"""
+    total: int
+    ids: Dict[int, int]  # position -> new row id
+    failures: Dict[int, str]  # position -> reason
+
+    @property
+    def inserted(self) -> int:
+        return len(self.ids)
@@ -0,0 +1,201 @@
+# database/slot_index.py
+
+"""Per-doctor interval index over booked appointments
+
+Each doctor's appointments are kept as (start, end, id) intervals sorted by
+start time. Because no interval is longer than the longest one seen, an
+overlap check is two binary searches over the start times instead of a
+range query, and free slots are found by walking the gaps between
+neighbours. DatabaseManager keeps the index in step with every
+appointment write.
+"""
+
+import bisect
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+# (start, end, appointment_id); end is exclusive, so back-to-back bookings do not overlap
+Interval = Tuple[datetime, datetime, int]
+TimeRange = Tuple[time, time]
+
+# Accepted working hours: "09:00-18:00", [(time(9), time(18))] or {weekday: either}
+WorkingHours = Union[str, Sequence[TimeRange], Mapping[int, Union[str, Sequence[TimeRange]]]]
+
+_RANGE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$')
+
+
+class DoctorSlots:
+    """Booked intervals of one doctor, sorted by start time"""
+
+    __slots__ = ('_intervals', '_starts', '_by_id', '_max_length')
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._intervals: List[Interval] = sorted(intervals)
+        self._starts: List[datetime] = [interval[0] for interval in self._intervals]
+        self._by_id: Dict[int, Interval] = {interval[2]: interval for interval in self._intervals}
+        # Upper bound only: removals do not shrink it, which keeps checks correct
+        self._max_length = max(
+            (end - start for start, end, _ in self._intervals), default=timedelta(0)
+        )
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __contains__(self, appointment_id: int) -> bool:
+        return appointment_id in self._by_id
+
+    def add(self, start: datetime, end: datetime, appointment_id: int) -> None:
+        """Insert or move an appointment"""
+        if end <= start:
+            raise ValueError("Appointment must end after it starts")
+        self.remove(appointment_id)
+
+        interval = (start, end, appointment_id)
+        position = bisect.bisect_right(self._intervals, interval)
+        self._intervals.insert(position, interval)
+        self._starts.insert(position, start)
+        self._by_id[appointment_id] = interval
+        self._max_length = max(self._max_length, end - start)
+
+    def remove(self, appointment_id: int) -> bool:
+        """Drop an appointment (False if it was not indexed)"""
+        interval = self._by_id.pop(appointment_id, None)
+        if interval is None:
+            return False
+        position = bisect.bisect_left(self._intervals, interval)
+        del self._intervals[position]
+        del self._starts[position]
+        return True
+
+    def _window(self, start: datetime, end: datetime) -> List[Interval]:
+        """Intervals that may touch [start, end), in start order"""
+        # Anything starting before start - max_length has ended by start
+        low = bisect.bisect_right(self._starts, start - self._max_length)
+        high = bisect.bisect_left(self._starts, end)
+        return self._intervals[low:high]
+
+    def overlapping(
+        self, start: datetime, end: datetime, ignore_id: Optional[int] = None
+    ) -> List[Interval]:
+        """Booked intervals overlapping [start, end)"""
+        return [
+            interval for interval in self._window(start, end)
+            if interval[1] > start and interval[2] != ignore_id
+        ]
+
+    def conflicts(
+        self, proposed: Sequence[Tuple[datetime, datetime]]
+    ) -> Dict[int, List[Interval]]:
+        """Check many bookings in one forward pass
+
+        Args:
+            proposed: (start, end) pairs sorted by start
+
+        Returns:
+            {position in proposed: overlapping intervals}, clashing ones only
+        """
+        found: Dict[int, List[Interval]] = {}
+        low = 0
+        for position, (start, end) in enumerate(proposed):
+            # Sorted input keeps the lower bound moving forward
+            low = bisect.bisect_right(self._starts, start - self._max_length, low)
+            clashes = []
+            for index in range(low, len(self._intervals)):
+                interval = self._intervals[index]
+                if interval[0] >= end:
+                    break
+                if interval[1] > start:
+                    clashes.append(interval)
+            if clashes:
+                found[position] = clashes
+        return found
+
+    def free_gaps(self, start: datetime, end: datetime) -> Iterator[Tuple[datetime, datetime]]:
+        """Unbooked stretches of [start, end), in order"""
+        cursor = start
+        for booked_start, booked_end, _ in self._window(start, end):
+            if booked_start > cursor:
+                yield cursor, booked_start
+            cursor = max(cursor, booked_end)
+            if cursor >= end:
+                return
+        if cursor < end:
+            yield cursor, end
+
+
+def parse_time_ranges(value: Union[str, Sequence[TimeRange]]) -> List[TimeRange]:
+    """Parse "09:00-12:30,13:30-18:00" (or pass (time, time) pairs through)
+
+    Raises:
+        ValueError: If a range is malformed or ends before it starts
+    """
+    if not isinstance(value, str):
+        ranges = [(begin, finish) for begin, finish in value]
+    else:
+        ranges = []
+        for part in filter(None, (part.strip() for part in value.split(","))):
+            match = _RANGE.match(part)
+            if not match:
+                raise ValueError(f"Invalid working hours: {part!r} (expected HH:MM-HH:MM)")
+            h1, m1, h2, m2 = map(int, match.groups())
+            ranges.append((time(h1, m1), time(0, 0) if h2 == 24 else time(h2, m2)))
+
+    for begin, finish in ranges:
+        if finish != time(0, 0) and finish <= begin:
+            raise ValueError(f"Working hours end before they start: {begin}-{finish}")
+    return sorted(ranges)
+
+
+def working_windows(
+    start: datetime, end: datetime, working_hours: WorkingHours,
+    working_days: Iterable[int] = range(7)
+) -> Iterator[Tuple[datetime, datetime]]:
+    """Working periods inside [start, end), day by day
+
+    Args:
+        working_hours: Ranges used every working day, or a {weekday: ranges}
+            mapping (Monday = 0; weekdays missing from it are closed)
+        working_days: Open weekdays when working_hours is not a mapping
+    """
+    if isinstance(working_hours, Mapping):
+        per_day = {day: parse_time_ranges(ranges) for day, ranges in working_hours.items()}
+    else:
+        ranges = parse_time_ranges(working_hours)
+        per_day = {day: ranges for day in working_days}
+
+    day: date = start.date()
+    while day <= end.date():
+        for begin, finish in per_day.get(day.weekday(), ()):
+            window_start = datetime.combine(day, begin)
+            # 24:00 / 00:00 as an end means midnight
+            window_end = datetime.combine(day + timedelta(days=1) if finish == time(0, 0) else day, finish)
+            window_start, window_end = max(window_start, start), min(window_end, end)
+            if window_start < window_end:
+                yield window_start, window_end
+        day += timedelta(days=1)
+
+
+def free_slots(
+    slots: DoctorSlots, windows: Iterable[Tuple[datetime, datetime]],
+    duration: timedelta, step: timedelta, limit: Optional[int] = None
+) -> List[Tuple[datetime, datetime]]:
+    """Bookable (start, end) slots of `duration` inside the windows
+
+    Candidate starts lie on a `step` grid counted from each window's start,
+    so slots read 09:00, 09:15, ... rather than 09:07.
+    """
+    if duration <= timedelta(0) or step <= timedelta(0):
+        raise ValueError("duration and step must be positive")
+
+    found: List[Tuple[datetime, datetime]] = []
+    for window_start, window_end in windows:
+        for gap_start, gap_end in slots.free_gaps(window_start, window_end):
+            steps = -((window_start - gap_start) // step)  # ceil((gap_start - window_start) / step)
+            candidate = window_start + steps * step
+            while candidate + duration <= gap_end:
+                found.append((candidate, candidate + duration))
+                if limit is not None and len(found) >= limit:
+                    return found
+                candidate += step
+    return found
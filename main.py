@@ -15,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from database.db_manager import DatabaseManager
 from services.license_service import LicenseService
 from services.notification_service import NotificationService
+from utils.cache import start_sweeper
 from ui.app_layout import AppLayout
 # Config sınıfı Settings olarak tanımlandığı için takma ad (alias) kullanıyoruz
 from config import Settings as Config
@@ -209,6 +210,10 @@ def init_app(page: ft.Page):
     except Exception as e:
         logger.warning(f"⚠️ Bildirim servisi başlatılamadı: {e}")
     
+    # Süresi dolan cache girdilerini arka planda temizle (opsiyonel)
+    if Config.CACHE_SWEEP_INTERVAL_SECONDS > 0:
+        start_sweeper()
+    
     # ============================================
     # 4. ROUTING SİSTEMİ
     # ============================================
@@ -0,0 +1,201 @@
+# scripts/benchmark_db.py
+"""
+DatabaseManager Performans Ölçümü
+=================================
+
+Sık kullanılan DatabaseManager çağrılarını sentetik veri üzerinde ölçer ve
+sonuçları commit'ler arası karşılaştırma için JSON olarak yazar.
+
+Kullanım:
+    python scripts/benchmark_db.py                          # geçici DB, varsayılan hacim
+    python scripts/benchmark_db.py --patients 5000 --appointments 50000
+    python scripts/benchmark_db.py --db bench.db            # DB yoksa üretir, varsa kullanır
+    python scripts/benchmark_db.py --compare reports/benchmarks/onceki.json
+
+Not:
+    Var olan bir --db dosyasını tekrar kullanmak için ENCRYPTION_KEY,
+    veriyi üreten süreçtekiyle aynı olmalıdır.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Proje kök dizinini ekle
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from scripts.synthetic_data import DEFAULT_SCALE, FIRST_NAMES, LAST_NAMES
+
+DEFAULT_OUTPUT_DIR = ROOT_DIR / "reports" / "benchmarks"
+
+
+def build_benchmarks(db, seed: int = 42) -> List[Tuple[str, Callable[[], Any]]]:
+    """Hot DatabaseManager calls with fixed, seeded arguments"""
+    from database.models import User
+
+    rng = random.Random(seed)
+    with db.get_session() as session:
+        user_ids = [
+            uid for (uid,) in session.query(User.id).filter(
+                User.username.like("synthetic_%")
+            ).order_by(User.id).all()
+        ] or [uid for (uid,) in session.query(User.id).order_by(User.id).all()]
+    user1, user2 = (user_ids + user_ids)[:2]
+
+    name_query = rng.choice(LAST_NAMES)[:3]
+    full_query = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    return [
+        ("get_active_patients", db.get_active_patients),
+        ("get_active_patients[full_name]",
+         lambda: [p.full_name for p in db.get_active_patients()]),
+        ("search_patients[prefix]", lambda: db.search_patients(name_query)),
+        ("search_patients[full_name]", lambda: db.search_patients(full_query)),
+        ("get_todays_appointments", db.get_todays_appointments),
+        ("get_financial_summary[all]", db.get_financial_summary),
+        ("get_financial_summary[month]",
+         lambda: db.get_financial_summary(month_start, month_start + timedelta(days=31))),
+        ("get_dashboard_stats", db.get_dashboard_stats),
+        ("get_dashboard_stats[cold]",
+         lambda: (db.query_cache.invalidate_tags("appointments"), db.get_dashboard_stats())[1]),
+        ("get_chat_history", lambda: db.get_chat_history(user1, user2)),
+    ]
+
+
+def run_benchmark(db, func: Callable[[], Any], repeat: int, warmup: int) -> Dict[str, Any]:
+    """Time one call; statement counts come from the query metrics"""
+    for _ in range(warmup):
+        func()
+
+    db.get_db_metrics(reset=True)
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    metrics = db.get_db_metrics(reset=True)
+
+    return {
+        'repeat': repeat,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'statements_per_call': round(metrics['statements'] / repeat, 2),
+        'sql_ms_per_call': round(metrics['total_ms'] / repeat, 3),
+        'rows': len(result) if hasattr(result, '__len__') else None,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Median ratio per benchmark against an earlier results file"""
+    lines = []
+    for name, result in current['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or not previous.get('median_ms'):
+            lines.append(f"  {name:<32} (yeni)")
+            continue
+        ratio = result['median_ms'] / previous['median_ms']
+        lines.append(
+            f"  {name:<32} {previous['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms"
+            f"  x{ratio:.2f}"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DatabaseManager benchmark")
+    parser.add_argument("--db", help="SQLite dosyası (yoksa üretilir, verilmezse geçici)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", help="JSON çıktı dosyası")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki JSON sonucu")
+    for name, default in DEFAULT_SCALE.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    args = parser.parse_args(argv)
+
+    temp_dir = None
+    if args.db:
+        db_path = Path(args.db).resolve()
+    else:
+        temp_dir = tempfile.TemporaryDirectory(prefix="krats_bench_")
+        db_path = Path(temp_dir.name) / "bench.db"
+    generate = not db_path.exists()
+
+    # DATABASE_URL must be set before config is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    from database.db_manager import DatabaseManager
+    from scripts.synthetic_data import SyntheticDataGenerator
+
+    db = DatabaseManager()
+    scale = {name: getattr(args, name) for name in DEFAULT_SCALE}
+    if generate:
+        print(f"Sentetik veri üretiliyor ({db_path})...")
+        started = time.perf_counter()
+        SyntheticDataGenerator(db, seed=args.seed).generate(progress=True, **scale)
+        print(f"Üretim süresi: {time.perf_counter() - started:.1f} s")
+
+    db.enable_db_metrics(slow_query_ms=0)
+    results = {}
+    print(f"\n{'benchmark':<32} {'median':>10} {'min':>10} {'sql/call':>9}")
+    for name, func in build_benchmarks(db, seed=args.seed):
+        results[name] = run_benchmark(db, func, args.repeat, args.warmup)
+        r = results[name]
+        print(f"{name:<32} {r['median_ms']:>8.2f}ms {r['min_ms']:>8.2f}ms {r['statements_per_call']:>9}")
+    db.disable_db_metrics()
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'scale': scale if generate else None,
+        'database': None if temp_dir else str(db_path),
+        'results': results,
+    }
+
+    output = Path(args.output) if args.output else DEFAULT_OUTPUT_DIR / (
+        f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{report['commit'] or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nSonuçlar: {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(f"\nKarşılaştırma ({baseline.get('commit')}):")
+        print("\n".join(compare(report, baseline)))
+
+    db.engine.dispose()
+    if temp_dir:
+        temp_dir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# scripts/benchmark_validators.py
+"""
+Toplu Doğrulama Performans Ölçümü
+=================================
+
+Validators.validate_*_many toplu doğrulayıcılarını, aynı verinin tek tek
+doğrulanmasıyla (validate_tc_no, validate_phone, validate_email) karşılaştırır.
+Sonuçlar ayrıca doğrulanır: iki yolun geçerlilik maskesi aynı olmalıdır.
+
+Kullanım:
+    python scripts/benchmark_validators.py                 # 200.000 değer
+    python scripts/benchmark_validators.py --count 1000000 --invalid 0.2
+    python scripts/benchmark_validators.py --output reports/benchmarks/dogrulama.json
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Proje kök dizinini ekle
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from utils import validators
+from utils.validators import Validators
+
+
+def make_tc(rng: random.Random) -> str:
+    """Random TC number with valid check digits"""
+    digits = [rng.randint(1, 9)] + [rng.randint(0, 9) for _ in range(8)]
+    digits.append((sum(digits[0:9:2]) * 7 - sum(digits[1:8:2])) % 10)
+    digits.append(sum(digits) % 10)
+    return "".join(map(str, digits))
+
+
+def make_dataset(count: int, invalid: float, seed: int) -> Dict[str, List[str]]:
+    """TC numbers, phones and emails in the shapes seen in imports"""
+    rng = random.Random(seed)
+    phone_formats = ["5{}", "+90 5{}", "90 5{}", "(5{}"]
+
+    tcs, phones, emails = [], [], []
+    for i in range(count):
+        broken = rng.random() < invalid
+        tc_no = make_tc(rng)
+        tcs.append(tc_no[:-1] + str((int(tc_no[-1]) + 1) % 10) if broken else tc_no)
+
+        phone = rng.choice(phone_formats).format(f"{rng.randint(0, 999999999):09d}")
+        phones.append(phone[:-3] if broken else phone)
+
+        emails.append(f"hasta{i}@ornek" if broken else f"hasta{i}@ornek.com.tr")
+    return {'tc_no': tcs, 'phone': phones, 'email': emails}
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(timings), 3), 'min_ms': round(min(timings), 3)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validators batch vs scalar benchmark")
+    parser.add_argument("--count", type=int, default=200_000, help="Alan başına değer sayısı")
+    parser.add_argument("--invalid", type=float, default=0.1, help="Hatalı değer oranı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON çıktı dosyası")
+    args = parser.parse_args(argv)
+
+    data = make_dataset(args.count, args.invalid, args.seed)
+    pairs = [
+        ('tc_no', Validators.validate_tc_no, Validators.validate_tc_no_many),
+        ('phone', Validators.validate_phone, Validators.validate_phone_many),
+        ('email', Validators.validate_email, Validators.validate_email_many),
+    ]
+
+    print(f"NumPy: {validators.np.__version__ if validators.np is not None else 'yok (saf Python)'}")
+    print(f"\n{'alan':<8} {'tek tek':>12} {'toplu':>12} {'hız':>7} {'hatalı':>9}")
+    results = {}
+    for name, scalar, batch in pairs:
+        values = data[name]
+        scalar_valid = [scalar(value)[0] for value in values]
+        result = batch(values)
+        if [bool(flag) for flag in result.valid] != scalar_valid:
+            print(f"{name}: toplu sonuç tek tek doğrulamayla uyuşmuyor")
+            return 1
+
+        scalar_time = time_call(lambda: [scalar(value) for value in values], args.repeat)
+        batch_time = time_call(lambda: batch(values), args.repeat)
+        speedup = scalar_time['median_ms'] / batch_time['median_ms']
+        results[name] = {
+            'scalar': scalar_time,
+            'batch': batch_time,
+            'speedup': round(speedup, 2),
+            'invalid': len(result.errors()),
+        }
+        print(
+            f"{name:<8} {scalar_time['median_ms']:>10.1f}ms {batch_time['median_ms']:>10.1f}ms"
+            f" {speedup:>6.1f}x {results[name]['invalid']:>9}"
+        )
+
+    if args.output:
+        report = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': validators.np.__version__ if validators.np is not None else None,
+            'count': args.count,
+            'invalid_ratio': args.invalid,
+            'seed': args.seed,
+            'results': results,
+        }
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nSonuçlar: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
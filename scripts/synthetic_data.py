@@ -0,0 +1,359 @@
+# scripts/synthetic_data.py
+"""
+Sentetik Klinik Verisi Üretici
+==============================
+
+Performans ölçümleri için gerçekçi hacimde, tekrarlanabilir (seed'li)
+veri üretir: geçerli TC kimlik numaralı hastalar, randevular, finans
+hareketleri, denetim kayıtları ve mesajlar.
+
+Kullanım:
+    python scripts/synthetic_data.py --db bench.db
+    python scripts/synthetic_data.py --db bench.db --patients 5000 --appointments 50000
+
+Not:
+    Üretilen veritabanını başka bir süreçte okumak için ENCRYPTION_KEY
+    ayarlanmış olmalıdır (aksi halde geçici anahtar kullanılır).
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Proje kök dizinini ekle
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_SCALE = {
+    'patients': 50_000,
+    'appointments': 500_000,
+    'transactions': 100_000,
+    'audit_logs': 200_000,
+    'messages': 50_000,
+}
+
+FIRST_NAMES = [
+    "Ahmet", "Mehmet", "Mustafa", "Ali", "Hüseyin", "Hasan", "İbrahim", "İsmail",
+    "Osman", "Yusuf", "Murat", "Ömer", "Emre", "Burak", "Can", "Çağrı", "Kerem",
+    "Ayşe", "Fatma", "Emine", "Hatice", "Zeynep", "Elif", "Meryem", "Şerife",
+    "Zehra", "Sultan", "Hanife", "Merve", "Büşra", "Esra", "Gül", "Özlem", "Ebru",
+]
+LAST_NAMES = [
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk",
+    "Aydın", "Özdemir", "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara",
+    "Koç", "Kurt", "Özkan", "Şimşek", "Polat", "Öz", "Korkmaz", "Erdoğan",
+    "Güneş", "Aksoy", "Tekin", "Bulut", "Acar", "Turan", "Uçar", "Ekinci",
+]
+CITIES = ["İstanbul", "Ankara", "İzmir", "Bursa", "Antalya", "Konya", "Adana", "Kayseri"]
+SOURCES = ["Google", "Instagram", "Tavsiye", "Facebook", "Web Sitesi", "Diğer"]
+INCOME_CATEGORIES = ["Muayene", "Tedavi", "Kontrol", "Ameliyat"]
+EXPENSE_CATEGORIES = ["Kira", "Maaş", "Malzeme", "Fatura", "Vergi"]
+AUDIT_ACTIONS = ["LOGIN", "CREATE", "UPDATE", "DELETE", "VIEW"]
+NOTE_PHRASES = [
+    "Kontrol randevusu", "İlk muayene", "Tahlil sonuçları değerlendirilecek",
+    "Tedavi devam", "Dikiş alınacak", "Reçete yenileme",
+]
+
+# Working day slots (09:00-18:00, 15 minutes)
+SLOT_MINUTES = 15
+DAY_START_HOUR = 9
+SLOTS_PER_DAY = (18 - DAY_START_HOUR) * 60 // SLOT_MINUTES
+
+
+def generate_tc_no(rng: random.Random) -> str:
+    """Random TC Kimlik No with valid checksum digits"""
+    digits = [rng.randint(1, 9)] + [rng.randint(0, 9) for _ in range(8)]
+    digits.append((sum(digits[0:9:2]) * 7 - sum(digits[1:8:2])) % 10)
+    digits.append(sum(digits) % 10)
+    return "".join(map(str, digits))
+
+
+def generate_phone(rng: random.Random) -> str:
+    """Random Turkish mobile number (5XXXXXXXXX)"""
+    return "5" + "".join(str(rng.randint(0, 9)) for _ in range(9))
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SyntheticDataGenerator:
+    """Fill a database with deterministic synthetic clinic data"""
+
+    def __init__(self, db, seed: int = 42, batch_size: int = 5000, now: datetime = None):
+        """
+        Args:
+            db: DatabaseManager instance
+            seed: Random seed (same seed, same data)
+            batch_size: Rows per executemany/transaction
+            now: Reference time (appointments are spread around it)
+        """
+        self.db = db
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.now = now or datetime.now()
+        self.doctor_ids: List[int] = []
+        self.user_ids: List[int] = []
+        self.patient_ids: List[int] = []
+
+    def generate(self, progress: bool = False, **scale) -> Dict[str, int]:
+        """Generate every table
+
+        Args:
+            progress: Print per-table timings
+            **scale: Row counts overriding DEFAULT_SCALE
+
+        Returns:
+            Dict of inserted row counts per table
+        """
+        counts = {**DEFAULT_SCALE, **scale}
+        result = {}
+
+        steps = [
+            ('users', lambda: self.generate_users()),
+            ('patients', lambda: self.generate_patients(counts['patients'])),
+            ('appointments', lambda: self.generate_appointments(counts['appointments'])),
+            ('transactions', lambda: self.generate_transactions(counts['transactions'])),
+            ('audit_logs', lambda: self.generate_audit_logs(counts['audit_logs'])),
+            ('messages', lambda: self.generate_messages(counts['messages'])),
+        ]
+        for name, step in steps:
+            started = time.perf_counter()
+            result[name] = step()
+            if progress:
+                print(f"  {name:<13} {result[name]:>8} satır  {time.perf_counter() - started:6.1f} s")
+
+        return result
+
+    # ==================== USERS ====================
+
+    def generate_users(self, doctors: int = 8, staff: int = 4) -> int:
+        """Create doctors and staff sharing one precomputed password hash"""
+        from database.db_manager import security_manager
+        from database.models import User, UserRole
+
+        password = security_manager.hash_password("Synthetic123!")
+        users = []
+        for i in range(doctors + staff):
+            is_doctor = i < doctors
+            users.append(User(
+                username=f"synthetic_{'dr' if is_doctor else 'staff'}_{i}",
+                password=password,
+                full_name=f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+                role=UserRole.DOCTOR if is_doctor else UserRole.SECRETARY,
+                specialty="Genel"
+            ))
+
+        with self.db.get_session() as session:
+            session.add_all(users)
+            session.flush()
+            self.doctor_ids = [u.id for u in users[:doctors]]
+            self.user_ids = [u.id for u in users]
+
+        return len(users)
+
+    # ==================== PATIENTS ====================
+
+    def generate_patients(self, count: int) -> int:
+        """Insert encrypted patients together with their blind indexes"""
+        from sqlalchemy import func, insert
+        from database import blind_index
+        from database.models import Patient, PatientSearchToken, PatientStatus
+        from utils.encryption_manager import encryption_manager
+
+        token_hash = lru_cache(maxsize=None)(blind_index.name_token_hash)
+        statuses = [PatientStatus.ACTIVE] * 6 + [PatientStatus.NEW] * 3 + [PatientStatus.ARCHIVED]
+
+        with self.db.get_session() as session:
+            next_id = (session.query(func.max(Patient.id)).scalar() or 0) + 1
+
+        used_tc = set()
+        inserted = 0
+        while inserted < count:
+            patients, tokens = [], []
+            for _ in range(min(self.batch_size, count - inserted)):
+                tc_no = generate_tc_no(self.rng)
+                while tc_no in used_tc:
+                    tc_no = generate_tc_no(self.rng)
+                used_tc.add(tc_no)
+
+                full_name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+                phone = generate_phone(self.rng)
+                address = f"{self.rng.choice(CITIES)}, No: {self.rng.randint(1, 200)}"
+                patients.append({
+                    'id': next_id,
+                    'tc_no': encryption_manager.encrypt(tc_no),
+                    'full_name': encryption_manager.encrypt(full_name),
+                    'phone': encryption_manager.encrypt(phone),
+                    'address': encryption_manager.encrypt(address),
+                    'email': f"hasta{next_id}@example.com",
+                    'birth_date': (
+                        f"{self.rng.randint(1940, 2020)}-"
+                        f"{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}"
+                    ),
+                    'gender': self.rng.choice(["Erkek", "Kadın"]),
+                    'status': self.rng.choice(statuses),
+                    'source': self.rng.choice(SOURCES),
+                    'tc_hash': blind_index.tc_hash(tc_no),
+                    'phone_hash': blind_index.phone_hash(phone),
+                    'created_at': self.now - timedelta(minutes=self.rng.randint(0, 3 * 365 * 24 * 60)),
+                })
+                tokens.extend(
+                    {'patient_id': next_id, 'token_hash': token_hash(prefix)}
+                    for prefix in blind_index.name_prefixes(full_name)
+                )
+                self.patient_ids.append(next_id)
+                next_id += 1
+
+            with self.db.get_session() as session:
+                session.execute(insert(Patient), patients)
+                for chunk in _chunks(tokens, self.batch_size * 4):
+                    session.execute(insert(PatientSearchToken), chunk)
+            inserted += len(patients)
+
+        return inserted
+
+    # ==================== APPOINTMENTS ====================
+
+    def generate_appointments(self, count: int, past_days: int = 365, future_days: int = 60) -> int:
+        """Insert appointments on 15-minute slots around the reference date"""
+        from database.models import Appointment, AppointmentStatus
+        from utils.encryption_manager import encryption_manager
+
+        today = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
+        past_statuses = [AppointmentStatus.COMPLETED] * 7 + [
+            AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW
+        ]
+        doctors = self.doctor_ids or [1]
+
+        rows = []
+        for _ in range(count):
+            day = today + timedelta(days=self.rng.randint(-past_days, future_days))
+            slot = self.rng.randrange(SLOTS_PER_DAY)
+            when = day + timedelta(hours=DAY_START_HOUR, minutes=slot * SLOT_MINUTES)
+            # Most appointments have no notes; encrypting every row dominates runtime
+            notes = (
+                encryption_manager.encrypt(self.rng.choice(NOTE_PHRASES))
+                if self.rng.random() < 0.2 else None
+            )
+            rows.append({
+                'patient_id': self.rng.choice(self.patient_ids),
+                'doctor_id': self.rng.choice(doctors),
+                'active_user_id': self.rng.choice(self.user_ids) if self.user_ids else None,
+                'appointment_date': when,
+                'status': self.rng.choice(past_statuses) if when < self.now else AppointmentStatus.WAITING,
+                'notes': notes,
+                'reminder_sent': when < self.now,
+            })
+
+            if len(rows) >= self.batch_size:
+                self._insert(Appointment, rows)
+                rows = []
+        self._insert(Appointment, rows)
+
+        return count
+
+    # ==================== FINANCE / AUDIT / MESSAGES ====================
+
+    def generate_transactions(self, count: int, past_days: int = 730) -> int:
+        from database.models import Transaction, TransactionType
+
+        rows = []
+        for _ in range(count):
+            is_income = self.rng.random() < 0.7
+            rows.append({
+                'type': TransactionType.INCOME if is_income else TransactionType.EXPENSE,
+                'category': self.rng.choice(INCOME_CATEGORIES if is_income else EXPENSE_CATEGORIES),
+                'amount': round(self.rng.uniform(100, 5000 if is_income else 20000), 2),
+                'description': "Sentetik kayıt",
+                'transaction_date': self.now - timedelta(minutes=self.rng.randint(0, past_days * 24 * 60)),
+            })
+            if len(rows) >= self.batch_size:
+                self._insert(Transaction, rows)
+                rows = []
+        self._insert(Transaction, rows)
+        return count
+
+    def generate_audit_logs(self, count: int, past_days: int = 365) -> int:
+        from database.models import AuditLog
+
+        users = self.user_ids or [None]
+        rows = []
+        for _ in range(count):
+            action = self.rng.choice(AUDIT_ACTIONS)
+            rows.append({
+                'user_id': self.rng.choice(users),
+                'action_type': action,
+                'description': f"{action} işlemi",
+                'ip_address': f"10.0.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}",
+                'created_at': self.now - timedelta(minutes=self.rng.randint(0, past_days * 24 * 60)),
+            })
+            if len(rows) >= self.batch_size:
+                self._insert(AuditLog, rows)
+                rows = []
+        self._insert(AuditLog, rows)
+        return count
+
+    def generate_messages(self, count: int, past_days: int = 180) -> int:
+        from database.models import Message
+
+        if len(self.user_ids) < 2:
+            return 0
+
+        rows = []
+        for _ in range(count):
+            sender, receiver = self.rng.sample(self.user_ids, 2)
+            rows.append({
+                'sender_id': sender,
+                'receiver_id': receiver,
+                'message': "Sentetik mesaj",
+                'is_read': self.rng.random() < 0.9,
+                'created_at': self.now - timedelta(minutes=self.rng.randint(0, past_days * 24 * 60)),
+            })
+            if len(rows) >= self.batch_size:
+                self._insert(Message, rows)
+                rows = []
+        self._insert(Message, rows)
+        return count
+
+    def _insert(self, model, rows: List[Dict]) -> None:
+        """executemany insert of one batch in its own transaction"""
+        from sqlalchemy import insert
+
+        if not rows:
+            return
+        with self.db.get_session() as session:
+            session.execute(insert(model), rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sentetik klinik verisi üret")
+    parser.add_argument("--db", required=True, help="SQLite veritabanı dosyası")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    for name, default in DEFAULT_SCALE.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    args = parser.parse_args(argv)
+
+    # DATABASE_URL must be set before config is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(args.db).resolve()}"
+    from database.db_manager import DatabaseManager
+
+    db = DatabaseManager()
+    generator = SyntheticDataGenerator(db, seed=args.seed, batch_size=args.batch_size)
+    print(f"Veri üretiliyor: {args.db} (seed={args.seed})")
+    counts = generator.generate(
+        progress=True, **{name: getattr(args, name) for name in DEFAULT_SCALE}
+    )
+    print(f"Tamamlandı: {sum(counts.values())} satır")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
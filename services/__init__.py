@@ -9,6 +9,7 @@ from .enabiz_service import ENabizService
 from .sms_service import SMSService
 from .whatsapp_service import WhatsAppService
 from .news_service import MedicalNewsService
+from .patient_import_service import PatientImportService
 
 __all__ = [
     "LicenseService",
@@ -19,5 +20,6 @@ __all__ = [
     "ENabizService",
     "SMSService",
     "WhatsAppService",
-    "MedicalNewsService"
+    "MedicalNewsService",
+    "PatientImportService"
 ]
\ No newline at end of file
@@ -7,6 +7,8 @@ import anthropic
 
 from config import settings
 from utils.logger import get_logger
+from utils.cache import LRUCache, cached
+from utils.disk_cache import get_disk_cache
 from utils.exceptions import IntegrationException
 
 logger = get_logger(__name__)
@@ -15,10 +17,24 @@ logger = get_logger(__name__)
 class AIService:
     """Multi-provider AI service (Google Gemini, OpenAI, Anthropic)"""
     
-    def __init__(self):
-        """Initialize AI service with configured providers"""
+    def __init__(self, cache_seconds: Optional[int] = None):
+        """Initialize AI service with configured providers
+        
+        Args:
+            cache_seconds: Reuse answers to identical requests this long,
+                also across restarts (default AI_CACHE_SECONDS, 0 = off)
+        """
         self.providers = {}
         
+        if cache_seconds is None:
+            cache_seconds = settings.AI_CACHE_SECONDS
+        self.response_cache = LRUCache(
+            max_size=200, ttl_seconds=cache_seconds,
+            disk=get_disk_cache("ai") if cache_seconds else None
+        )
+        if not cache_seconds:
+            self.response_cache.enabled = False
+        
         # Initialize Google Gemini
         if settings.GEMINI_API_KEY:
             try:
@@ -51,6 +67,7 @@ class AIService:
         if not self.providers:
             logger.warning("No AI providers configured")
     
+    @cached(key_prefix="ai_chat:", cache_attr="response_cache")
     def chat(
         self, prompt: str, system_instruction: Optional[str] = None,
         history: Optional[List[Dict]] = None,
@@ -160,10 +160,11 @@ class BackupService:
                     # Backup current database first
                     current_backup = target_db.with_suffix('.db.backup')
                     if target_db.exists():
-                        shutil.copy2(target_db, current_backup)
+                        self._sqlite_copy(target_db, current_backup)
                     
-                    # Replace with restored database
-                    shutil.copy2(restored_db, target_db)
+                    # Replace with restored database (backup API keeps the
+                    # WAL of the live database consistent, a file copy would not)
+                    self._sqlite_copy(restored_db, target_db)
                     
                     logger.info("Database restored successfully")
                 
@@ -192,6 +193,18 @@ class BackupService:
             logger.error(f"Restore failed: {e}")
             return False, f"Geri yükleme hatası: {str(e)}"
     
+    @staticmethod
+    def _sqlite_copy(source: Path, target: Path):
+        """Copy a SQLite database page by page with the backup API"""
+        src_conn = sqlite3.connect(str(source))
+        dst_conn = sqlite3.connect(str(target))
+        try:
+            with dst_conn:
+                src_conn.backup(dst_conn)
+        finally:
+            dst_conn.close()
+            src_conn.close()
+    
     def _cleanup_old_backups(self):
         """Remove backups older than retention period"""
         try:
@@ -11,6 +11,8 @@ import feedparser
 
 from config import settings
 from utils.logger import get_logger
+from utils.cache import LRUCache, cached
+from utils.disk_cache import get_disk_cache
 from database.db_manager import DatabaseManager
 
 logger = get_logger(__name__)
@@ -23,11 +25,13 @@ socket.setdefaulttimeout(15.0)
 class MedicalNewsService:
     """Medical news RSS feed aggregation service"""
     
-    def __init__(self, db: DatabaseManager):
+    def __init__(self, db: DatabaseManager, feed_cache_seconds: Optional[int] = None):
         """Initialize news service
         
         Args:
             db: Database manager instance
+            feed_cache_seconds: Reuse a fetched feed this long, also across
+                restarts (default NEWS_FEED_CACHE_SECONDS, 0 = always fetch)
         """
         self.db = db
         self.is_running = False
@@ -42,6 +46,15 @@ class MedicalNewsService:
             self.db.get_setting("news_retention_days") or 7
         )
         
+        # Raw feed bodies; the disk tier lets a warm start skip the network
+        if feed_cache_seconds is None:
+            feed_cache_seconds = settings.NEWS_FEED_CACHE_SECONDS
+        self.feed_cache = LRUCache(
+            max_size=100, ttl_seconds=feed_cache_seconds, disk=get_disk_cache("news")
+        )
+        if not feed_cache_seconds:
+            self.feed_cache.enabled = False
+        
         logger.info("Medical news service initialized")
     
     def start(self):
@@ -176,6 +189,7 @@ class MedicalNewsService:
             logger.error(f"News fetch failed: {e}")
             return 0
     
+    @cached(key_prefix="news_feed:", cache_attr="feed_cache")
     def _fetch_feed_content(self, url: str) -> Optional[bytes]:
         """Fetch RSS feed content with proper headers
         
@@ -0,0 +1,399 @@
+# services/patient_import_service.py
+
+import csv
+import os
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from config import settings
+from utils.logger import get_logger
+from utils.validators import Validators
+from utils.exceptions import FileProcessingException
+from database.blind_index import fold_text, normalize_phone, normalize_tc
+from database.db_manager import DatabaseManager
+
+logger = get_logger(__name__)
+
+# Header (folded) -> create_patient argument
+COLUMN_ALIASES = {
+    "tc": "tc_no",
+    "tc no": "tc_no",
+    "tc_no": "tc_no",
+    "tc kimlik": "tc_no",
+    "tc kimlik no": "tc_no",
+    "kimlik no": "tc_no",
+    "ad soyad": "full_name",
+    "adi soyadi": "full_name",
+    "hasta adi": "full_name",
+    "full_name": "full_name",
+    "name": "full_name",
+    "telefon": "phone",
+    "tel": "phone",
+    "cep telefonu": "phone",
+    "phone": "phone",
+    "e-posta": "email",
+    "eposta": "email",
+    "email": "email",
+    "e-mail": "email",
+    "dogum tarihi": "birth_date",
+    "birth_date": "birth_date",
+    "cinsiyet": "gender",
+    "gender": "gender",
+    "adres": "address",
+    "address": "address",
+    "kaynak": "source",
+    "source": "source",
+}
+
+GENDERS = {"e": "Erkek", "erkek": "Erkek", "m": "Erkek", "k": "Kadın", "kadin": "Kadın", "f": "Kadın"}
+DATE_FORMATS = ("%d/%m/%Y", "%d.%m.%Y", "%Y-%m-%d", "%d-%m-%Y")
+CSV_DELIMITERS = ",;\t"
+
+
+class ImportProgress(NamedTuple):
+    """Snapshot passed to the progress callback"""
+    rows_read: int
+    imported: int
+    rejected: int
+    fraction: float  # 0.0 to 1.0, estimated from the position in the file
+
+
+class ImportSummary(NamedTuple):
+    """Outcome of an import"""
+    total: int
+    imported: int
+    rejected: int
+    reject_path: Optional[Path]  # None when nothing was rejected
+    elapsed: float
+
+
+class PatientImportService:
+    """Streaming CSV / Excel patient import
+
+    Rows are read one at a time, validated, and written in chunks through
+    DatabaseManager.bulk_create_patients, so memory use depends on the chunk
+    size rather than on the file size. Rejected rows are streamed to a CSV
+    report in the application's reports directory.
+    """
+
+    def __init__(self, db: DatabaseManager, chunk_size: Optional[int] = None):
+        """Initialize import service
+
+        Args:
+            db: Database manager instance
+            chunk_size: Rows per write (default BULK_CHUNK_SIZE)
+        """
+        self.db = db
+        self.chunk_size = max(1, chunk_size or settings.BULK_CHUNK_SIZE)
+
+    # ==================== READING ====================
+
+    def iter_rows(
+        self, path: Union[str, Path], position: Optional[Callable[[float], None]] = None
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (line number, raw row) pairs from a .csv or .xlsx file
+
+        Args:
+            path: Source file
+            position: Optional callback receiving the read position (0.0 to 1.0)
+
+        Raises:
+            FileProcessingException: If the file is missing or not supported
+        """
+        path = Path(path)
+        if not path.is_file():
+            raise FileProcessingException(f"Dosya bulunamadı: {path}")
+
+        suffix = path.suffix.lower()
+        if suffix in (".csv", ".txt"):
+            return self._iter_csv(path, position)
+        if suffix in (".xlsx", ".xlsm"):
+            return self._iter_xlsx(path, position)
+        raise FileProcessingException(f"Desteklenmeyen dosya türü: {suffix or path.name}")
+
+    def _iter_csv(self, path: Path, position) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        encoding = self._detect_encoding(path)
+        size = os.path.getsize(path) or 1
+
+        with open(path, "r", encoding=encoding, newline="") as handle:
+            # Excel writes ";" under Turkish locales; the header tells which one is used
+            first_line = handle.readline()
+            handle.seek(0)
+            delimiter = max(CSV_DELIMITERS, key=first_line.count)
+
+            reader = csv.reader(handle, delimiter=delimiter)
+            header = next(reader, None)
+            if not header:
+                return
+
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                if position:
+                    # The buffered text position is close enough for a progress bar
+                    position(min(handle.buffer.tell() / size, 1.0))
+                yield reader.line_num, dict(zip(header, row))
+
+    def _iter_xlsx(self, path: Path, position) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise FileProcessingException("Excel içe aktarma için openpyxl gerekli") from e
+
+        # read_only keeps a single row in memory at a time
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            total = max((sheet.max_row or 1) - 1, 1)
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                return
+            header = ["" if cell is None else str(cell) for cell in header]
+
+            for line_no, row in enumerate(rows, start=2):
+                if all(cell is None or str(cell).strip() == "" for cell in row):
+                    continue
+                if position:
+                    position(min((line_no - 1) / total, 1.0))
+                yield line_no, dict(zip(header, row))
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _detect_encoding(path: Path) -> str:
+        """utf-8 (with or without BOM), falling back to the Turkish Windows code page"""
+        with open(path, "rb") as handle:
+            try:
+                handle.read(64 * 1024).decode("utf-8-sig")
+            except UnicodeDecodeError as e:
+                # A multi-byte character may be cut at the end of the sample
+                if e.start < 64 * 1024 - 4:
+                    return "cp1254"
+        return "utf-8-sig"
+
+    # ==================== VALIDATION ====================
+
+    def map_columns(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Rename source headers to patient fields, dropping unknown columns"""
+        mapped = {}
+        for header, value in row.items():
+            field = COLUMN_ALIASES.get(fold_text(str(header or "")).strip())
+            if field and field not in mapped:
+                mapped[field] = value
+        return mapped
+
+    def validate_row(self, row: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Validate and normalize one mapped row
+
+        Returns:
+            Tuple of (patient fields, None) or (None, error_message)
+        """
+        fields = {key: self._cell_text(value) for key, value in row.items()}
+
+        tc_no = fields.get("tc_no")
+        full_name = fields.get("full_name")
+        if not tc_no or not full_name:
+            return None, "TC kimlik numarası ve ad soyad zorunlu"
+
+        valid, error = Validators.validate_tc_no(tc_no)
+        if not valid:
+            return None, error
+
+        phone = fields.get("phone")
+        if phone:
+            # Spreadsheets usually carry the trunk prefix (0532...)
+            phone = normalize_phone(phone)
+            valid, error = Validators.validate_phone(phone)
+            if not valid:
+                return None, error
+
+        email = fields.get("email")
+        if email:
+            valid, error = Validators.validate_email(email)
+            if not valid:
+                return None, error
+
+        birth_date = self._parse_date(row.get("birth_date"))
+        if birth_date is False:
+            return None, "Geçersiz doğum tarihi"
+
+        gender = fields.get("gender")
+        if gender:
+            gender = GENDERS.get(fold_text(gender))
+            if gender is None:
+                return None, "Geçersiz cinsiyet (Erkek/Kadın)"
+
+        return {
+            "tc_no": normalize_tc(tc_no),
+            "full_name": " ".join(full_name.split()),
+            "phone": phone,
+            "email": email.strip() if email else None,
+            "birth_date": birth_date,
+            "gender": gender,
+            "address": fields.get("address"),
+            "source": fields.get("source") or "Diğer",
+        }, None
+
+    @staticmethod
+    def _cell_text(value: Any) -> Optional[str]:
+        """Cell as stripped text; Excel stores numeric TCs and phones as numbers"""
+        if value is None:
+            return None
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        text = str(value).strip()
+        return text or None
+
+    @staticmethod
+    def _parse_date(value: Any) -> Union[str, None, bool]:
+        """Birth date as YYYY-MM-DD, None when empty, False when unreadable"""
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return None
+        if isinstance(value, (datetime, date)):
+            return value.strftime("%Y-%m-%d")
+
+        text = str(value).strip()
+        for date_format in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, date_format)
+            except ValueError:
+                continue
+            if parsed.date() > date.today():
+                return False
+            return parsed.strftime("%Y-%m-%d")
+        return False
+
+    # ==================== IMPORT ====================
+
+    def import_file(
+        self, path: Union[str, Path],
+        progress: Optional[Callable[[ImportProgress], None]] = None,
+        reject_path: Optional[Union[str, Path]] = None
+    ) -> ImportSummary:
+        """Import patients from a .csv or .xlsx file
+
+        TCs repeated in the file are imported once; later copies are rejected
+        (by the unique TC index once an earlier chunk is committed).
+
+        Args:
+            path: Source file
+            progress: Optional callback, called once per chunk
+            reject_path: Reject report (default reports/<source>_hatalar_<timestamp>.csv)
+
+        Returns:
+            ImportSummary
+
+        Raises:
+            FileProcessingException: If the file cannot be read
+        """
+        path = Path(path)
+        reject_path = Path(reject_path) if reject_path else self._default_reject_path(path)
+        started = time.perf_counter()
+
+        counts = {"total": 0, "imported": 0, "rejected": 0}
+        read_position = [0.0]
+        chunk: List[Tuple[int, Dict[str, Any], Dict[str, Any]]] = []
+        report = _RejectReport(reject_path)
+
+        def set_position(fraction: float):
+            read_position[0] = fraction
+
+        def flush():
+            result = self.db.bulk_create_patients(
+                [patient for _, _, patient in chunk], chunk_size=len(chunk)
+            )
+            counts["imported"] += result.inserted
+            for position, reason in sorted(result.failures.items()):
+                line_no, raw, _ = chunk[position]
+                report.write(line_no, reason, raw)
+                counts["rejected"] += 1
+            chunk.clear()
+            if progress:
+                progress(ImportProgress(
+                    counts["total"], counts["imported"], counts["rejected"], read_position[0]
+                ))
+
+        try:
+            for line_no, raw in self.iter_rows(path, set_position):
+                counts["total"] += 1
+                patient, error = self.validate_row(self.map_columns(raw))
+                if error:
+                    report.write(line_no, error, raw)
+                    counts["rejected"] += 1
+                    continue
+
+                chunk.append((line_no, raw, patient))
+                if len(chunk) >= self.chunk_size:
+                    flush()
+
+            read_position[0] = 1.0
+            if chunk:
+                flush()
+            elif progress:
+                progress(ImportProgress(
+                    counts["total"], counts["imported"], counts["rejected"], 1.0
+                ))
+        except (OSError, UnicodeError, csv.Error) as e:
+            logger.error(f"Patient import failed at row {counts['total']}: {e}")
+            raise FileProcessingException(f"Dosya okunamadı: {e}") from e
+        finally:
+            report.close()
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Patient import {path.name}: {counts['imported']} imported, "
+            f"{counts['rejected']} rejected of {counts['total']} in {elapsed:.1f}s"
+            + (f", report: {reject_path}" if report.written else "")
+        )
+        return ImportSummary(
+            counts["total"], counts["imported"], counts["rejected"],
+            reject_path if report.written else None, elapsed
+        )
+
+    @staticmethod
+    def _default_reject_path(path: Path) -> Path:
+        """Timestamped report under the reports directory, never an existing file
+
+        The report repeats the rejected rows (TCs, phones), so it is kept with
+        the application's own files rather than next to the source file.
+        """
+        reports_dir = settings.BASE_DIR / "reports"
+        stem = f"{path.stem}_hatalar_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        candidate = reports_dir / f"{stem}.csv"
+        counter = 1
+        while candidate.exists():
+            counter += 1
+            candidate = reports_dir / f"{stem}_{counter}.csv"
+        return candidate
+
+
+class _RejectReport:
+    """CSV reject report, created on the first rejected row"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.written = 0
+        self._handle = None
+        self._writer = None
+        self._columns: List[str] = []
+
+    def write(self, line_no: int, reason: str, raw: Dict[str, Any]):
+        if self._writer is None:
+            self._columns = [str(column) for column in raw]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # utf-8-sig so Excel shows Turkish characters correctly
+            self._handle = open(self.path, "w", encoding="utf-8-sig", newline="")
+            self._writer = csv.writer(self._handle)
+            self._writer.writerow(["Satır", "Hata", *self._columns])
+
+        values = ["" if value is None else value for value in raw.values()]
+        self._writer.writerow([line_no, reason, *values])
+        self.written += 1
+
+    def close(self):
+        if self._handle:
+            self._handle.close()
+            self._handle = None
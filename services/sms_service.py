@@ -6,6 +6,8 @@ from twilio.base.exceptions import TwilioRestException
 
 from config import settings
 from utils.logger import get_logger
+from utils.rate_limiter import rate_limiter
+from utils.exceptions import RateLimitException
 
 logger = get_logger(__name__)
 
@@ -62,6 +64,13 @@ class SMSService:
             if not clean_number:
                 return False, "Geçersiz telefon numarası"
             
+            # Per-recipient send limit
+            try:
+                rate_limiter.check_rate_limit(clean_number, limit="sms")
+            except RateLimitException:
+                logger.warning(f"SMS rate limit reached for {clean_number}")
+                return False, "Bu numara için SMS gönderim sınırı aşıldı"
+            
             # Send SMS via Twilio
             message_obj = self.client.messages.create(
                 body=message,
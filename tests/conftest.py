@@ -42,9 +42,10 @@ def test_db_path():
     with tempfile.NamedTemporaryFile(mode='w', suffix='.db', delete=False) as f:
         db_path = f.name
     yield db_path
-    # Cleanup
-    if os.path.exists(db_path):
-        os.unlink(db_path)
+    # Cleanup (including WAL side files)
+    for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+        if os.path.exists(path):
+            os.unlink(path)
 
 
 @pytest.fixture(scope="session")
@@ -4,6 +4,7 @@ Integration tests for database/db_manager.py
 Tests cover:
 - Database initialization and setup
 - User authentication and management
+- In-memory user directory
 - Patient CRUD operations with encryption
 - Appointment management
 - Transaction management
@@ -68,6 +69,112 @@ class TestDatabaseInitialization:
             assert any("Google" in source.name for source in sources)
 
 
+@pytest.mark.database
+class TestSQLitePragmas:
+    """Test the per-connection SQLite performance profile"""
+
+    def test_pragmas_applied(self, db_manager):
+        """Test that new connections use WAL and the configured pragmas"""
+        from sqlalchemy import text
+
+        with db_manager.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -65536
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 30000
+
+    def test_in_memory_skips_journal_mode(self):
+        """Test that in-memory databases skip file-only pragmas"""
+        from database.db_manager import sqlite_pragmas
+
+        pragmas = sqlite_pragmas(in_memory=True)
+
+        assert not any("journal_mode" in p or "mmap_size" in p for p in pragmas)
+        assert any("synchronous" in p for p in pragmas)
+
+    def test_invalid_keyword_rejected(self, monkeypatch):
+        """Test that unknown keyword values are rejected"""
+        from config import settings
+        from database.db_manager import sqlite_pragmas
+        from utils.exceptions import ConfigurationException
+
+        monkeypatch.setattr(settings, "SQLITE_SYNCHRONOUS", "NORMAL; DROP TABLE users")
+
+        with pytest.raises(ConfigurationException):
+            sqlite_pragmas()
+
+
+@pytest.mark.database
+class TestQueryMetrics:
+    """Test per-method query instrumentation"""
+
+    def test_statements_grouped_by_public_method(self, db_manager):
+        """Test that statements are attributed to the calling public method"""
+        db_manager.enable_db_metrics()
+        try:
+            db_manager.get_db_metrics(reset=True)
+            db_manager.get_dashboard_stats()
+            db_manager.get_patient_count()
+
+            metrics = db_manager.get_db_metrics()
+        finally:
+            db_manager.disable_db_metrics()
+
+        assert metrics['methods']['get_patient_count']['statements'] == 1
+        dashboard = metrics['methods']['get_dashboard_stats']
+        assert dashboard['statements'] >= 1
+        assert dashboard['total_ms'] >= dashboard['max_ms'] > 0
+        assert dashboard['slowest'][0]['statement'].startswith("SELECT")
+        assert metrics['statements'] == sum(
+            m['statements'] for m in metrics['methods'].values()
+        )
+
+    def test_disabled_collects_nothing(self, db_manager):
+        """Test that nothing is recorded while metrics are detached"""
+        db_manager.disable_db_metrics()
+        db_manager.get_db_metrics(reset=True)
+
+        db_manager.get_active_patients()
+
+        metrics = db_manager.get_db_metrics()
+        assert metrics['enabled'] is False
+        assert metrics['statements'] == 0
+
+    def test_slow_query_logged(self, db_manager, mocker):
+        """Test that statements over the threshold are logged"""
+        from config import settings
+        from database import query_metrics
+
+        warning = mocker.patch.object(query_metrics.logger, "warning")
+        db_manager.enable_db_metrics(slow_query_ms=0.000001)
+        try:
+            db_manager.get_patient_count()
+        finally:
+            db_manager.disable_db_metrics()
+            db_manager.metrics.slow_query_ms = settings.DB_SLOW_QUERY_MS
+
+        assert warning.called
+        assert "get_patient_count" in warning.call_args[0][0]
+
+    def test_failed_statement_leaves_no_start_time(self, db_manager):
+        """Test that statements that raise do not leak timers on the connection"""
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+
+        db_manager.enable_db_metrics()
+        try:
+            with db_manager.engine.connect() as conn:
+                for _ in range(3):
+                    with pytest.raises(OperationalError):
+                        conn.execute(text("SELECT * FROM no_such_table"))
+                conn.execute(text("SELECT 1"))
+
+                assert conn.connection.info.get('query_start_time') == []
+        finally:
+            db_manager.disable_db_metrics()
+
+
 # ==================== USER AUTHENTICATION ====================
 
 @pytest.mark.database
@@ -118,6 +225,33 @@ class TestUserAuthentication:
 
             assert len(recent_logs) > 0
 
+    def test_authenticate_rehashes_outdated_cost(self, db_manager, mocker):
+        """Test that a hash with a different bcrypt cost is upgraded on login"""
+        import bcrypt
+        from database.db_manager import security_manager
+
+        mocker.patch.object(security_manager, "rounds", 5)
+        with db_manager.get_session() as session:
+            session.add(User(
+                username="rehash_user", full_name="Rehash User", role=UserRole.DOCTOR,
+                password=bcrypt.hashpw(b"Secret123", bcrypt.gensalt(rounds=4)).decode()
+            ))
+
+        assert db_manager.authenticate_user("rehash_user", "Secret123") is not None
+
+        with db_manager.get_session() as session:
+            stored = session.query(User).filter_by(username="rehash_user").one().password
+        assert security_manager.hash_rounds(stored) == 5
+        assert db_manager.authenticate_user("rehash_user", "Secret123") is not None
+
+    def test_authenticate_user_async(self, db_manager):
+        """Test authentication on the worker pool"""
+        future = db_manager.authenticate_user_async("admin", "admin")
+
+        user = future.result(timeout=30)
+        assert user is not None
+        assert user.username == "admin"
+
 
 # ==================== USER MANAGEMENT ====================
 
@@ -177,6 +311,84 @@ class TestUserManagement:
             assert user.username == "admin"
 
 
+# ==================== USER DIRECTORY ====================
+
+@pytest.mark.database
+class TestUserDirectory:
+    """Test the in-memory user directory"""
+
+    def test_lookup_by_id_and_username(self, db_manager):
+        """Test directory entries for the default admin"""
+        info = db_manager.get_user_info_by_username("admin")
+
+        assert info is not None
+        assert info.role == UserRole.ADMIN
+        assert db_manager.get_user_info(info.id) == info
+        assert db_manager.get_user_name(info.id) == info.full_name
+        assert db_manager.get_user_info(999999) is None
+
+    def test_lookups_served_from_memory(self, db_manager):
+        """Test that repeated and bulk lookups issue no statements"""
+        admin_id = db_manager.get_user_info_by_username("admin").id
+        db_manager.enable_db_metrics()
+        try:
+            for _ in range(10):
+                db_manager.get_user_info(admin_id)
+            users = db_manager.get_users_by_ids([admin_id, admin_id, 999999])
+            metrics = db_manager.get_db_metrics()
+        finally:
+            db_manager.disable_db_metrics()
+
+        assert list(users) == [admin_id]
+        assert metrics['statements'] == 0
+
+    def test_create_user_invalidates(self, db_manager):
+        """Test that a new user is visible right after create_user"""
+        db_manager.get_user_info_by_username("admin")
+        success, _ = db_manager.create_user(
+            username="dir_doctor", password="Secret123",
+            full_name="Dizin Doktor", role="doctor", specialty="KBB"
+        )
+
+        assert success is True
+        info = db_manager.get_user_info_by_username("dir_doctor")
+        assert info.full_name == "Dizin Doktor"
+        assert info.specialty == "KBB"
+        assert info.role == UserRole.DOCTOR
+
+    def test_password_update_invalidates(self, db_manager):
+        """Test that a password update reloads the directory"""
+        db_manager.create_user(
+            username="dir_secretary", password="Secret123",
+            full_name="Dizin Sekreter", role="secretary"
+        )
+        info = db_manager.get_user_info_by_username("dir_secretary")
+        loaded = db_manager._user_directory
+
+        success, _ = db_manager.update_user_password(info.id, "Changed123")
+
+        assert success is True
+        db_manager.get_user_info(info.id)
+        assert db_manager._user_directory is not loaded
+
+    def test_login_does_not_wait_for_directory(self, db_manager):
+        """Test that a user added by another process can log in at once"""
+        from database.db_manager import security_manager
+        db_manager.get_user_info_by_username("admin")  # load the directory
+
+        # A plain connection, like another process, invalidates no cache
+        with db_manager.engine.begin() as connection:
+            connection.execute(User.__table__.insert().values(
+                username="dir_outside", password=security_manager.hash_password("Secret123"),
+                full_name="Dışarıdan Kullanıcı", role=UserRole.SECRETARY, is_active=True
+            ))
+
+        assert db_manager.get_user_info_by_username("dir_outside") is None  # still stale
+        user = db_manager.authenticate_user("dir_outside", "Secret123")
+        assert user is not None and user.username == "dir_outside"
+        assert db_manager.authenticate_user("no_such_user", "password") is None
+
+
 # ==================== PATIENT MANAGEMENT ====================
 
 @pytest.mark.database
@@ -278,6 +490,356 @@ class TestPatientManagement:
         assert len(patients) >= 2
 
 
+@pytest.mark.database
+class TestPatientSearchIndex:
+    """Test blind-index patient search"""
+
+    def test_search_by_name_prefix(self, db_manager):
+        """Test that name prefixes match regardless of case and diacritics"""
+        db_manager.create_patient(
+            "31000000001", "Gülşen Öztürkoğlu", "5551110001",
+            "1990-01-01", "Kadın", "Ankara"
+        )
+
+        for query in ("gülşen", "GULSEN", "oztur", "gül öz"):
+            results = db_manager.search_patients(query)
+            assert [p['full_name'] for p in results] == ["Gülşen Öztürkoğlu"]
+
+        assert db_manager.search_patients("öztürkoğluxyz") == []
+
+    def test_search_by_exact_tc_and_phone(self, db_manager):
+        """Test exact TC and normalized phone lookups"""
+        _, _, patient_id = db_manager.create_patient(
+            "31000000002", "Tarık Aksoylu", "0555 111 00 02",
+            "1990-01-01", "Erkek", "İzmir"
+        )
+
+        assert [p['id'] for p in db_manager.search_patients("31000000002")] == [patient_id]
+        assert [p['id'] for p in db_manager.search_patients("+90 555 111 00 02")] == [patient_id]
+        assert db_manager.search_patients("3100000000") == []
+
+    def test_search_excludes_archived(self, db_manager):
+        """Test that archived patients are not returned"""
+        _, _, patient_id = db_manager.create_patient(
+            "31000000003", "Nevzat Kulaksızoğlu", "5551110003",
+            "1990-01-01", "Erkek", ""
+        )
+        db_manager.archive_patient(patient_id)
+
+        assert db_manager.search_patients("kulaksiz") == []
+
+    def test_update_patient_refreshes_index(self, db_manager):
+        """Test that update_patient keeps blind indexes in sync"""
+        _, _, patient_id = db_manager.create_patient(
+            "31000000004", "Sevim Karabulutlu", "5551110004",
+            "1990-01-01", "Kadın", ""
+        )
+
+        success, _ = db_manager.update_patient(
+            patient_id, full_name="Sevim Demirbileklioğlu", phone="5551119999"
+        )
+
+        assert success is True
+        assert db_manager.search_patients("karabulutlu") == []
+        assert [p['id'] for p in db_manager.search_patients("demirbilek")] == [patient_id]
+        assert [p['phone'] for p in db_manager.search_patients("5551119999")] == ["5551119999"]
+
+    def test_update_patient_rejects_unknown_fields(self, db_manager):
+        """Test that update_patient rejects unknown fields"""
+        success, _ = db_manager.update_patient(1, status="Arşiv")
+        assert success is False
+
+    def test_rebuild_backfills_missing_index(self, db_manager):
+        """Test that rows without blind indexes are backfilled"""
+        from database.models import PatientSearchToken
+
+        _, _, patient_id = db_manager.create_patient(
+            "31000000005", "Rüstem Yeşilırmak", "5551110005",
+            "1990-01-01", "Erkek", ""
+        )
+        with db_manager.get_session() as session:
+            session.query(PatientSearchToken).filter_by(patient_id=patient_id).delete()
+            session.query(Patient).filter_by(id=patient_id).update({'tc_hash': None})
+
+        assert db_manager.search_patients("yesilirmak") == []
+        assert db_manager.rebuild_patient_search_index(only_missing=True) >= 1
+        assert [p['id'] for p in db_manager.search_patients("yesilirmak")] == [patient_id]
+
+
+@pytest.mark.database
+class TestPatientTCUniqueness:
+    """Test TC uniqueness through the deterministic TC blind index"""
+
+    def test_duplicate_tc_rejected(self, db_manager):
+        """Test that the same TC cannot be registered twice"""
+        success, _, _ = db_manager.create_patient(
+            "32000000001", "Kadir Erdem", "5552220001", "1990-01-01", "Erkek", ""
+        )
+        assert success is True
+
+        success, message, patient_id = db_manager.create_patient(
+            "320 000 000 01", "Başka Kişi", "5552220002", "1990-01-01", "Erkek", ""
+        )
+        assert success is False
+        assert patient_id is None
+        assert "zaten kayıtlı" in message
+
+    def test_tc_hash_unique_constraint(self, db_manager):
+        """Test that the database enforces the unique TC hash"""
+        db_manager.create_patient(
+            "32000000003", "Leyla Erdem", "5552220003", "1990-01-01", "Kadın", ""
+        )
+
+        with pytest.raises(DatabaseException):
+            with db_manager.get_session() as session:
+                existing = session.query(Patient).filter(
+                    Patient.tc_hash.isnot(None)
+                ).first()
+                session.add(Patient(
+                    tc_no="ciphertext", full_name="ciphertext",
+                    tc_hash=existing.tc_hash
+                ))
+
+    def test_get_patient_by_tc(self, db_manager):
+        """Test TC lookup through the blind index"""
+        _, _, patient_id = db_manager.create_patient(
+            "32000000004", "Cemile Erdem", "5552220004", "1990-01-01", "Kadın", ""
+        )
+
+        patient = db_manager.get_patient_by_tc("32000000004")
+
+        assert patient is not None
+        assert patient['id'] == patient_id
+        assert patient['full_name'] == "Cemile Erdem"
+        assert db_manager.get_patient_by_tc("32000000099") is None
+
+    def test_update_to_existing_tc_rejected(self, db_manager):
+        """Test that updating to another patient's TC is rejected"""
+        db_manager.create_patient(
+            "32000000005", "Hasan Erdem", "5552220005", "1990-01-01", "Erkek", ""
+        )
+        _, _, patient_id = db_manager.create_patient(
+            "32000000006", "Hüseyin Erdem", "5552220006", "1990-01-01", "Erkek", ""
+        )
+
+        success, _ = db_manager.update_patient(patient_id, tc_no="32000000005")
+
+        assert success is False
+        assert db_manager.get_patient_by_tc("32000000006")['id'] == patient_id
+
+    def test_backfill_releases_duplicates(self, db_manager, mocker):
+        """Test that backfill keeps the oldest owner and marks the duplicate once"""
+        from database import blind_index, db_manager as db_module
+
+        _, _, first_id = db_manager.create_patient(
+            "32000000007", "Yusuf Erdem", "5552220007", "1990-01-01", "Erkek", ""
+        )
+        with db_manager.get_session() as session:
+            first = session.query(Patient).filter_by(id=first_id).first()
+            duplicate = Patient(tc_no=first.tc_no, full_name=first.full_name)
+            session.add(duplicate)
+            session.flush()
+            duplicate_id = duplicate.id
+
+        result = db_manager.backfill_patient_hashes()
+
+        assert result['indexed'] >= 1
+        assert db_manager.get_patient_by_tc("32000000007")['id'] == first_id
+        with db_manager.get_session() as session:
+            marker = session.query(Patient.tc_hash).filter_by(id=duplicate_id).scalar()
+        assert marker == blind_index.duplicate_tc_marker(duplicate_id)
+
+        # The next startup does not decrypt or report it again
+        warning = mocker.spy(db_module.logger, "warning")
+        db_manager.backfill_patient_hashes()
+        assert not any(str(duplicate_id) in call.args[0] for call in warning.call_args_list)
+
+    def test_backfill_moves_tc_to_older_record(self, db_manager):
+        """Test that an unindexed older record takes its TC from a newer one"""
+        from database import blind_index
+
+        _, _, older_id = db_manager.create_patient(
+            "32000000008", "Zeki Erdem", "5552220008", "1990-01-01", "Erkek", ""
+        )
+        _, _, newer_id = db_manager.create_patient(
+            "32000000009", "Zehra Erdem", "5552220009", "1990-01-01", "Kadın", ""
+        )
+        with db_manager.get_session() as session:
+            older = session.query(Patient).filter_by(id=older_id).first()
+            newer = session.query(Patient).filter_by(id=newer_id).first()
+            tc_hash = older.tc_hash
+            older.tc_hash = None
+            session.flush()
+            newer.tc_no, newer.tc_hash = older.tc_no, tc_hash
+
+        db_manager.rebuild_patient_search_index(only_missing=True)
+
+        assert db_manager.get_patient_by_tc("32000000008")['id'] == older_id
+        with db_manager.get_session() as session:
+            marker = session.query(Patient.tc_hash).filter_by(id=newer_id).scalar()
+        assert marker == blind_index.duplicate_tc_marker(newer_id)
+
+    def test_backfill_marks_unreadable_rows(self, db_manager, mocker):
+        """Test that a row that cannot be decrypted is not retried every startup"""
+        from database import blind_index, db_manager as db_module
+
+        with db_manager.get_session() as session:
+            unreadable = Patient(tc_no="not-a-token", full_name="not-a-token")
+            session.add(unreadable)
+            session.flush()
+            unreadable_id = unreadable.id
+
+        db_manager.backfill_patient_hashes()
+        with db_manager.get_session() as session:
+            marker = session.query(Patient.tc_hash).filter_by(id=unreadable_id).scalar()
+        assert marker == blind_index.unreadable_tc_marker(unreadable_id)
+
+        warning = mocker.spy(db_module.logger, "warning")
+        db_manager.backfill_patient_hashes()
+        assert not any(str(unreadable_id) in call.args[0] for call in warning.call_args_list)
+
+
+    def test_backfill_marks_empty_tc_rows(self, db_manager, mocker):
+        """Test that a TC without digits is marked instead of rescanned"""
+        from database import blind_index
+        from utils.encryption_manager import encryption_manager
+
+        with db_manager.get_session() as session:
+            empty = Patient(
+                tc_no=encryption_manager.encrypt("-"),
+                full_name=encryption_manager.encrypt("Boş Kimlik")
+            )
+            session.add(empty)
+            session.flush()
+            empty_id = empty.id
+
+        db_manager.backfill_patient_hashes()
+        with db_manager.get_session() as session:
+            marker = session.query(Patient.tc_hash).filter_by(id=empty_id).scalar()
+        assert marker == blind_index.empty_tc_marker(empty_id)
+
+        # The next startup does not pick it up again
+        marked = mocker.spy(blind_index, "empty_tc_marker")
+        db_manager.backfill_patient_hashes()
+        assert not marked.called
+
+@pytest.mark.database
+class TestPatientRowProjection:
+    """Test lazily decrypted patient rows"""
+
+    def test_full_name_only_decrypts_once(self, db_manager, mocker):
+        """Test that reading full_name decrypts only that field, once"""
+        from utils.encryption_manager import encryption_manager
+
+        _, _, patient_id = db_manager.create_patient(
+            "33000000001", "Lale Tembelli", "5553330001", "1990-01-01", "Kadın", "Bursa"
+        )
+        row = next(p for p in db_manager.get_active_patients() if p.id == patient_id)
+        spy = mocker.spy(encryption_manager, "decrypt")
+
+        assert row.full_name == "Lale Tembelli"
+        assert row.full_name == "Lale Tembelli"
+        assert spy.call_count == 1
+
+    def test_row_dict_access(self, db_manager):
+        """Test that rows still support dict-style access"""
+        _, _, patient_id = db_manager.create_patient(
+            "33000000002", "Oya Tembelli", "5553330002", "1990-01-01", "Kadın", "Bursa"
+        )
+        row = next(p for p in db_manager.get_active_patients() if p['id'] == patient_id)
+
+        assert row['phone'] == "5553330002"
+        assert row.get('address') == "Bursa"
+        assert row.get('missing', 'x') == 'x'
+        assert row['status'] == PatientStatus.NEW.value
+        with pytest.raises(KeyError):
+            row['missing']
+
+        data = row.to_dict()
+        assert data['tc_no'] == "33000000002"
+        assert data['full_name'] == "Oya Tembelli"
+        assert dict(row) == data
+
+    def test_archived_patients_are_rows(self, db_manager):
+        """Test that archived listing returns lazily decrypted rows"""
+        _, _, patient_id = db_manager.create_patient(
+            "33000000003", "Ece Tembelli", "5553330003", "1990-01-01", "Kadın", ""
+        )
+        db_manager.archive_patient(patient_id)
+
+        row = next(p for p in db_manager.get_archived_patients() if p.id == patient_id)
+
+        assert row.full_name == "Ece Tembelli"
+        assert row.status == PatientStatus.ARCHIVED.value
+
+
+@pytest.mark.database
+class TestPatientListing:
+    """Test keyset-paginated patient listing"""
+
+    @staticmethod
+    def _create_patients(db_manager, source, tc_prefix, count, gender="Erkek", start=0):
+        ids = []
+        for i in range(start, start + count):
+            _, _, patient_id = db_manager.create_patient(
+                f"34{tc_prefix:03d}{i:06d}", f"Sayfa Hasta {i}",
+                f"55540{i:05d}", "1990-01-01", gender, "", source=source
+            )
+            ids.append(patient_id)
+        return ids
+
+    def test_pages_cover_all_rows_once(self, db_manager):
+        """Test that following cursors returns every row exactly once"""
+        ids = self._create_patients(db_manager, "SayfaTest", 1, 7)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = db_manager.list_patients(cursor=cursor, limit=3, source="SayfaTest")
+            seen.extend(p.id for p in page)
+            if cursor is None:
+                break
+
+        assert seen == sorted(ids, reverse=True)
+
+    def test_ascending_order(self, db_manager):
+        """Test ascending keyset pagination"""
+        ids = self._create_patients(db_manager, "SayfaAsc", 2, 4)
+
+        first, cursor = db_manager.list_patients(limit=2, source="SayfaAsc", order="asc")
+        second, last = db_manager.list_patients(
+            cursor=cursor, limit=2, source="SayfaAsc", order="asc"
+        )
+
+        assert [p.id for p in first + second] == ids
+        assert last is None
+
+    def test_filters_in_sql(self, db_manager):
+        """Test gender and status filters"""
+        men = self._create_patients(db_manager, "SayfaFiltre", 3, 2, gender="Erkek")
+        women = self._create_patients(db_manager, "SayfaFiltre", 3, 2, gender="Kadın", start=2)
+        db_manager.archive_patient(women[0])
+
+        page, _ = db_manager.list_patients(source="SayfaFiltre", gender="Kadın")
+        assert [p.id for p in page] == [women[1]]
+
+        page, _ = db_manager.list_patients(source="SayfaFiltre", status="archived")
+        assert [p.id for p in page] == [women[0]]
+
+        page, _ = db_manager.list_patients(source="SayfaFiltre", status="all", gender="all")
+        assert sorted(p.id for p in page) == sorted(men + women)
+
+        assert db_manager.count_patients(source="SayfaFiltre") == 3
+        assert db_manager.count_patients(source="SayfaFiltre", status="Yeni") == 3
+
+    def test_invalid_cursor(self, db_manager):
+        """Test that an invalid or mismatched cursor returns an empty page"""
+        self._create_patients(db_manager, "SayfaCursor", 4, 3)
+        _, cursor = db_manager.list_patients(limit=1, source="SayfaCursor")
+
+        assert db_manager.list_patients(cursor="not-a-cursor") == ([], None)
+        assert db_manager.list_patients(cursor=cursor, order="asc") == ([], None)
+
+
 # ==================== APPOINTMENT MANAGEMENT ====================
 
 @pytest.mark.database
@@ -363,6 +925,383 @@ class TestAppointmentManagement:
             assert appointment.status == AppointmentStatus.COMPLETED
 
 
+@pytest.mark.database
+class TestDaySchedule:
+    """Test the joined day-view query"""
+
+    DAY = datetime(2031, 3, 14)
+
+    @staticmethod
+    def _admin_id(db_manager):
+        with db_manager.get_session() as session:
+            return session.query(User).filter_by(username="admin").first().id
+
+    def test_names_joined_and_decrypted(self, db_manager):
+        """Test that patient and doctor names come back in plain text"""
+        _, _, patient_id = db_manager.create_patient(
+            "37000000001", "Gün Hasta", "5550000371", "1990-01-01", "Kadın", ""
+        )
+        admin_id = self._admin_id(db_manager)
+        db_manager.create_appointment(
+            patient_id, admin_id, self.DAY.replace(hour=10), notes="Kontrol"
+        )
+
+        schedule = db_manager.get_day_schedule(self.DAY.date())
+        row = next(r for r in schedule if r['patient_id'] == patient_id)
+
+        assert row['patient_name'] == "Gün Hasta"
+        assert row['doctor_name'] == db_manager.get_user_name(admin_id)
+        assert row['notes'] == "Kontrol"
+        assert row['status'] == AppointmentStatus.WAITING.value
+
+    def test_filters_day_and_doctor(self, db_manager):
+        """Test that other days and other doctors are excluded"""
+        db_manager.create_user(
+            username="day_doctor", password="Secret123",
+            full_name="Gün Doktor", role="doctor"
+        )
+        doctor_id = db_manager.get_user_info_by_username("day_doctor").id
+        _, _, patient_id = db_manager.create_patient(
+            "37000000002", "Filtre Hasta", "5550000372", "1990-01-01", "Erkek", ""
+        )
+        db_manager.create_appointment(patient_id, doctor_id, self.DAY.replace(hour=9))
+        db_manager.create_appointment(patient_id, doctor_id, self.DAY + timedelta(days=1, hours=9))
+        db_manager.create_appointment(patient_id, self._admin_id(db_manager), self.DAY.replace(hour=11))
+
+        schedule = db_manager.get_day_schedule(self.DAY, doctor_id=doctor_id)
+
+        assert [r['doctor_name'] for r in schedule] == ["Gün Doktor"]
+        assert schedule[0]['appointment_date'] == self.DAY.replace(hour=9)
+
+    def _book_day(self, db_manager, day, hours):
+        """Appointments for the admin on their own day, so tests do not share rows"""
+        _, _, patient_id = db_manager.create_patient(
+            "37000000003", "Sıra Hasta", "5550000373", "1990-01-01", "Erkek", ""
+        )
+        patient_id = patient_id or db_manager.get_patient_by_tc("37000000003")['id']
+        admin_id = self._admin_id(db_manager)
+        for hour in hours:
+            db_manager.create_appointment(patient_id, admin_id, day.replace(hour=hour))
+
+    def test_ordered_by_time(self, db_manager):
+        """Test chronological order"""
+        day = self.DAY + timedelta(days=2)
+        self._book_day(db_manager, day, [15, 9, 12])
+
+        schedule = db_manager.get_day_schedule(day)
+
+        assert [r['appointment_date'].hour for r in schedule] == [9, 12, 15]
+
+    def test_single_statement(self, db_manager):
+        """Test that a day view costs one statement regardless of size"""
+        day = self.DAY + timedelta(days=3)
+        self._book_day(db_manager, day, [9, 10, 11])
+
+        db_manager.enable_db_metrics()
+        try:
+            db_manager.get_db_metrics(reset=True)
+            schedule = db_manager.get_day_schedule(day)
+            metrics = db_manager.get_db_metrics()
+        finally:
+            db_manager.disable_db_metrics()
+
+        assert len(schedule) == 3
+        assert metrics['methods']['get_day_schedule']['statements'] == 1
+
+
+@pytest.mark.database
+class TestAppointmentSlots:
+    """Test conflict detection and free-slot search"""
+
+    DAY = datetime(2032, 5, 3)  # Monday
+
+    @pytest.fixture
+    def doctor_id(self, db_manager):
+        if not db_manager.get_user_info_by_username("slot_doctor"):
+            db_manager.create_user(
+                username="slot_doctor", password="Secret123",
+                full_name="Slot Doktor", role="doctor"
+            )
+        return db_manager.get_user_info_by_username("slot_doctor").id
+
+    @pytest.fixture
+    def patient_id(self, db_manager):
+        _, _, patient_id = db_manager.create_patient(
+            "37000000011", "Slot Hasta", "5550000381", "1990-01-01", "Kadın", ""
+        )
+        return patient_id or db_manager.search_patients("Slot Hasta")[0]['id']
+
+    def at(self, hour, minute=0, days=0):
+        return self.DAY + timedelta(days=days, hours=hour, minutes=minute)
+
+    def test_overlap_rejected(self, db_manager, doctor_id, patient_id):
+        """Test that a second booking inside the first is refused"""
+        ok, _, first_id = db_manager.create_appointment(
+            patient_id, doctor_id, self.at(10), duration_minutes=30
+        )
+        clash, message, clash_id = db_manager.create_appointment(
+            patient_id, doctor_id, self.at(10, 15)
+        )
+
+        assert ok is True and first_id
+        assert clash is False and clash_id is None
+        assert "10:00-10:30" in message
+        assert [c['id'] for c in db_manager.find_conflicts(doctor_id, self.at(10, 20), 5)] == [first_id]
+
+    def test_non_positive_duration_rejected(self, db_manager, doctor_id, patient_id):
+        """Test that a zero or negative length is refused, not defaulted"""
+        for minutes in (0, -15):
+            ok, message, appt_id = db_manager.create_appointment(
+                patient_id, doctor_id, self.at(13, days=9), duration_minutes=minutes
+            )
+            series_ok, series_message, _ = db_manager.create_appointment_series(
+                patient_id, doctor_id, self.at(13, days=9), "FREQ=DAILY;COUNT=2",
+                duration_minutes=minutes
+            )
+
+            assert ok is False and appt_id is None
+            assert series_ok is False
+            assert message == series_message == "Geçersiz randevu süresi"
+
+    def test_back_to_back_and_override(self, db_manager, doctor_id, patient_id):
+        """Test that adjacent bookings pass and allow_overlap books anyway"""
+        first, _, _ = db_manager.create_appointment(
+            patient_id, doctor_id, self.at(10, days=1), duration_minutes=30
+        )
+        adjacent, _, _ = db_manager.create_appointment(
+            patient_id, doctor_id, self.at(10, 30, days=1), duration_minutes=20
+        )
+        forced, _, _ = db_manager.create_appointment(
+            patient_id, doctor_id, self.at(10, 5, days=1), duration_minutes=10, allow_overlap=True
+        )
+
+        assert first is True and adjacent is True
+        assert forced is True
+        assert len(db_manager.find_conflicts(doctor_id, self.at(10, days=1), 60)) == 3
+
+    def test_cancel_and_delete_free_the_slot(self, db_manager, doctor_id, patient_id):
+        """Test that the index follows status changes and deletes"""
+        start = self.at(15, days=2)
+        _, _, appt_id = db_manager.create_appointment(patient_id, doctor_id, start)
+
+        db_manager.update_appointment_status(appt_id, "CANCELLED")
+        assert db_manager.find_conflicts(doctor_id, start) == []
+
+        db_manager.update_appointment_status(appt_id, "WAITING")
+        assert [c['id'] for c in db_manager.find_conflicts(doctor_id, start)] == [appt_id]
+
+        db_manager.delete_appointment(appt_id)
+        assert db_manager.find_conflicts(doctor_id, start) == []
+
+    def test_restore_into_rebooked_slot_rejected(self, db_manager, doctor_id, patient_id):
+        """Test that a cancelled appointment cannot be restored over a new booking"""
+        start = self.at(10, days=8)
+        _, _, first_id = db_manager.create_appointment(patient_id, doctor_id, start, duration_minutes=30)
+        db_manager.update_appointment_status(first_id, "CANCELLED")
+        ok, _, second_id = db_manager.create_appointment(patient_id, doctor_id, start, duration_minutes=30)
+
+        assert ok is True
+        assert db_manager.update_appointment_status(first_id, "WAITING") is False
+        assert [c['id'] for c in db_manager.find_conflicts(doctor_id, start, 30)] == [second_id]
+
+        assert db_manager.update_appointment_status(first_id, "WAITING", allow_overlap=True) is True
+        assert len(db_manager.find_conflicts(doctor_id, start, 30)) == 2
+
+    def test_next_free_slot(self, db_manager, doctor_id, patient_id):
+        """Test "next free 20 minute slot" around existing bookings"""
+        db_manager.create_appointment(patient_id, doctor_id, self.at(9, days=3), duration_minutes=60)
+        db_manager.create_appointment(patient_id, doctor_id, self.at(10, days=3), duration_minutes=50)
+
+        slots = db_manager.find_free_slots(
+            doctor_id, self.at(0, days=3), self.at(0, days=10), 20,
+            working_hours="09:00-12:00", step_minutes=10, limit=2
+        )
+
+        # 09:00-10:00 and 10:00-10:50 are taken
+        assert slots == [(self.at(10, 50, days=3), self.at(11, 10, days=3)),
+                         (self.at(11, days=3), self.at(11, 20, days=3))]
+
+    def test_outside_write_reloads_index(self, db_manager, doctor_id, patient_id):
+        """Test that a write bypassing create_appointment is still seen"""
+        db_manager.find_conflicts(doctor_id, self.at(16, days=4))  # load the index
+        with db_manager.get_session() as session:
+            session.add(Appointment(
+                patient_id=patient_id, doctor_id=doctor_id,
+                appointment_date=self.at(16, days=4), status=AppointmentStatus.WAITING
+            ))
+
+        # No duration stored: the default length applies
+        assert len(db_manager.find_conflicts(doctor_id, self.at(16, 20, days=4), 5)) == 1
+        ok, _, _ = db_manager.create_appointment(patient_id, doctor_id, self.at(16, 10, days=4))
+        assert ok is False
+
+    def test_stale_index_cannot_double_book(self, db_manager, doctor_id, patient_id):
+        """Test that a booking written by another process is still refused"""
+        start = self.at(11, days=7)
+        assert db_manager.find_conflicts(doctor_id, start) == []  # load the index
+
+        # A plain connection, like another process, invalidates no cache
+        with db_manager.engine.begin() as connection:
+            connection.execute(Appointment.__table__.insert().values(
+                patient_id=patient_id, doctor_id=doctor_id, appointment_date=start,
+                duration_minutes=30, status=AppointmentStatus.WAITING
+            ))
+        assert db_manager.find_conflicts(doctor_id, start) == []  # index is stale
+
+        ok, message, appointment_id = db_manager.create_appointment(
+            patient_id, doctor_id, start.replace(minute=15)
+        )
+
+        assert ok is False and appointment_id is None
+        assert "11:00-11:30" in message
+        assert len(db_manager.find_conflicts(doctor_id, start)) == 1
+
+
+@pytest.mark.database
+class TestAppointmentSeries:
+    """Test recurring series creation, exceptions and cancellation"""
+
+    START = datetime(2033, 1, 3, 10, 0)  # Monday
+
+    @pytest.fixture
+    def doctor_id(self, db_manager):
+        if not db_manager.get_user_info_by_username("series_doctor"):
+            db_manager.create_user(
+                username="series_doctor", password="Secret123",
+                full_name="Seri Doktor", role="doctor"
+            )
+        return db_manager.get_user_info_by_username("series_doctor").id
+
+    @pytest.fixture
+    def patient_id(self, db_manager):
+        _, _, patient_id = db_manager.create_patient(
+            "37000000021", "Seri Hasta", "5550000391", "1990-01-01", "Erkek", ""
+        )
+        return patient_id or db_manager.search_patients("Seri Hasta")[0]['id']
+
+    def test_series_single_insert(self, db_manager, doctor_id, patient_id):
+        """Test that a 20 session series is written with one INSERT statement"""
+        db_manager.enable_db_metrics()
+        try:
+            db_manager.get_db_metrics(reset=True)
+            ok, message, series_id = db_manager.create_appointment_series(
+                patient_id, doctor_id, self.START, "FREQ=WEEKLY;BYDAY=MO,TH;COUNT=20",
+                notes="Fizik tedavi", duration_minutes=45
+            )
+            metrics = db_manager.get_db_metrics()['methods']['create_appointment_series']
+        finally:
+            db_manager.disable_db_metrics()
+
+        assert ok is True, message
+        series = db_manager.get_appointment_series(series_id)
+        assert len(series['appointments']) == 20
+        assert series['notes'] == "Fizik tedavi"
+        # index load, series row, executemany, stored re-check, id lookup; the
+        # re-check takes a second query once the doctor has other bookings
+        assert metrics['statements'] in (5, 6)
+
+        day = db_manager.get_day_schedule(self.START + timedelta(days=3), doctor_id=doctor_id)
+        assert [row['notes'] for row in day] == ["Fizik tedavi"]
+
+    def test_conflicts_checked_for_whole_series(self, db_manager, doctor_id, patient_id):
+        """Test that a clash anywhere refuses the series and inserts nothing"""
+        start = datetime(2033, 6, 6, 10, 30)  # Mondays, outside the other tests' weeks
+        db_manager.create_appointment(patient_id, doctor_id, start + timedelta(days=14, minutes=15))
+
+        ok, message, series_id = db_manager.create_appointment_series(
+            patient_id, doctor_id, start, "FREQ=WEEKLY;COUNT=4"
+        )
+
+        assert ok is False and series_id is None
+        assert "20.06.2033 10:30" in message
+        assert db_manager.find_conflicts(doctor_id, start) == []
+
+    def test_skip_conflicts_records_exceptions(self, db_manager, doctor_id, patient_id):
+        """Test that clashing occurrences become exdates with skip_conflicts"""
+        start = self.START + timedelta(days=1, minutes=30)  # Tuesdays 10:30
+        db_manager.create_appointment(patient_id, doctor_id, start + timedelta(days=7))
+
+        ok, _, series_id = db_manager.create_appointment_series(
+            patient_id, doctor_id, start, "FREQ=WEEKLY;COUNT=3", skip_conflicts=True
+        )
+
+        series = db_manager.get_appointment_series(series_id)
+        assert ok is True
+        assert series['exdates'] == [start + timedelta(days=7)]
+        assert [a['appointment_date'] for a in series['appointments']] == [
+            start, start + timedelta(days=14)
+        ]
+
+    def _book_elsewhere(self, db_manager, doctor_id, patient_id, start):
+        """Write a booking the way another process would, leaving the index stale"""
+        assert db_manager.find_conflicts(doctor_id, start) == []  # load the index
+        with db_manager.engine.begin() as connection:
+            connection.execute(Appointment.__table__.insert().values(
+                patient_id=patient_id, doctor_id=doctor_id, appointment_date=start,
+                duration_minutes=30, status=AppointmentStatus.WAITING
+            ))
+        assert db_manager.find_conflicts(doctor_id, start) == []
+
+    def test_stale_index_cannot_double_book(self, db_manager, doctor_id, patient_id):
+        """Test that a booking written by another process still refuses the series"""
+        start = datetime(2033, 9, 5, 10, 0)  # Mondays
+        self._book_elsewhere(db_manager, doctor_id, patient_id, start + timedelta(days=7))
+
+        ok, message, series_id = db_manager.create_appointment_series(
+            patient_id, doctor_id, start, "FREQ=WEEKLY;COUNT=3"
+        )
+
+        assert ok is False and series_id is None
+        assert "12.09.2033 10:00" in message
+        assert db_manager.find_conflicts(doctor_id, start) == []
+        assert len(db_manager.find_conflicts(doctor_id, start + timedelta(days=7))) == 1
+
+    def test_stale_clash_skipped_as_exception(self, db_manager, doctor_id, patient_id):
+        """Test that skip_conflicts also turns stored-only clashes into exdates"""
+        start = datetime(2033, 10, 3, 10, 0)  # Mondays
+        self._book_elsewhere(db_manager, doctor_id, patient_id, start + timedelta(days=7))
+
+        ok, _, series_id = db_manager.create_appointment_series(
+            patient_id, doctor_id, start, "FREQ=WEEKLY;COUNT=3", skip_conflicts=True
+        )
+
+        series = db_manager.get_appointment_series(series_id)
+        assert ok is True
+        assert series['exdates'] == [start + timedelta(days=7)]
+        assert [a['appointment_date'] for a in series['appointments']] == [
+            start, start + timedelta(days=14)
+        ]
+        assert len(db_manager.find_conflicts(doctor_id, start + timedelta(days=7))) == 1
+
+    def test_exception_and_cancel(self, db_manager, doctor_id, patient_id):
+        """Test skipping one occurrence and cancelling the rest of the series"""
+        start = self.START + timedelta(days=2)  # Wednesdays 10:00
+        _, _, series_id = db_manager.create_appointment_series(
+            patient_id, doctor_id, start, "FREQ=WEEKLY;COUNT=5"
+        )
+
+        assert db_manager.add_series_exception(series_id, start + timedelta(days=7)) is True
+        assert db_manager.find_conflicts(doctor_id, start + timedelta(days=7)) == []
+
+        cancelled = db_manager.cancel_appointment_series(series_id, from_date=start + timedelta(days=14))
+        series = db_manager.get_appointment_series(series_id)
+
+        assert cancelled == 3
+        assert series['is_active'] is False
+        assert series['exdates'] == [start + timedelta(days=7)]
+        assert [a['status'] for a in series['appointments']] == ["Bekliyor"] + ["İptal"] * 4
+        assert db_manager.find_conflicts(doctor_id, start + timedelta(days=28)) == []
+
+    def test_invalid_rule(self, db_manager, doctor_id, patient_id):
+        """Test that unbounded or malformed rules are refused"""
+        for rule in ("FREQ=DAILY", "FREQ=NEVER"):
+            ok, message, _ = db_manager.create_appointment_series(
+                patient_id, doctor_id, self.START, rule
+            )
+            assert ok is False
+            assert "tekrar kuralı" in message
+
+
 # ==================== TRANSACTION MANAGEMENT ====================
 
 @pytest.mark.database
@@ -412,6 +1351,173 @@ class TestTransactionManagement:
         assert len(transactions) > 0
 
 
+@pytest.mark.database
+class TestDashboardStats:
+    """Test the single-query dashboard snapshot"""
+
+    @staticmethod
+    def _admin_id(db_manager):
+        with db_manager.get_session() as session:
+            return session.query(User).filter_by(username="admin").first().id
+
+    def test_single_query_then_cached(self, db_manager):
+        """Test that a cold call issues one statement and a warm call none"""
+        db_manager.enable_db_metrics()
+        try:
+            db_manager.get_db_metrics(reset=True)
+            first = db_manager.get_dashboard_stats()
+            cold = db_manager.get_db_metrics(reset=True)
+            second = db_manager.get_dashboard_stats()
+            warm = db_manager.get_db_metrics()
+        finally:
+            db_manager.disable_db_metrics()
+
+        assert cold['methods']['get_dashboard_stats']['statements'] == 1
+        assert 'get_dashboard_stats' not in warm['methods']
+        assert first == second
+
+    def test_appointment_write_invalidates(self, db_manager):
+        """Test that creating an appointment today refreshes the counts"""
+        _, _, patient_id = db_manager.create_patient(
+            "35000000001", "Pano Hasta", "5550000001", "1990-01-01", "Kadın", ""
+        )
+        before = db_manager.get_dashboard_stats()
+
+        db_manager.create_appointment(
+            patient_id, self._admin_id(db_manager),
+            datetime.now().replace(hour=23, minute=59)
+        )
+        after = db_manager.get_dashboard_stats()
+
+        assert after['today_appointments'] == before['today_appointments'] + 1
+        assert after['waiting'] == before['waiting'] + 1
+        assert after['total_patients'] == before['total_patients']
+
+    def test_transaction_write_invalidates(self, db_manager):
+        """Test that new income shows up immediately"""
+        before = db_manager.get_dashboard_stats()
+
+        db_manager.create_transaction("INCOME", "Muayene", 250.0, "Pano testi")
+        after = db_manager.get_dashboard_stats()
+
+        assert after['month_income'] == pytest.approx(before['month_income'] + 250.0)
+
+    def test_unrelated_write_keeps_snapshot(self, db_manager, mocker):
+        """Test that writes to other tables do not drop the snapshot"""
+        db_manager.get_dashboard_stats()
+        query = mocker.spy(db_manager, "_query_dashboard_stats")
+
+        db_manager.set_setting("dashboard_test", "1")
+        db_manager.get_dashboard_stats()
+
+        assert query.call_count == 0
+
+    def test_snapshot_expires(self, db_manager, monkeypatch, mocker):
+        """Test that the snapshot is recomputed after its lifetime"""
+        from config import settings
+
+        monkeypatch.setattr(settings, "DASHBOARD_CACHE_SECONDS", 0)
+        query = mocker.spy(db_manager, "_query_dashboard_stats")
+
+        db_manager.get_dashboard_stats()
+        db_manager.get_dashboard_stats()
+
+        assert query.call_count == 2
+
+
+@pytest.mark.database
+class TestQueryCache:
+    """Test write-aware caching of read-heavy methods"""
+
+    @staticmethod
+    def _statements(db_manager, method, call):
+        db_manager.enable_db_metrics()
+        try:
+            db_manager.get_db_metrics(reset=True)
+            call()
+            metrics = db_manager.get_db_metrics(reset=True)
+        finally:
+            db_manager.disable_db_metrics()
+        return metrics['methods'].get(method, {}).get('statements', 0)
+
+    def test_inventory_cached_until_products_change(self, db_manager):
+        """Test that get_inventory is served from cache until a product is written"""
+        db_manager.get_inventory()
+        assert self._statements(db_manager, "get_inventory", db_manager.get_inventory) == 0
+
+        db_manager.create_product("Önbellek Eldiven", "Kutu", 5)
+
+        assert any(p['name'] == "Önbellek Eldiven" for p in db_manager.get_inventory())
+
+    def test_patient_sources_refresh_after_create(self, db_manager):
+        """Test that new patients show up in source counts"""
+        before = dict(db_manager.get_patient_sources()).get("OnbellekTest", 0)
+
+        db_manager.create_patient(
+            "36000000001", "Kaynak Hasta", "5551000001", "1990-01-01", "Erkek", "",
+            source="OnbellekTest"
+        )
+
+        assert dict(db_manager.get_patient_sources())["OnbellekTest"] == before + 1
+
+    def test_patient_sources_per_status(self, db_manager):
+        """Test that archived patients are counted under their own status"""
+        _, _, patient_id = db_manager.create_patient(
+            "36000000003", "Arşiv Kaynak", "5551000003", "1990-01-01", "Kadın", "",
+            source="ArsivTest"
+        )
+        assert ("ArsivTest", 1) in db_manager.get_patient_sources()
+
+        db_manager.archive_patient(patient_id)
+
+        assert "ArsivTest" not in dict(db_manager.get_patient_sources())
+        assert ("ArsivTest", 1) in db_manager.get_patient_sources(status="archived")
+
+    def test_bulk_update_invalidates_news(self, db_manager):
+        """Test that bulk UPDATE statements evict cached news"""
+        db_manager.add_news_article(
+            "Önbellek haberi", "Özet", "https://example.com/cache-news", "Test"
+        )
+        assert any(not a['is_read'] for a in db_manager.get_news_articles(limit=1000))
+
+        db_manager.mark_news_read(mark_all=True)
+
+        assert all(a['is_read'] for a in db_manager.get_news_articles(limit=1000))
+
+    def test_rolled_back_write_keeps_cache(self, db_manager):
+        """Test that a failed transaction does not evict anything"""
+        db_manager.get_inventory()
+        with pytest.raises(DatabaseException):
+            with db_manager.get_session() as session:
+                session.add(Product(name="Geri Alınan", unit="Adet", quantity=1))
+                session.flush()
+                raise RuntimeError("rollback")
+
+        assert self._statements(db_manager, "get_inventory", db_manager.get_inventory) == 0
+
+    def test_callers_cannot_mutate_cached_rows(self, db_manager):
+        """Test that editing a returned list or row leaves the cache intact"""
+        db_manager.create_product("Kopya Eldiven", "Kutu", 5)
+        db_manager.add_news_article("Kopya haberi", "Özet", "https://example.com/copy-news", "Test")
+        db_manager.create_patient(
+            "36000000002", "Kopya Hasta", "5551000002", "1990-01-01", "Kadın", "",
+            source="KopyaTest"
+        )
+
+        inventory = db_manager.get_inventory()
+        next(p for p in inventory if p['name'] == "Kopya Eldiven")['quantity'] = -1
+        inventory.clear()
+        news = db_manager.get_news_articles(limit=1000)
+        news[0]['title'] = "Değişti"
+        sources = db_manager.get_patient_sources()
+        sources.clear()
+
+        product = next(p for p in db_manager.get_inventory() if p['name'] == "Kopya Eldiven")
+        assert product['quantity'] == 5
+        assert db_manager.get_news_articles(limit=1000)[0]['title'] != "Değişti"
+        assert ("KopyaTest", 1) in db_manager.get_patient_sources()
+
+
 # ==================== SESSION HANDLING ====================
 
 @pytest.mark.database
@@ -515,6 +1621,110 @@ class TestAuditLogging:
         assert len(logs) >= 5
 
 
+# ==================== BULK WRITES ====================
+
+@pytest.mark.database
+class TestBulkWrites:
+    """Test chunked bulk_* writes and per-row failure reports"""
+
+    @staticmethod
+    def _patients(start, count):
+        return [{
+            'tc_no': f"38{start + i:09d}", 'full_name': f"Toplu Hasta {start + i}",
+            'phone': f"555{start + i:07d}", 'birth_date': "1980-01-01",
+            'gender': "Kadın", 'address': "İzmir", 'source': "İçe Aktarım"
+        } for i in range(count)]
+
+    def test_bulk_patients_are_searchable(self, db_manager):
+        """Test encrypted fields, blind indexes and name tokens of bulk rows"""
+        result = db_manager.bulk_create_patients(self._patients(0, 25), chunk_size=10)
+
+        assert result.total == 25 and result.inserted == 25
+        assert result.failures == {}
+        patient = db_manager.get_patient_by_tc("38000000007")
+        assert patient is not None and patient['full_name'] == "Toplu Hasta 7"
+        assert patient['id'] == result.ids[7]
+        assert [row['id'] for row in db_manager.search_patients("Toplu Hasta 13")] == [result.ids[13]]
+
+    def test_bulk_patients_reject_duplicates(self, db_manager):
+        """Test that TCs repeated in the input or already stored are reported"""
+        rows = self._patients(100, 3) + self._patients(100, 1) + self._patients(0, 1)
+        rows.append({'tc_no': "", 'full_name': "Eksik"})
+
+        result = db_manager.bulk_create_patients(rows)
+
+        assert sorted(result.ids) == [0, 1, 2]
+        assert set(result.failures) == {3, 4, 5}
+        assert "tekrarlanıyor" in result.failures[3]
+        assert "zaten kayıtlı" in result.failures[4]
+
+    def test_bulk_patients_reject_tc_without_digits(self, db_manager):
+        """Test that TCs without digits are rejected, not taken as repeats"""
+        rows = [{'tc_no': "yok", 'full_name': "Rakamsız Bir"},
+                {'tc_no': "-", 'full_name': "Rakamsız İki"}]
+
+        result = db_manager.bulk_create_patients(rows)
+
+        assert result.ids == {}
+        assert set(result.failures) == {0, 1}
+        assert all("rakam içermiyor" in message for message in result.failures.values())
+
+    def test_failed_chunk_retried_row_by_row(self, db_manager):
+        """Test that one unbindable row does not lose the rest of its chunk"""
+        rows = self._patients(200, 5)
+        rows[2]['birth_date'] = {"not": "bindable"}
+
+        result = db_manager.bulk_create_patients(rows)
+
+        assert sorted(result.ids) == [0, 1, 3, 4]
+        assert list(result.failures) == [2]
+        assert db_manager.get_patient_by_tc("38000000202") is None
+
+    def test_bulk_transactions(self, db_manager):
+        """Test transaction rows, type conversion and invalid amounts"""
+        before = db_manager.get_financial_summary()
+        result = db_manager.bulk_create_transactions([
+            {'transaction_type': "INCOME", 'category': "Muayene", 'amount': 250, 'description': "a"},
+            {'transaction_type': "Gider", 'category': "Kira", 'amount': "100.5", 'description': "b"},
+            {'transaction_type': "INCOME", 'amount': "yok"},
+        ])
+        after = db_manager.get_financial_summary()
+
+        assert result.inserted == 2
+        assert result.failures == {2: "Geçersiz tutar"}
+        assert after['income'] == pytest.approx(before['income'] + 250)
+        assert after['expense'] == pytest.approx(before['expense'] + 100.5)
+
+    def test_bulk_audit_logs(self, db_manager):
+        """Test many audit entries in one call"""
+        result = db_manager.bulk_add_audit_logs(
+            [{'user_id': None, 'action_type': "IMPORT", 'description': f"satır {i}"} for i in range(30)]
+            + [{'description': "türsüz"}],
+            chunk_size=8
+        )
+
+        assert result.inserted == 30
+        assert list(result.failures) == [30]
+        with db_manager.get_session() as session:
+            assert session.query(AuditLog).filter_by(action_type="IMPORT").count() >= 30
+
+    def test_bulk_inventory_logs_update_stock(self, db_manager):
+        """Test that movements are logged and summed into product quantities"""
+        db_manager.create_product("Toplu Eldiven", "Kutu", 10)
+        product_id = next(p['id'] for p in db_manager.get_inventory() if p['name'] == "Toplu Eldiven")
+
+        result = db_manager.bulk_add_inventory_logs([
+            {'product_id': product_id, 'quantity': 5},
+            {'product_id': product_id, 'quantity': -3, 'user_id': 1},
+            {'product_id': 999999, 'quantity': 1},
+        ])
+
+        product = next(p for p in db_manager.get_inventory() if p['id'] == product_id)
+        assert result.inserted == 2
+        assert result.failures == {2: "Ürün bulunamadı"}
+        assert product['quantity'] == 12
+
+
 # ==================== DATA INTEGRITY ====================
 
 @pytest.mark.database
@@ -598,6 +1808,77 @@ class TestSettingsManagement:
         assert value == "new_value"
 
 
+@pytest.mark.database
+class TestSettingsSnapshot:
+    """Test the in-memory settings snapshot"""
+
+    @staticmethod
+    def _external_update(db_manager, key, value):
+        """Write like another process would (no session events)"""
+        from sqlalchemy import text
+
+        with db_manager.engine.begin() as conn:
+            conn.execute(
+                text("UPDATE settings SET value = :value, updated_at = :now WHERE key = :key"),
+                {"value": value, "now": datetime.now() + timedelta(seconds=1), "key": key}
+            )
+
+    def test_reads_do_not_query(self, db_manager, monkeypatch):
+        """Test that get_setting/is_module_active are served from memory"""
+        from config import settings
+
+        monkeypatch.setattr(settings, "SETTINGS_REFRESH_SECONDS", 60)
+        db_manager.get_setting("country")
+        db_manager.enable_db_metrics()
+        try:
+            db_manager.get_db_metrics(reset=True)
+            for _ in range(10):
+                db_manager.get_setting("country")
+                db_manager.is_module_active("module_tv")
+            metrics = db_manager.get_db_metrics()
+        finally:
+            db_manager.disable_db_metrics()
+
+        assert metrics['statements'] == 0
+
+    def test_set_swaps_snapshot(self, db_manager):
+        """Test that set_setting replaces the snapshot instead of mutating it"""
+        db_manager.set_setting("snapshot_key", "old")
+        before = db_manager.get_settings_snapshot()
+
+        db_manager.set_setting("snapshot_key", "new")
+
+        assert before["snapshot_key"] == "old"
+        assert db_manager.get_settings_snapshot()["snapshot_key"] == "new"
+        with pytest.raises(TypeError):
+            before["snapshot_key"] = "x"
+
+    def test_external_write_picked_up_by_probe(self, db_manager, monkeypatch):
+        """Test that writes from other processes are seen after the probe interval"""
+        from config import settings
+
+        db_manager.set_setting("probe_key", "before")
+        monkeypatch.setattr(settings, "SETTINGS_REFRESH_SECONDS", 60)
+        db_manager.get_setting("probe_key")
+
+        self._external_update(db_manager, "probe_key", "after")
+        assert db_manager.get_setting("probe_key") == "before"
+
+        monkeypatch.setattr(settings, "SETTINGS_REFRESH_SECONDS", 0)
+        assert db_manager.get_setting("probe_key") == "after"
+
+    def test_other_instance_write_visible(self, db_manager):
+        """Test that a second manager in the same process sees new values"""
+        other = DatabaseManager()
+        try:
+            other.get_setting("shared_key")
+            db_manager.set_setting("shared_key", "value")
+
+            assert other.get_setting("shared_key") == "value"
+        finally:
+            other.engine.dispose()
+
+
 # ==================== PERFORMANCE TESTS ====================
 
 @pytest.mark.slow
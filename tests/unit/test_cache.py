@@ -0,0 +1,615 @@
+"""
+Tests for utils/cache.py
+
+Tests cover:
+- LRU eviction and TTL expiry
+- Hit/miss/expiration/eviction statistics
+- Per-entry TTL, heap-ordered expiry and the background sweeper
+- Byte-budget mode and size estimation
+- Sharded (lock-striped) cache
+- Tag-based invalidation
+- @cached decorator (own cache, per-instance cache, None results)
+- Single-flight coalescing and stale-while-revalidate
+"""
+import logging
+import sys
+import threading
+import time
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import (
+    CacheSweeper, LRUCache, ShardedLRUCache, cached, estimate_size, invalidate_tags
+)
+
+
+# ==================== LRU CACHE ====================
+
+@pytest.mark.unit
+class TestLRUCache:
+    """Test basic cache behaviour"""
+
+    def test_set_and_get(self):
+        """Test storing and reading a value"""
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused key is evicted"""
+        cache = LRUCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    def test_expired_entry_not_returned(self, mocker):
+        """Test TTL expiry"""
+        cache = LRUCache(max_size=10, ttl_seconds=5)
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        cache.set("a", 1)
+
+        clock.return_value = 1006.0
+        assert cache.get("a") is None
+
+
+@pytest.mark.unit
+class TestCacheStats:
+    """Test cache statistics"""
+
+    def test_hits_and_misses_counted(self):
+        """Test hit/miss counters and hit ratio"""
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 1
+        assert stats['hit_ratio'] == pytest.approx(2 / 3, abs=1e-4)
+
+    def test_evictions_and_expirations_counted(self, mocker):
+        """Test that LRU evictions and TTL expiries are counted separately"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        cache = LRUCache(max_size=2, ttl_seconds=5)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        clock.return_value = 1010.0
+        cache.get("b")
+        cache.cleanup_expired()
+
+        stats = cache.get_stats()
+        assert stats['evictions'] == 1
+        assert stats['expirations'] == 2
+
+
+# ==================== EXPIRY ====================
+
+@pytest.mark.unit
+class TestExpiry:
+    """Test per-entry TTL and heap-based cleanup"""
+
+    def test_per_entry_ttl_overrides_default(self, mocker):
+        """Test set(..., ttl=...)"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        cache.set("short", 1, ttl=5)
+        cache.set("default", 2)
+
+        clock.return_value = 1010.0
+        assert cache.get("short") is None
+        assert cache.get("default") == 2
+
+    def test_cleanup_removes_only_due_entries(self, mocker):
+        """Test that cleanup stops at the first entry that is not due"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        for i in range(3):
+            cache.set(f"due{i}", i, ttl=i + 1)
+        cache.set("later", "x", ttl=100)
+
+        clock.return_value = 1010.0
+        assert cache.cleanup_expired() == 3
+        assert cache.get_stats()['size'] == 1
+        assert cache.get("later") == "x"
+
+    def test_reset_entry_uses_new_deadline(self, mocker):
+        """Test that an outdated heap pair does not evict a re-set key"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1, ttl=5)
+        cache.set("a", 2, ttl=100)
+
+        clock.return_value = 1010.0
+        assert cache.cleanup_expired() == 0
+        assert cache.get("a") == 2
+
+    def test_cleanup_in_bounded_slices(self, mocker):
+        """Test max_items limits removals per call"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        cache = LRUCache(max_size=100, ttl_seconds=1)
+        for i in range(10):
+            cache.set(f"k{i}", i)
+
+        clock.return_value = 1010.0
+        assert cache.cleanup_expired(max_items=4) == 4
+        assert cache.cleanup_expired(max_items=4) == 4
+        assert cache.cleanup_expired(max_items=4) == 2
+
+    def test_heap_stays_bounded(self):
+        """Test that repeated sets of the same keys do not grow the heap"""
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        for i in range(1000):
+            cache.set(f"k{i % 5}", i)
+
+        assert cache.get_stats()['expiry_heap'] <= 2 * 5 + 64 + 1
+
+    def test_stale_grace_kept_by_cleanup(self, mocker):
+        """Test that entries inside the stale window survive sweeps"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        cache = ShardedLRUCache(max_size=10, ttl_seconds=10, shards=2)
+        cache.stale_grace = 30
+        cache.set("a", 1)
+
+        clock.return_value = 1020.0
+        assert cache.cleanup_expired() == 0
+        clock.return_value = 1050.0
+        assert cache.cleanup_expired() == 1
+
+    def test_sweeper_evicts_in_background(self):
+        """Test the daemon sweeper"""
+        cache = LRUCache(max_size=100, ttl_seconds=60)
+        for i in range(20):
+            cache.set(f"k{i}", i, ttl=0.01)
+        cache.set("keep", 1)
+
+        sweeper = CacheSweeper(interval=0.02, slice_size=3)
+        sweeper.start()
+        try:
+            for _ in range(200):
+                if cache.get_stats()['size'] == 1:
+                    break
+                time.sleep(0.01)
+        finally:
+            sweeper.stop()
+
+        assert not sweeper.is_running
+        assert cache.get_stats()['size'] == 1
+        assert cache.get("keep") == 1
+
+
+# ==================== BYTE BUDGET ====================
+
+@pytest.mark.unit
+class TestByteBudget:
+    """Test memory-bounded eviction"""
+
+    def test_evicts_lru_until_under_budget(self):
+        """Test that bytes, not entry count, trigger eviction"""
+        cache = LRUCache(max_size=100, ttl_seconds=60, max_bytes=250, sizer=lambda v: v)
+        cache.set("a", 100)
+        cache.set("b", 100)
+        cache.get("a")
+        cache.set("c", 100)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 100
+        stats = cache.get_stats()
+        assert stats['bytes'] == 200
+        assert stats['max_bytes'] == 250
+        assert stats['evictions'] == 1
+
+    def test_bytes_follow_replace_and_delete(self):
+        """Test that the byte total tracks overwrites and deletes"""
+        cache = LRUCache(max_size=100, ttl_seconds=60, max_bytes=1000, sizer=lambda v: v)
+        cache.set("a", 100)
+        cache.set("a", 300)
+        assert cache.get_stats()['bytes'] == 300
+
+        cache.delete("a")
+        assert cache.get_stats()['bytes'] == 0
+
+    def test_value_over_budget_not_cached(self):
+        """Test that an oversized value does not flush the cache"""
+        cache = LRUCache(max_size=100, ttl_seconds=60, max_bytes=100, sizer=lambda v: v)
+        cache.set("small", 50)
+        cache.set("huge", 500)
+
+        assert cache.get("huge") is None
+        assert cache.get("small") == 50
+
+    def test_zero_budget_counts_items_only(self):
+        """Test that max_bytes=0 never calls the sizer"""
+        def sizer(value):
+            raise AssertionError("sizer called")
+
+        cache = LRUCache(max_size=10, ttl_seconds=60, max_bytes=0, sizer=sizer)
+        cache.set("a", [1] * 1000)
+
+        assert cache.get_stats()['bytes'] == 0
+
+    def test_sharded_budget_split(self):
+        """Test that shards share the budget and stats add up"""
+        cache = ShardedLRUCache(
+            max_size=100, ttl_seconds=60, shards=4, max_bytes=400, sizer=lambda v: v
+        )
+        for i in range(20):
+            cache.set(f"k{i}", 10)
+
+        stats = cache.get_stats()
+        assert stats['max_bytes'] == 400
+        assert stats['bytes'] == sum(shard['bytes'] for shard in stats['shards'])
+        assert all(shard['bytes'] <= 100 for shard in stats['shards'])
+
+    def test_estimate_size_grows_with_content(self):
+        """Test the default recursive estimate"""
+        small = [{"name": "a"}]
+        large = [{"name": "a" * 100, "index": i} for i in range(100)]
+
+        assert estimate_size(small) > estimate_size([])
+        assert estimate_size(large) > 100 * 100
+
+    def test_estimate_size_counts_shared_objects_once(self):
+        """Test that repeated references are not double counted"""
+        item = "x" * 1000
+        assert estimate_size([item, item]) < 2 * estimate_size(item)
+
+    def test_estimate_size_samples_long_lists(self, monkeypatch):
+        """Test that long results are extrapolated from a sample, not walked"""
+        from utils import cache as cache_module
+        rows = [{"id": i, "full_name": f"Hasta {i}", "phone": f"555{i:07d}"} for i in range(20000)]
+        calls = []
+        real_getsizeof = sys.getsizeof
+        monkeypatch.setattr(cache_module.sys, "getsizeof", lambda *a: calls.append(1) or real_getsizeof(*a))
+
+        sampled = estimate_size(rows)
+        assert len(calls) < 1000
+
+        monkeypatch.setattr(cache_module, "SAMPLE_THRESHOLD", len(rows))
+        exact = estimate_size(rows)
+        assert abs(sampled - exact) < exact * 0.1
+
+
+# ==================== SHARDED CACHE ====================
+
+@pytest.mark.unit
+class TestShardedLRUCache:
+    """Test the lock-striped cache"""
+
+    def test_keys_spread_over_shards(self):
+        """Test that keys land in several shards and are all retrievable"""
+        cache = ShardedLRUCache(max_size=400, ttl_seconds=60, shards=4)
+        for i in range(100):
+            cache.set(f"key{i}", i)
+
+        stats = cache.get_stats()
+        assert stats['size'] == 100
+        assert stats['shard_count'] == 4
+        assert sum(1 for shard in stats['shards'] if shard['size']) > 1
+        assert all(cache.get(f"key{i}") == i for i in range(100))
+
+    def test_logs_once_not_per_shard(self, mocker):
+        """Test that init and clear log one INFO line for the whole cache"""
+        info = mocker.spy(cache_module.logger, "info")
+        log = mocker.spy(cache_module.logger, "log")
+
+        cache = ShardedLRUCache(max_size=400, ttl_seconds=60, shards=4)
+        cache.clear()
+
+        assert [call.args[0].split(" -")[0] for call in info.call_args_list] == [
+            "Sharded cache initialized", "Cache cleared"
+        ]
+        assert all(call.args[0] == logging.DEBUG for call in log.call_args_list)
+
+    def test_aggregate_stats(self):
+        """Test that totals are the sum of the shard counters"""
+        cache = ShardedLRUCache(max_size=40, ttl_seconds=60, shards=4)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hits'] == sum(shard['hits'] for shard in stats['shards'])
+        assert stats['hit_ratio'] == 0.5
+
+    def test_tag_invalidation_across_shards(self):
+        """Test that tags are evicted from every shard"""
+        cache = ShardedLRUCache(max_size=400, ttl_seconds=60, shards=8)
+        for i in range(50):
+            cache.set(f"p{i}", i, tags=["patients"])
+        cache.set("s", 1, tags=["settings"])
+
+        assert invalidate_tags("patients") >= 50
+        assert cache.get_stats()['size'] == 1
+        assert cache.get("s") == 1
+
+    def test_stale_version_not_stored(self):
+        """Test the version check used by @cached"""
+        cache = ShardedLRUCache(max_size=40, ttl_seconds=60, shards=4)
+        version = cache.tags_version(["products"])
+
+        cache.invalidate_tags("products")
+        cache.set("inventory", [1], tags=["products"], version=version)
+
+        assert cache.get("inventory") is None
+
+    def test_concurrent_access(self):
+        """Test that parallel readers/writers keep the cache consistent"""
+        cache = ShardedLRUCache(max_size=10000, ttl_seconds=60, shards=8)
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(500):
+                    key = f"{offset}:{i}"
+                    cache.set(key, i)
+                    assert cache.get(key) == i
+            except AssertionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert cache.get_stats()['size'] == 4000
+
+
+# ==================== TAGS ====================
+
+@pytest.mark.unit
+class TestTagInvalidation:
+    """Test tag-based invalidation"""
+
+    def test_invalidate_tag_removes_tagged_entries(self):
+        """Test that only entries carrying the tag are removed"""
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        cache.set("products", [1], tags=["products"])
+        cache.set("both", [2], tags=["products", "patients"])
+        cache.set("other", [3], tags=["settings"])
+
+        removed = cache.invalidate_tags("products")
+
+        assert removed == 2
+        assert cache.get("products") is None
+        assert cache.get("both") is None
+        assert cache.get("other") == [3]
+
+    def test_evicted_entries_leave_no_tags(self):
+        """Test that LRU eviction also drops tag bookkeeping"""
+        cache = LRUCache(max_size=1, ttl_seconds=60)
+        cache.set("a", 1, tags=["t"])
+        cache.set("b", 2)
+
+        assert cache.get_stats()['tags'] == 0
+        assert cache.invalidate_tags("t") == 0
+
+    def test_stale_version_not_stored(self):
+        """Test that a value computed before an invalidation is dropped"""
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        version = cache.tags_version(["products"])
+
+        cache.invalidate_tags("products")
+        cache.set("inventory", [1], tags=["products"], version=version)
+
+        assert cache.get("inventory") is None
+
+    def test_unrelated_invalidation_keeps_version(self):
+        """Test that other tags do not block storing"""
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        version = cache.tags_version(["products"])
+
+        cache.invalidate_tags("audit_logs")
+        cache.set("inventory", [1], tags=["products"], version=version)
+
+        assert cache.get("inventory") == [1]
+
+    def test_module_invalidate_reaches_all_caches(self):
+        """Test that invalidate_tags() evicts from every cache"""
+        first = LRUCache(max_size=10, ttl_seconds=60)
+        second = LRUCache(max_size=10, ttl_seconds=60)
+        first.set("a", 1, tags=["products"])
+        second.set("b", 2, tags=["products"])
+
+        invalidate_tags("products")
+
+        assert first.get("a") is None
+        assert second.get("b") is None
+
+
+# ==================== DECORATOR ====================
+
+@pytest.mark.unit
+class TestCachedDecorator:
+    """Test the @cached decorator"""
+
+    def test_caches_result_until_tag_invalidated(self):
+        """Test that results are reused until their tag is invalidated"""
+        calls = []
+
+        @cached(tags=("unit_test_table",))
+        def load(x):
+            calls.append(x)
+            return [x]
+
+        assert load(1) == [1]
+        assert load(1) == [1]
+        assert calls == [1]
+
+        invalidate_tags("unit_test_table")
+        load(1)
+        assert calls == [1, 1]
+
+    def test_cache_attr_uses_instance_cache(self):
+        """Test that methods can use a per-instance cache"""
+
+        class Repo:
+            def __init__(self):
+                self.cache = LRUCache(max_size=10, ttl_seconds=60)
+                self.calls = 0
+
+            @cached(tags=("t",), cache_attr="cache")
+            def load(self, key):
+                self.calls += 1
+                return [key]
+
+        first, second = Repo(), Repo()
+        first.load("a")
+        first.load("a")
+        second.load("a")
+
+        assert first.calls == 1
+        assert second.calls == 1
+        assert first.cache.get_stats()['size'] == 1
+
+    def test_none_result_cached_on_request(self):
+        """Test that cache_none=True caches None and empty results"""
+        calls = []
+
+        @cached(cache_none=True)
+        def lookup(x):
+            calls.append(x)
+            return None if x else []
+
+        assert lookup(1) is None
+        assert lookup(1) is None
+        assert lookup(0) == []
+        assert lookup(0) == []
+        assert calls == [1, 0]
+
+    def test_none_not_cached_by_default(self):
+        """Test that failed (None) calls are retried, while empty results are cached"""
+        calls = []
+
+        @cached()
+        def fetch(url):
+            calls.append(url)
+            return None if url == "a" else []
+
+        fetch("a")
+        fetch("a")
+        fetch("b")
+        fetch("b")
+        assert calls == ["a", "a", "b"]
+
+
+# ==================== SINGLE-FLIGHT ====================
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Test request coalescing and stale-while-revalidate"""
+
+    def test_concurrent_misses_run_once(self):
+        """Test that parallel misses on one key share one computation"""
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        @cached()
+        def slow(x):
+            calls.append(x)
+            started.set()
+            release.wait(5)
+            return x * 2
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(slow(21)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert calls == [21]
+        assert results == [42] * 8
+
+    def test_error_shared_and_not_cached(self):
+        """Test that waiters get the leader's exception and nothing is cached"""
+        calls = []
+        release = threading.Event()
+
+        @cached()
+        def failing():
+            calls.append(1)
+            release.wait(5)
+            raise ValueError("boom")
+
+        errors = []
+
+        def call():
+            try:
+                failing()
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(errors) == 4
+        assert len(calls) == 1
+
+        with pytest.raises(ValueError):
+            failing()
+        assert len(calls) == 2
+
+    def test_stale_value_served_while_refreshing(self, mocker):
+        """Test stale-while-revalidate"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        values = iter(["old", "new"])
+        refreshed = threading.Event()
+
+        @cached(ttl_seconds=10, stale_seconds=60)
+        def feed():
+            value = next(values)
+            if value == "new":
+                refreshed.set()
+            return value
+
+        assert feed() == "old"
+
+        clock.return_value = 1015.0
+        assert feed() == "old"
+        assert refreshed.wait(5)
+
+        for _ in range(100):
+            if feed() == "new":
+                break
+            time.sleep(0.01)
+        assert feed() == "new"
+
+    def test_too_stale_value_recomputed(self, mocker):
+        """Test that values past the stale window are a normal miss"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        values = iter([1, 2])
+
+        @cached(ttl_seconds=10, stale_seconds=5)
+        def load():
+            return next(values)
+
+        assert load() == 1
+        clock.return_value = 1020.0
+        assert load() == 2
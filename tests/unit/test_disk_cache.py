@@ -0,0 +1,219 @@
+"""
+Tests for utils/disk_cache.py
+
+Tests cover:
+- Store/read, TTL expiry and persistence across instances
+- Size-bounded LRU eviction
+- Tag invalidation
+- Sealed values (no plaintext, tampered blobs never unpickled)
+- One file per named cache
+- LRUCache with a disk tier (fall-through, promotion, write-through)
+"""
+import pickle
+import sqlite3
+
+import pytest
+
+from utils import disk_cache
+from utils.cache import LRUCache, cached
+from utils.disk_cache import DiskCache, get_disk_cache
+
+
+@pytest.fixture
+def disk(tmp_path):
+    cache = DiskCache(tmp_path / "cache.db", max_bytes=1024 * 1024)
+    yield cache
+    cache.close()
+
+
+# ==================== DISK CACHE ====================
+
+@pytest.mark.unit
+class TestDiskCache:
+    """Test the SQLite-backed tier"""
+
+    def test_set_and_get(self, disk):
+        """Test storing and reading a value"""
+        disk.set("feed", b"<rss/>", ttl=60)
+
+        assert disk.get("feed") == b"<rss/>"
+        assert disk.get("missing") is None
+
+    def test_survives_restart(self, tmp_path):
+        """Test that a new instance on the same file sees old entries"""
+        path = tmp_path / "cache.db"
+        first = DiskCache(path)
+        first.set("answer", {"text": "ok"}, ttl=60)
+        first.close()
+
+        second = DiskCache(path)
+        assert second.get("answer") == {"text": "ok"}
+        second.close()
+
+    def test_expired_entry_not_returned(self, disk, mocker):
+        """Test TTL expiry"""
+        clock = mocker.patch("utils.disk_cache.time.time", return_value=1000.0)
+        disk.set("a", 1, ttl=5)
+
+        clock.return_value = 1006.0
+        assert disk.get("a") is None
+        assert disk.get_stats()['bytes'] == 0
+
+    def test_evicts_least_recently_used(self, tmp_path, mocker):
+        """Test that the byte budget evicts the oldest accessed entry"""
+        clock = mocker.patch("utils.disk_cache.time.time", return_value=1000.0)
+        disk = DiskCache(tmp_path / "cache.db", max_bytes=3500)  # two sealed values
+        disk.set("a", b"x" * 1000, ttl=600)
+        clock.return_value = 1001.0
+        disk.set("b", b"x" * 1000, ttl=600)
+        clock.return_value = 1002.0
+        disk.get("a")
+        clock.return_value = 1003.0
+        disk.set("c", b"x" * 1000, ttl=600)
+
+        assert disk.get("b") is None
+        assert disk.get("a") is not None
+        stats = disk.get_stats()
+        assert stats['bytes'] <= 3500
+        assert stats['evictions'] == 1
+        disk.close()
+
+    def test_value_over_budget_not_stored(self, tmp_path):
+        """Test that an oversized value is skipped"""
+        disk = DiskCache(tmp_path / "cache.db", max_bytes=100)
+
+        assert disk.set("big", b"x" * 1000, ttl=60) is False
+        assert disk.get("big") is None
+        disk.close()
+
+    def test_unpicklable_value_skipped(self, disk):
+        """Test that unpicklable values are not stored and do not raise"""
+        assert disk.set("lock", lambda: None, ttl=60) is False
+
+    def test_invalidate_tags(self, disk):
+        """Test tag-based removal"""
+        disk.set("a", 1, ttl=60, tags=("medical_news",))
+        disk.set("b", 2, ttl=60, tags=("ai",))
+
+        assert disk.invalidate_tags("medical_news") == 1
+        assert disk.get("a") is None
+        assert disk.get("b") == 2
+
+    def test_invalidate_without_file_does_not_create_it(self, tmp_path):
+        """Test that commits elsewhere do not open an unused disk tier"""
+        disk = DiskCache(tmp_path / "unused.db")
+
+        assert disk.invalidate_tags("patients") == 0
+        assert not (tmp_path / "unused.db").exists()
+
+    def test_encrypted_values(self, tmp_path):
+        """Test that the file holds no plaintext"""
+        path = tmp_path / "ai.db"
+        disk = DiskCache(path)
+        disk.set("prompt", "Hasta Ayşe Yılmaz, 12345678950", ttl=60)
+
+        assert disk.get("prompt") == "Hasta Ayşe Yılmaz, 12345678950"
+        disk.close()
+        assert "Yılmaz".encode() not in path.read_bytes()
+        assert b"12345678950" not in path.read_bytes()
+
+    def test_tampered_blob_not_unpickled(self, disk, mocker):
+        """Test that a blob written without the key is dropped, not loaded"""
+        disk.set("feed", b"<rss/>", ttl=60)
+        with sqlite3.connect(str(disk.path)) as conn:
+            conn.execute("UPDATE cache_entries SET value = ?", (pickle.dumps(b"forged"),))
+        loads = mocker.spy(disk_cache.pickle, "loads")
+
+        assert disk.get("feed") is None
+        assert not loads.called
+        stats = disk.get_stats()
+        assert stats['bytes'] == 0
+        assert stats['hits'] == 0 and stats['misses'] == 1
+
+    def test_unloadable_blob_dropped(self, disk, mocker):
+        """Test that a value that no longer unpickles is deleted, not retried"""
+        disk.set("feed", b"<rss/>", ttl=60)
+        mocker.patch.object(disk_cache.pickle, "loads", side_effect=AttributeError("renamed"))
+
+        assert disk.get("feed") is None
+        stats = disk.get_stats()
+        assert stats['bytes'] == 0
+        assert stats['hits'] == 0 and stats['misses'] == 1
+
+    def test_named_caches_are_separate(self, tmp_path, monkeypatch):
+        """Test that clearing one named cache keeps the others"""
+        monkeypatch.setattr(disk_cache.settings, "DISK_CACHE_PATH", str(tmp_path / "disk_cache.db"))
+        monkeypatch.setattr(disk_cache, "_shared", {})
+        news, ai = get_disk_cache("news"), get_disk_cache("ai")
+        news.set("feed", b"<rss/>", ttl=60)
+        ai.set("answer", "ok", ttl=60)
+
+        LRUCache(max_size=10, ttl_seconds=60, disk=news).clear()
+
+        assert get_disk_cache("news") is news
+        assert news.get("feed") is None
+        assert ai.get("answer") == "ok"
+        assert news.path.name == "disk_cache_news.db"
+        news.close()
+        ai.close()
+
+
+# ==================== TWO-TIER ====================
+
+@pytest.mark.unit
+class TestTieredCache:
+    """Test LRUCache backed by a disk tier"""
+
+    def test_memory_miss_falls_through_to_disk(self, disk):
+        """Test warm start: a fresh memory cache is filled from disk"""
+        LRUCache(max_size=10, ttl_seconds=60, disk=disk).set("feed", b"data")
+
+        cache = LRUCache(max_size=10, ttl_seconds=60, disk=disk)
+        assert cache.get("feed") == b"data"
+        assert cache.get_stats()['disk_hits'] == 1
+
+        # Promoted, so the second read is a memory hit
+        assert cache.get("feed") == b"data"
+        assert cache.get_stats()['disk_hits'] == 1
+
+    def test_promoted_entry_keeps_remaining_ttl(self, disk, mocker):
+        """Test that promotion does not extend the lifetime"""
+        clock = mocker.patch("utils.cache.time.time", return_value=1000.0)
+        mocker.patch("utils.disk_cache.time.time", new=clock)
+        LRUCache(max_size=10, ttl_seconds=10, disk=disk).set("a", 1)
+
+        clock.return_value = 1008.0
+        cache = LRUCache(max_size=10, ttl_seconds=10, disk=disk)
+        assert cache.get("a") == 1
+
+        clock.return_value = 1011.0
+        assert cache.get("a") is None
+
+    def test_delete_and_invalidate_reach_disk(self, disk):
+        """Test that removals are applied to both tiers"""
+        cache = LRUCache(max_size=10, ttl_seconds=60, disk=disk)
+        cache.set("a", 1)
+        cache.set("b", 2, tags=("medical_news",))
+
+        cache.delete("a")
+        cache.invalidate_tags("medical_news")
+
+        assert disk.get("a") is None
+        assert disk.get("b") is None
+
+    def test_cached_function_skips_call_after_restart(self, disk):
+        """Test @cached with a disk-backed cache across instances"""
+        calls = []
+
+        class Service:
+            def __init__(self):
+                self.feed_cache = LRUCache(max_size=10, ttl_seconds=60, disk=disk)
+
+            @cached(cache_attr="feed_cache")
+            def fetch(self, url):
+                calls.append(url)
+                return f"body of {url}"
+
+        assert Service().fetch("https://example.org/rss") == "body of https://example.org/rss"
+        assert Service().fetch("https://example.org/rss") == "body of https://example.org/rss"
+        assert calls == ["https://example.org/rss"]
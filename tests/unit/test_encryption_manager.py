@@ -452,6 +452,115 @@ class TestSecurity:
 
 # ==================== INTEGRATION TESTS ====================
 
+class TestBatchDecryption:
+    """Test decrypt_many / decrypt_rows"""
+
+    def test_decrypt_many_roundtrip(self, encryption_manager):
+        """Test that batch decryption matches single decryption"""
+        values = [f"Hasta {i}" for i in range(50)]
+        encrypted = [encryption_manager.encrypt(v) for v in values]
+
+        assert encryption_manager.decrypt_many(encrypted) == values
+
+    def test_decrypt_many_empty_values(self, encryption_manager):
+        """Test that empty and None values decrypt to empty strings"""
+        encrypted = encryption_manager.encrypt("data")
+
+        assert encryption_manager.decrypt_many(["", None, encrypted]) == ["", "", "data"]
+        assert encryption_manager.decrypt_many([]) == []
+
+    def test_decrypt_many_parallel(self, encryption_manager, monkeypatch):
+        """Test that the thread pool path preserves order"""
+        from config import settings
+        monkeypatch.setattr(settings, "DECRYPT_WORKERS", 3)
+
+        values = [f"value-{i}" for i in range(100)]
+        encrypted = [encryption_manager.encrypt(v) for v in values]
+
+        assert encryption_manager.decrypt_many(encrypted, parallel=True) == values
+
+    def test_decrypt_many_invalid_token(self, encryption_manager):
+        """Test that an invalid token raises like decrypt()"""
+        with pytest.raises(RuntimeError, match="Decryption failed"):
+            encryption_manager.decrypt_many([encryption_manager.encrypt("ok"), "invalid"])
+
+    def test_decrypt_rows_in_place(self, encryption_manager):
+        """Test that only the requested columns are decrypted"""
+        rows = [
+            {'id': i, 'name': encryption_manager.encrypt(f"n{i}"), 'note': None}
+            for i in range(5)
+        ]
+
+        result = encryption_manager.decrypt_rows(rows, ('name', 'note'))
+
+        assert result is rows
+        assert [r['name'] for r in rows] == [f"n{i}" for i in range(5)]
+        assert all(r['note'] == "" for r in rows)
+        assert [r['id'] for r in rows] == list(range(5))
+
+
+class TestBatchEncryption:
+    """Test encrypt_many"""
+
+    def test_encrypt_many_roundtrip(self, encryption_manager):
+        """Test that batch encryption decrypts back to the input"""
+        values = [f"Hasta {i}" for i in range(50)]
+
+        assert encryption_manager.decrypt_many(encryption_manager.encrypt_many(values)) == values
+
+    def test_encrypt_many_empty_values(self, encryption_manager):
+        """Test that empty and None values stay empty like encrypt()"""
+        assert encryption_manager.encrypt_many(["", None]) == ["", ""]
+        assert encryption_manager.encrypt_many([]) == []
+
+    def test_encrypt_many_parallel(self, encryption_manager, monkeypatch):
+        """Test that the thread pool path preserves order"""
+        from config import settings
+        monkeypatch.setattr(settings, "DECRYPT_WORKERS", 3)
+
+        values = [f"value-{i}" for i in range(100)]
+        encrypted = encryption_manager.encrypt_many(values, parallel=True)
+
+        assert [encryption_manager.decrypt(v) for v in encrypted] == values
+
+
+class TestBlindIndex:
+    """Test deterministic blind index digests"""
+
+    def test_blind_index_is_deterministic(self, encryption_manager):
+        """Test that the same value always yields the same digest"""
+        first = encryption_manager.blind_index("12345678901", "tc")
+        second = encryption_manager.blind_index("12345678901", "tc")
+
+        assert first == second
+        assert len(first) == 64
+
+    def test_blind_index_separates_purposes(self, encryption_manager):
+        """Test that purpose is part of the digest"""
+        assert (encryption_manager.blind_index("5551234567", "tc")
+                != encryption_manager.blind_index("5551234567", "phone"))
+
+    def test_blind_index_depends_on_key(self, test_encryption_key):
+        """Test that different keys produce different digests"""
+        em1 = EncryptionManager(key=test_encryption_key.decode())
+        em2 = EncryptionManager(key=Fernet.generate_key().decode())
+
+        assert em1.blind_index("value") != em2.blind_index("value")
+
+    def test_blind_index_explicit_index_key(self, test_encryption_key):
+        """Test that an explicit index key overrides the derived one"""
+        em1 = EncryptionManager(key=test_encryption_key.decode(), index_key="index-key")
+        em2 = EncryptionManager(key=Fernet.generate_key().decode(), index_key="index-key")
+
+        assert em1.blind_index("value") == em2.blind_index("value")
+
+    def test_blind_index_truncation_and_empty(self, encryption_manager):
+        """Test digest truncation and empty input"""
+        assert len(encryption_manager.blind_index("value", length=16)) == 16
+        assert encryption_manager.blind_index("") == ""
+        assert encryption_manager.blind_index(None) == ""
+
+
 @pytest.mark.integration
 class TestIntegration:
     """Integration tests with real-world scenarios"""
@@ -0,0 +1,174 @@
+"""
+Tests for services/patient_import_service.py
+
+Tests cover:
+- Header mapping (Turkish/English, diacritics)
+- Row validation and normalization
+- CSV reading (delimiter sniffing, encodings)
+- Chunked import, duplicate TCs and the reject report
+"""
+import csv
+
+import pytest
+
+from config import settings
+from services.patient_import_service import ImportProgress, PatientImportService
+from utils.exceptions import FileProcessingException
+
+
+def make_tc(body):
+    """Valid TC number from its first 9 digits"""
+    digits = [int(d) for d in f"{body:09d}"]
+    digits.append((sum(digits[0:9:2]) * 7 - sum(digits[1:8:2])) % 10)
+    digits.append(sum(digits) % 10)
+    return "".join(map(str, digits))
+
+
+def write_csv(path, rows, delimiter=",", encoding="utf-8"):
+    with open(path, "w", encoding=encoding, newline="") as handle:
+        csv.writer(handle, delimiter=delimiter).writerows(rows)
+    return path
+
+
+# ==================== VALIDATION ====================
+
+@pytest.mark.unit
+class TestRowValidation:
+    """Test header mapping and per-row validation"""
+
+    @pytest.fixture
+    def service(self):
+        return PatientImportService(db=None, chunk_size=10)
+
+    def test_map_turkish_headers(self, service):
+        """Test that headers are matched case- and diacritic-insensitively"""
+        mapped = service.map_columns({
+            "TC Kimlik No": "1", "Adı Soyadı": "Ayşe", "E-Posta": "a@b.co", "Not": "x"
+        })
+
+        assert mapped == {"tc_no": "1", "full_name": "Ayşe", "email": "a@b.co"}
+
+    def test_valid_row_normalized(self, service):
+        """Test phone, date and gender normalization"""
+        patient, error = service.validate_row({
+            "tc_no": make_tc(390000001), "full_name": "  Ayşe   Yılmaz ",
+            "phone": "0532 123 45 67", "birth_date": "05.03.1980", "gender": "K"
+        })
+
+        assert error is None
+        assert patient["phone"] == "5321234567"
+        assert patient["full_name"] == "Ayşe Yılmaz"
+        assert patient["birth_date"] == "1980-03-05"
+        assert patient["gender"] == "Kadın"
+        assert patient["source"] == "Diğer"
+
+    def test_numeric_excel_cells(self, service):
+        """Test TCs stored as numbers by Excel"""
+        tc_no = make_tc(390000002)
+
+        patient, error = service.validate_row({"tc_no": float(tc_no), "full_name": "Ali"})
+
+        assert error is None and patient["tc_no"] == tc_no
+
+    @pytest.mark.parametrize("row, message", [
+        ({"full_name": "Ali"}, "zorunlu"),
+        ({"tc_no": "12345678901", "full_name": "Ali"}, "Geçersiz TC"),
+        ({"tc_no": make_tc(390000003), "full_name": "Ali", "phone": "123"}, "telefon"),
+        ({"tc_no": make_tc(390000003), "full_name": "Ali", "email": "ali@"}, "e-posta"),
+        ({"tc_no": make_tc(390000003), "full_name": "Ali", "birth_date": "31/02/1980"}, "doğum tarihi"),
+    ])
+    def test_invalid_rows(self, service, row, message):
+        """Test that each validator's message is reported"""
+        patient, error = service.validate_row(row)
+
+        assert patient is None
+        assert message in error
+
+
+# ==================== READING ====================
+
+@pytest.mark.unit
+class TestReading:
+    """Test streaming rows from files"""
+
+    def test_semicolon_cp1254_csv(self, tmp_path):
+        """Test Excel's Turkish CSV export (semicolons, Windows code page)"""
+        path = write_csv(
+            tmp_path / "hastalar.csv",
+            [["TC", "Ad Soyad"], [make_tc(390000004), "Gülşen Öztürk"], [], ["", ""]],
+            delimiter=";", encoding="cp1254"
+        )
+
+        rows = list(PatientImportService(db=None).iter_rows(path))
+
+        assert rows == [(2, {"TC": make_tc(390000004), "Ad Soyad": "Gülşen Öztürk"})]
+
+    def test_unsupported_file(self, tmp_path):
+        """Test missing files and unknown extensions"""
+        service = PatientImportService(db=None)
+        (tmp_path / "hastalar.pdf").write_bytes(b"%PDF")
+
+        with pytest.raises(FileProcessingException):
+            service.iter_rows(tmp_path / "yok.csv")
+        with pytest.raises(FileProcessingException):
+            service.iter_rows(tmp_path / "hastalar.pdf")
+
+
+# ==================== IMPORT ====================
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestImport:
+    """Test chunked imports against the database"""
+
+    @pytest.fixture(autouse=True)
+    def app_dir(self, monkeypatch, tmp_path):
+        """Keep reject reports out of the real reports directory"""
+        monkeypatch.setattr(settings, "BASE_DIR", tmp_path / "app")
+        return tmp_path / "app"
+
+    def test_import_with_rejects(self, db_manager, tmp_path, app_dir):
+        """Test that valid rows are stored and the rest land in the report"""
+        rows = [["TC Kimlik No", "Ad Soyad", "Telefon"]]
+        rows += [[make_tc(391000000 + i), f"Aktarım Hasta {i}", f"0555{i:07d}"] for i in range(12)]
+        rows.append([make_tc(391000003), "Tekrar Eden", ""])  # Same TC as row 5
+        rows.append(["11111111111", "Hatalı TC", ""])
+        path = write_csv(tmp_path / "hastalar.csv", rows)
+        updates = []
+
+        summary = PatientImportService(db_manager, chunk_size=5).import_file(path, progress=updates.append)
+
+        assert (summary.total, summary.imported, summary.rejected) == (14, 12, 2)
+        assert db_manager.get_patient_by_tc(make_tc(391000007))["full_name"] == "Aktarım Hasta 7"
+
+        assert summary.reject_path.parent == app_dir / "reports"
+        assert summary.reject_path.name.startswith("hastalar_hatalar_")
+        with open(summary.reject_path, encoding="utf-8-sig", newline="") as handle:
+            report = list(csv.reader(handle))
+        assert report[0] == ["Satır", "Hata", "TC Kimlik No", "Ad Soyad", "Telefon"]
+        assert sorted(line[0] for line in report[1:]) == ["14", "15"]
+
+        assert all(isinstance(update, ImportProgress) for update in updates)
+        assert len(updates) == 3  # One per chunk of 5
+        assert updates[-1].fraction == 1.0 and updates[-1].rows_read == 14
+
+    def test_clean_import_has_no_report(self, db_manager, tmp_path):
+        """Test that no reject file is left behind when every row is valid"""
+        path = write_csv(tmp_path / "temiz.csv", [["tc", "name"], [make_tc(392000000), "Temiz Hasta"]])
+
+        summary = PatientImportService(db_manager).import_file(path)
+
+        assert summary.imported == 1 and summary.reject_path is None
+        assert not (tmp_path / "temiz_hatalar.csv").exists()
+
+    def test_reports_not_overwritten(self, db_manager, tmp_path):
+        """Test that a second import of the same file gets its own report"""
+        path = write_csv(tmp_path / "tekrar.csv", [["tc", "name"], ["11111111111", "Hatalı TC"]])
+        service = PatientImportService(db_manager)
+
+        first = service.import_file(path).reject_path
+        second = service.import_file(path).reject_path
+
+        assert first != second
+        assert first.exists() and second.exists()
+        assert list(tmp_path.glob("*_hatalar*")) == []
@@ -0,0 +1,158 @@
+"""
+Tests for utils/rate_limiter.py
+
+Tests cover:
+- GCRA allow/deny and smooth refill
+- No double burst at window edges
+- Read-only lookups, limit classes, reset
+- Bounded memory (LRU cap) and expired-entry cleanup
+"""
+import pytest
+
+from utils.exceptions import RateLimitException
+from utils.rate_limiter import RateLimit, RateLimiter
+
+
+@pytest.fixture
+def clock(mocker):
+    return mocker.patch("utils.rate_limiter.time.monotonic", return_value=1000.0)
+
+
+@pytest.fixture
+def limiter():
+    limiter = RateLimiter(
+        limits={
+            'default': RateLimit(10, 60),
+            'login': RateLimit(3, 300),
+            'sms': RateLimit(2, 3600),
+        },
+        max_identifiers=100, stripes=4
+    )
+    limiter.enabled = True
+    return limiter
+
+
+@pytest.mark.unit
+class TestGCRA:
+    """Test the rate decision"""
+
+    def test_burst_up_to_limit_then_denied(self, limiter, clock):
+        """Test that `requests` calls pass at once and the next one fails"""
+        for _ in range(10):
+            assert limiter.check_rate_limit("user1") is True
+
+        with pytest.raises(RateLimitException):
+            limiter.check_rate_limit("user1")
+
+    def test_refills_one_request_per_interval(self, limiter, clock):
+        """Test smooth refill (60 s / 10 requests = one every 6 s)"""
+        for _ in range(10):
+            limiter.check_rate_limit("user1")
+
+        clock.return_value = 1006.0
+        assert limiter.check_rate_limit("user1") is True
+        with pytest.raises(RateLimitException):
+            limiter.check_rate_limit("user1")
+
+    def test_no_double_burst_at_window_edge(self, limiter, clock):
+        """Test that a burst right after another gets only the refilled part"""
+        clock.return_value = 1059.0
+        for _ in range(10):
+            limiter.check_rate_limit("user1")
+
+        clock.return_value = 1061.0
+        with pytest.raises(RateLimitException):
+            limiter.check_rate_limit("user1")
+
+    def test_denied_request_not_counted(self, limiter, clock):
+        """Test that rejected calls do not push the limit further out"""
+        for _ in range(10):
+            limiter.check_rate_limit("user1")
+        for _ in range(5):
+            with pytest.raises(RateLimitException):
+                limiter.check_rate_limit("user1")
+
+        clock.return_value = 1006.0
+        assert limiter.check_rate_limit("user1") is True
+
+    def test_disabled_always_allows(self, limiter, clock):
+        """Test RATE_LIMIT_ENABLED=False"""
+        limiter.enabled = False
+        for _ in range(50):
+            assert limiter.check_rate_limit("user1") is True
+
+
+@pytest.mark.unit
+class TestLimitClasses:
+    """Test per-class limits and lookups"""
+
+    def test_classes_are_independent(self, limiter, clock):
+        """Test that login attempts do not use up the SMS limit"""
+        for _ in range(3):
+            limiter.check_rate_limit("user1", limit="login")
+        with pytest.raises(RateLimitException):
+            limiter.check_rate_limit("user1", limit="login")
+
+        assert limiter.check_rate_limit("user1", limit="sms") is True
+        assert limiter.check_rate_limit("user1") is True
+
+    def test_unknown_class_rejected(self, limiter):
+        """Test that a typo in the class name is not silently unlimited"""
+        with pytest.raises(ValueError):
+            limiter.check_rate_limit("user1", limit="logins")
+
+    def test_add_limit(self, limiter, clock):
+        """Test registering a class at runtime"""
+        limiter.add_limit("export", requests=1, period_seconds=60)
+
+        limiter.check_rate_limit("user1", limit="export")
+        with pytest.raises(RateLimitException):
+            limiter.check_rate_limit("user1", limit="export")
+
+    def test_remaining_is_read_only(self, limiter, clock):
+        """Test that lookups neither count nor track identifiers"""
+        assert limiter.get_remaining_requests("nobody") == 10
+        assert limiter.get_stats()['tracked'] == 0
+
+        limiter.check_rate_limit("user1", limit="login")
+        assert limiter.get_remaining_requests("user1", limit="login") == 2
+
+    def test_retry_after(self, limiter, clock):
+        """Test the wait until the next allowed request"""
+        assert limiter.get_retry_after("user1", limit="sms") == 0
+        limiter.check_rate_limit("user1", limit="sms")
+        limiter.check_rate_limit("user1", limit="sms")
+
+        assert limiter.get_retry_after("user1", limit="sms") == pytest.approx(1800)
+
+    def test_reset_single_class(self, limiter, clock):
+        """Test resetting one identifier in one class"""
+        for _ in range(3):
+            limiter.check_rate_limit("user1", limit="login")
+        limiter.check_rate_limit("user1", limit="sms")
+
+        limiter.reset("user1", limit="login")
+
+        assert limiter.get_remaining_requests("user1", limit="login") == 3
+        assert limiter.get_remaining_requests("user1", limit="sms") == 1
+
+
+@pytest.mark.unit
+class TestBoundedMemory:
+    """Test memory bounds"""
+
+    def test_lru_cap(self, limiter, clock):
+        """Test that tracked identifiers never exceed the cap"""
+        for i in range(1000):
+            limiter.check_rate_limit(f"ip{i}")
+
+        assert limiter.get_stats()['tracked'] <= 100
+
+    def test_cleanup_expired(self, limiter, clock):
+        """Test that identifiers with nothing left to remember are dropped"""
+        limiter.check_rate_limit("user1")
+        limiter.check_rate_limit("user2", limit="sms")
+
+        clock.return_value = 1010.0
+        assert limiter.cleanup_expired() == 1
+        assert limiter.get_stats()['by_limit']['sms'] == 1
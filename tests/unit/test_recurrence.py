@@ -0,0 +1,58 @@
+"""
+Tests for database/recurrence.py
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.recurrence import expand_rule, format_exdates, parse_exdates
+
+START = datetime(2030, 1, 7, 10, 0)  # Monday
+
+
+@pytest.mark.unit
+class TestExpandRule:
+    """Test RRULE expansion"""
+
+    def test_weekly_count(self):
+        """Test a plain weekly series"""
+        occurrences = expand_rule("FREQ=WEEKLY;COUNT=10", START)
+
+        assert len(occurrences) == 10
+        assert occurrences[1] - occurrences[0] == timedelta(days=7)
+        assert all(o.hour == 10 for o in occurrences)
+
+    def test_by_day_with_prefix(self):
+        """Test BYDAY and an "RRULE:" prefix"""
+        occurrences = expand_rule("RRULE:FREQ=WEEKLY;BYDAY=MO,TH;COUNT=4", START)
+
+        assert [o.weekday() for o in occurrences] == [0, 3, 0, 3]
+
+    def test_exdates_removed(self):
+        """Test that excluded dates are skipped"""
+        occurrences = expand_rule("FREQ=WEEKLY;COUNT=3", START, [START + timedelta(days=7)])
+
+        assert occurrences == [START, START + timedelta(days=14)]
+
+    def test_unbounded_rule_refused(self):
+        """Test that rules without COUNT/UNTIL cannot explode"""
+        with pytest.raises(ValueError):
+            expand_rule("FREQ=DAILY", START, max_occurrences=50)
+
+    @pytest.mark.parametrize("rule", ["", "FREQ=SOMETIMES", "COUNT=abc"])
+    def test_invalid_rule(self, rule):
+        """Test malformed rules"""
+        with pytest.raises(ValueError):
+            expand_rule(rule, START)
+
+
+@pytest.mark.unit
+class TestExdates:
+    """Test exdate serialization"""
+
+    def test_round_trip(self):
+        """Test format/parse symmetry, sorting and de-duplication"""
+        dates = [START + timedelta(days=14), START, START]
+
+        assert parse_exdates(format_exdates(dates)) == [START, START + timedelta(days=14)]
+        assert parse_exdates(None) == []
@@ -3,6 +3,7 @@ Comprehensive tests for utils/security_manager.py
 
 Tests cover:
 - Password hashing with bcrypt (salt, uniqueness, strength)
+- Adaptive bcrypt cost (calibration, rehash detection) and async API
 - Password verification (correct/incorrect passwords)
 - Data encryption with Fernet (roundtrip integrity)
 - Data decryption (error handling, edge cases)
@@ -87,6 +88,89 @@ class TestPasswordHashing:
         assert len(hashed) == 60
 
 
+# ==================== ADAPTIVE COST ====================
+
+class TestAdaptiveCost:
+    """Test bcrypt cost selection and rehash detection"""
+
+    def test_hash_uses_target_rounds(self, security_manager):
+        """Test that gensalt honours the configured cost"""
+        security_manager.rounds = 5
+        hashed = security_manager.hash_password("test_password")
+
+        assert hashed.startswith("$2b$05$")
+        assert security_manager.hash_rounds(hashed) == 5
+
+    def test_hash_rounds_invalid(self, security_manager):
+        """Test parsing of malformed hashes"""
+        assert security_manager.hash_rounds("invalid_hash") is None
+        assert security_manager.hash_rounds("") is None
+        assert security_manager.hash_rounds(None) is None
+
+    def test_needs_rehash(self, security_manager):
+        """Test that only a different cost triggers a rehash"""
+        security_manager.rounds = 5
+        current = security_manager.hash_password("pw")
+        security_manager.rounds = 6
+
+        assert security_manager.needs_rehash(current) is True
+        assert security_manager.needs_rehash(security_manager.hash_password("pw")) is False
+        assert security_manager.needs_rehash("invalid_hash") is False
+
+    def test_calibrate_picks_highest_cost_under_target(self, security_manager, mocker):
+        """Test calibration (cost 8 at 4 ms -> cost 12 at ~64 ms, 13 at ~128 ms)"""
+        mocker.patch.object(SecurityManager, "_measure_hash_ms", return_value=4.0)
+
+        assert security_manager.calibrate_rounds(target_ms=100) == 12
+        assert security_manager.calibrate_rounds(target_ms=300) == 14
+
+    def test_calibrate_clamped(self, security_manager, mocker):
+        """Test that calibration never goes below the safe minimum"""
+        mocker.patch.object(SecurityManager, "_measure_hash_ms", return_value=500.0)
+        assert security_manager.calibrate_rounds(target_ms=100) == 10
+
+        SecurityManager._measure_hash_ms.return_value = 0.001
+        assert security_manager.calibrate_rounds(target_ms=10000) == 16
+
+    def test_calibrated_lazily(self, security_manager, mocker):
+        """Test that an unset cost is calibrated on first use"""
+        calibrate = mocker.patch.object(security_manager, "calibrate_rounds", return_value=5)
+        security_manager.rounds = None
+
+        security_manager.hash_password("pw")
+        security_manager.hash_password("pw")
+
+        assert calibrate.call_count == 1
+
+
+# ==================== ASYNC API ====================
+
+class TestAsyncPasswordAPI:
+    """Test worker-pool hashing and verification"""
+
+    def test_verify_password_async(self, security_manager):
+        """Test that verification runs off the calling thread"""
+        security_manager.rounds = 5
+        hashed = security_manager.hash_password("secret")
+
+        assert security_manager.verify_password_async("secret", hashed).result(timeout=10) is True
+        assert security_manager.verify_password_async("wrong", hashed).result(timeout=10) is False
+
+    def test_hash_password_async(self, security_manager):
+        """Test background hashing"""
+        security_manager.rounds = 5
+        hashed = security_manager.hash_password_async("secret").result(timeout=10)
+
+        assert security_manager.verify_password("secret", hashed)
+
+    def test_async_runs_on_worker_thread(self, security_manager):
+        """Test that work is not done on the caller's thread"""
+        import threading
+
+        name = security_manager.submit(lambda: threading.current_thread().name).result(timeout=10)
+        assert name.startswith("bcrypt")
+
+
 # ==================== PASSWORD VERIFICATION ====================
 
 class TestPasswordVerification:
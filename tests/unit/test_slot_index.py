@@ -0,0 +1,175 @@
+"""
+Tests for database/slot_index.py
+
+Tests cover:
+- Overlap checks (half-open intervals, long appointments, moves)
+- Checking a whole series in one pass
+- Free gaps and grid-aligned free slots
+- Working hours parsing and per-weekday windows
+"""
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from database.slot_index import DoctorSlots, free_slots, parse_time_ranges, working_windows
+
+DAY = datetime(2030, 6, 3)  # Monday
+MIN = timedelta(minutes=1)
+
+
+def at(hour, minute=0, days=0):
+    return DAY + timedelta(days=days, hours=hour, minutes=minute)
+
+
+# ==================== INTERVAL INDEX ====================
+
+@pytest.mark.unit
+class TestDoctorSlots:
+    """Test overlap checks on the interval index"""
+
+    def test_overlap_detected(self):
+        """Test that a booking inside another is a conflict"""
+        slots = DoctorSlots([(at(10), at(10, 30), 1)])
+
+        assert [c[2] for c in slots.overlapping(at(10, 15), at(10, 45))] == [1]
+
+    def test_back_to_back_is_not_overlap(self):
+        """Test that end == start does not conflict"""
+        slots = DoctorSlots([(at(10), at(10, 30), 1)])
+
+        assert slots.overlapping(at(10, 30), at(11)) == []
+        assert slots.overlapping(at(9, 30), at(10)) == []
+
+    def test_long_appointment_found_from_far_start(self):
+        """Test that an interval starting long before the query is still seen"""
+        slots = DoctorSlots([(at(9), at(13), 1), (at(13), at(13, 20), 2)])
+        for minute in range(0, 60, 10):
+            slots.add(at(14, minute), at(14, minute + 10), 10 + minute)
+
+        assert [c[2] for c in slots.overlapping(at(12, 50), at(13, 5))] == [1, 2]
+
+    def test_add_moves_existing_id(self):
+        """Test that re-adding an id replaces its interval"""
+        slots = DoctorSlots()
+        slots.add(at(10), at(10, 30), 1)
+        slots.add(at(15), at(15, 30), 1)
+
+        assert len(slots) == 1
+        assert slots.overlapping(at(10), at(10, 30)) == []
+        assert slots.overlapping(at(15), at(15, 30))
+
+    def test_remove_and_ignore(self):
+        """Test removal and excluding the appointment being moved"""
+        slots = DoctorSlots([(at(10), at(10, 30), 1), (at(11), at(11, 30), 2)])
+
+        assert slots.overlapping(at(10), at(10, 30), ignore_id=1) == []
+        assert slots.remove(1) is True
+        assert slots.remove(1) is False
+        assert 1 not in slots and 2 in slots
+
+    def test_empty_interval_rejected(self):
+        """Test that zero-length bookings are refused"""
+        with pytest.raises(ValueError):
+            DoctorSlots().add(at(10), at(10), 1)
+
+
+@pytest.mark.unit
+class TestBatchConflicts:
+    """Test checking a whole series in one pass"""
+
+    def test_conflicts_by_position(self):
+        """Test that only clashing proposals are reported"""
+        slots = DoctorSlots([(at(10), at(10, 30), 1), (at(10, days=14), at(11, days=14), 2)])
+        proposed = [(at(10, days=7 * week), at(10, 45, days=7 * week)) for week in range(4)]
+
+        clashes = slots.conflicts(proposed)
+
+        assert sorted(clashes) == [0, 2]
+        assert [c[2] for c in clashes[2]] == [2]
+
+    def test_matches_single_checks(self):
+        """Test that the batch result equals per-booking overlap checks"""
+        slots = DoctorSlots(
+            (at(8 + i % 10, 15 * (i % 4), days=i // 10), at(9 + i % 10, 0, days=i // 10), i)
+            for i in range(60)
+        )
+        proposed = [(at(h, 40, days=d), at(h + 1, 10, days=d)) for d in range(7) for h in (8, 12, 19)]
+
+        clashes = slots.conflicts(proposed)
+
+        for position, (start, end) in enumerate(proposed):
+            assert clashes.get(position, []) == slots.overlapping(start, end)
+
+
+# ==================== FREE SLOTS ====================
+
+@pytest.mark.unit
+class TestFreeSlots:
+    """Test gap walking and slot generation"""
+
+    def test_free_gaps(self):
+        """Test gaps between and around bookings"""
+        slots = DoctorSlots([(at(10), at(11), 1), (at(10, 30), at(11, 30), 2), (at(13), at(14), 3)])
+
+        assert list(slots.free_gaps(at(9), at(15))) == [
+            (at(9), at(10)), (at(11, 30), at(13)), (at(14), at(15))
+        ]
+
+    def test_slots_on_grid(self):
+        """Test that candidate starts are aligned to the step from the window start"""
+        slots = DoctorSlots([(at(9), at(9, 25), 1)])
+
+        found = free_slots(slots, [(at(9), at(10, 30))], 20 * MIN, 15 * MIN)
+
+        assert [start for start, _ in found] == [at(9, 30), at(9, 45), at(10)]
+        assert found[0] == (at(9, 30), at(9, 50))
+
+    def test_next_free_slot(self):
+        """Test limit=1 returns the earliest fitting slot"""
+        slots = DoctorSlots([(at(9), at(9, 50), 1), (at(10), at(12), 2)])
+
+        found = free_slots(slots, [(at(9), at(18))], 20 * MIN, 10 * MIN, limit=1)
+
+        # The 10 minute gap at 09:50 is too short
+        assert found == [(at(12), at(12, 20))]
+
+    def test_invalid_duration(self):
+        """Test that a non-positive duration is refused"""
+        with pytest.raises(ValueError):
+            free_slots(DoctorSlots(), [(at(9), at(10))], timedelta(0), 15 * MIN)
+
+
+# ==================== WORKING HOURS ====================
+
+@pytest.mark.unit
+class TestWorkingHours:
+    """Test working hours parsing and windows"""
+
+    def test_parse_ranges(self):
+        """Test the settings string format"""
+        assert parse_time_ranges("13:30-18:00, 09:00-12:30") == [
+            (time(9), time(12, 30)), (time(13, 30), time(18))
+        ]
+
+    @pytest.mark.parametrize("value", ["9-18", "18:00-09:00", "09:00"])
+    def test_parse_rejects_invalid(self, value):
+        """Test malformed and reversed ranges"""
+        with pytest.raises(ValueError):
+            parse_time_ranges(value)
+
+    def test_windows_skip_closed_days_and_clip(self):
+        """Test closed weekdays and clipping to the search range"""
+        windows = list(working_windows(at(10), at(12, days=6), "09:00-18:00", range(5)))
+
+        assert windows[0] == (at(10), at(18))
+        assert len(windows) == 5  # Saturday and Sunday closed
+        assert windows[-1] == (at(9, days=4), at(18, days=4))
+
+    def test_windows_per_weekday(self):
+        """Test a {weekday: ranges} mapping"""
+        windows = list(working_windows(
+            at(0), at(0, days=2), {0: "09:00-12:00,13:00-17:00", 1: [(time(10), time(14))]}
+        ))
+
+        assert windows == [(at(9), at(12)), (at(13), at(17)), (at(10, days=1), at(14, days=1))]
+
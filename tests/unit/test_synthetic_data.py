@@ -0,0 +1,43 @@
+"""
+Unit tests for the synthetic benchmark data generator
+"""
+
+import random
+
+import pytest
+
+from scripts.synthetic_data import SyntheticDataGenerator, generate_phone, generate_tc_no
+from utils.validators import Validators
+
+
+@pytest.mark.unit
+class TestSyntheticValues:
+    """Test generated identifiers"""
+
+    def test_tc_numbers_have_valid_checksums(self):
+        """Test that every generated TC passes validation"""
+        rng = random.Random(1)
+
+        for _ in range(500):
+            is_valid, error = Validators.validate_tc_no(generate_tc_no(rng))
+            assert is_valid, error
+
+    def test_phone_numbers_valid(self):
+        """Test that generated phones are Turkish mobile numbers"""
+        rng = random.Random(1)
+
+        for _ in range(100):
+            assert Validators.validate_phone(generate_phone(rng))[0]
+
+    def test_seed_is_deterministic(self):
+        """Test that the same seed produces the same sequence"""
+        def sequence(rng):
+            return [(generate_tc_no(rng), generate_phone(rng)) for _ in range(20)]
+
+        first = sequence(SyntheticDataGenerator(None, seed=7).rng)
+        second = sequence(SyntheticDataGenerator(None, seed=7).rng)
+        other = sequence(SyntheticDataGenerator(None, seed=8).rng)
+
+        assert first == second
+        assert len(set(first)) == len(first)
+        assert other != first
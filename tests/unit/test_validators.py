@@ -10,10 +10,12 @@ Tests cover:
 - URL validation
 - File extension validation
 - Numeric range validation
+- Batch validation (masks, error codes, parity with the scalar validators)
 """
 import pytest
 from datetime import datetime
-from utils.validators import Validators
+from utils import validators
+from utils.validators import Validators, ValidationCode
 
 
 # ==================== TURKISH ID VALIDATION ====================
@@ -593,3 +595,80 @@ class TestNumericRangeValidation:
         """Test validation with negative numbers"""
         is_valid, msg = Validators.validate_numeric_range(-50, min_val=-100, max_val=0)
         assert is_valid
+
+
+# ==================== BATCH VALIDATION ====================
+
+@pytest.fixture(params=["numpy", "python"])
+def batch_backend(request, monkeypatch):
+    """Run batch tests with NumPy (when installed) and with the plain Python fallback"""
+    if request.param == "numpy":
+        if validators.np is None:
+            pytest.skip("NumPy not installed")
+    else:
+        monkeypatch.setattr(validators, "np", None)
+    return request.param
+
+
+@pytest.mark.usefixtures("batch_backend")
+class TestBatchValidation:
+    """Test the validate_*_many batch validators"""
+
+    TC_VALUES = [
+        "10000000146", "12345678950", None, "", "   ", "1000000014", "100000001466",
+        "01234567890", "12345678901", "100 000 001 46", "1000000014a6", "1" * 40, "١٠٠٠٠٠٠٠١٤٦",
+    ]
+    PHONE_VALUES = [
+        "5321234567", "+90 532 123 45 67", "905321234567", "05321234567", None, "",
+        "532 123", "4321234567", "(532) 123-45-67", "53212345678901234567890123456789012",
+    ]
+    EMAIL_VALUES = ["test@example.com", " a.b+c@alt.ornek.com.tr ", None, "", "test@", "test"]
+
+    def test_tc_codes(self):
+        """Test that each failure gets its own code"""
+        result = Validators.validate_tc_no_many(self.TC_VALUES[:9])
+
+        assert list(result.codes) == [
+            ValidationCode.OK, ValidationCode.OK, ValidationCode.EMPTY, ValidationCode.EMPTY,
+            ValidationCode.LENGTH, ValidationCode.LENGTH, ValidationCode.LENGTH,
+            ValidationCode.LEADING_ZERO, ValidationCode.CHECKSUM,
+        ]
+        assert [bool(flag) for flag in result.valid] == [True, True] + [False] * 7
+
+    @pytest.mark.parametrize("scalar, batch, values", [
+        (Validators.validate_tc_no, Validators.validate_tc_no_many, TC_VALUES),
+        (Validators.validate_phone, Validators.validate_phone_many, PHONE_VALUES),
+        (Validators.validate_email, Validators.validate_email_many, EMAIL_VALUES),
+    ])
+    def test_matches_scalar_validators(self, scalar, batch, values):
+        """Test that masks and messages equal the one-by-one results"""
+        result = batch(values)
+        errors = result.errors()
+
+        for position, value in enumerate(values):
+            is_valid, msg = scalar(value or "")
+            assert bool(result.valid[position]) == is_valid, value
+            assert errors.get(position) == msg, value
+
+    def test_international_phones(self):
+        """Test the country code argument"""
+        result = Validators.validate_phone_many(["+1 555 123 4567", "12345"], country_code="US")
+
+        assert [bool(flag) for flag in result.valid] == [True, False]
+        assert result.errors() == {1: "Geçersiz telefon numarası"}
+
+    def test_numpy_array_and_int_input(self):
+        """Test arrays and integer TCs (e.g. a numeric spreadsheet column)"""
+        values = [10000000146, 10000000147]
+        if validators.np is not None:
+            values = validators.np.array(values)
+
+        result = Validators.validate_tc_no_many(values)
+
+        assert [bool(flag) for flag in result.valid] == [True, False]
+
+    def test_empty_input(self):
+        """Test that no values give empty results"""
+        result = Validators.validate_tc_no_many([])
+
+        assert len(result.valid) == 0 and result.errors() == {}
@@ -6,7 +6,6 @@ Google Calendar entegrasyonu ile senkronizasyon
 import flet as ft
 from datetime import datetime, timedelta
 from database.db_manager import DatabaseManager
-from database.models import Appointment
 from services.google_calendar_service import GoogleCalendarService
 from services.notification_service import NotificationService
 from utils.logger import app_logger
@@ -19,8 +18,10 @@ class AppointmentsPage:
         self.google_service = GoogleCalendarService(db)
         self.notification_service = NotificationService(db)
         
-        # Seçili tarih
+        # Seçili tarih ve o günün programı (kartlar ve istatistikler aynı listeyi kullanır)
         self.selected_date = datetime.now().date()
+        self.day_schedule = []
+        self.day_schedule_date = None
         
         # Date picker
         self.date_picker = ft.DatePicker(
@@ -238,8 +239,10 @@ class AppointmentsPage:
         try:
             self.appointments_list.controls.clear()
             
-            # Seçili tarihteki randevuları çek
-            appointments = self.db.get_appointments_by_date(self.selected_date)
+            # Seçili tarihteki randevular: hasta/doktor adlarıyla tek sorgu
+            appointments = self.db.get_day_schedule(self.selected_date)
+            self.day_schedule = appointments
+            self.day_schedule_date = self.selected_date
             
             if not appointments:
                 self.appointments_list.controls.append(
@@ -257,9 +260,7 @@ class AppointmentsPage:
                     )
                 )
             else:
-                # Randevuları saate göre sırala
-                appointments.sort(key=lambda x: x.appointment_date)
-                
+                # Randevular saate göre sıralı gelir
                 for appt in appointments:
                     self.appointments_list.controls.append(
                         self._appointment_card(appt)
@@ -275,13 +276,10 @@ class AppointmentsPage:
             ))
     
     def _appointment_card(self, appt):
-        """Randevu kartı"""
-        # Hasta ve doktor bilgilerini çek
-        patient = self.db.get_patient_by_id(appt.patient_id)
-        doctor = self.db.get_user_by_id(appt.doctor_id)
-        
-        patient_name = patient.full_name if patient else "Bilinmeyen"
-        doctor_name = f"Dr. {doctor.full_name}" if doctor else "Bilinmeyen"
+        """Randevu kartı (appt: get_day_schedule satırı)"""
+        patient_name = appt['patient_name'] or "Bilinmeyen"
+        doctor_name = f"Dr. {appt['doctor_name']}" if appt['doctor_name'] else "Bilinmeyen"
+        notes = appt['notes']
         
         # Durum renkleri
         status_colors = {
@@ -290,10 +288,10 @@ class AppointmentsPage:
             "İptal": "red",
             "Görüşülüyor": "blue"
         }
-        status_color = status_colors.get(appt.status, "grey")
+        status_color = status_colors.get(appt['status'], "grey")
         
         # Saat
-        time_str = appt.appointment_date.strftime("%H:%M")
+        time_str = appt['appointment_date'].strftime("%H:%M")
         
         return ft.Card(
             content=ft.Container(
@@ -321,16 +319,16 @@ class AppointmentsPage:
                         ft.Row([
                             ft.Icon(ft.Icons.NOTES, size=14, color="grey"),
                             ft.Text(
-                                appt.notes[:50] + "..." if appt.notes and len(appt.notes) > 50 else appt.notes or "Not yok",
+                                notes[:50] + "..." if len(notes) > 50 else notes,
                                 size=12,
                                 color="grey"
                             )
-                        ], spacing=5) if appt.notes else ft.Container()
+                        ], spacing=5) if notes else ft.Container()
                     ], expand=True, spacing=5),
                     # Sağ: Durum ve aksiyonlar
                     ft.Column([
                         ft.Container(
-                            content=ft.Text(appt.status, size=11, color="white"),
+                            content=ft.Text(appt['status'], size=11, color="white"),
                             bgcolor=status_color,
                             padding=8,
                             border_radius=8
@@ -340,28 +338,28 @@ class AppointmentsPage:
                                 ft.PopupMenuItem(
                                     text="Görüşmeye Başla",
                                     icon=ft.Icons.PLAY_ARROW,
-                                    on_click=lambda _, aid=appt.id: self.update_status(aid, "Görüşülüyor")
+                                    on_click=lambda _, aid=appt['id']: self.update_status(aid, "Görüşülüyor")
                                 ),
                                 ft.PopupMenuItem(
                                     text="Tamamla",
                                     icon=ft.Icons.CHECK_CIRCLE,
-                                    on_click=lambda _, aid=appt.id: self.update_status(aid, "Tamamlandı")
+                                    on_click=lambda _, aid=appt['id']: self.update_status(aid, "Tamamlandı")
                                 ),
                                 ft.PopupMenuItem(
                                     text="İptal Et",
                                     icon=ft.Icons.CANCEL,
-                                    on_click=lambda _, aid=appt.id: self.update_status(aid, "İptal")
+                                    on_click=lambda _, aid=appt['id']: self.update_status(aid, "İptal")
                                 ),
                                 ft.PopupMenuItem(),  # Divider
                                 ft.PopupMenuItem(
                                     text="Düzenle",
                                     icon=ft.Icons.EDIT,
-                                    on_click=lambda _, aid=appt.id: self.edit_appointment(aid)
+                                    on_click=lambda _, aid=appt['id']: self.edit_appointment(aid)
                                 ),
                                 ft.PopupMenuItem(
                                     text="Sil",
                                     icon=ft.Icons.DELETE,
-                                    on_click=lambda _, aid=appt.id: self.delete_appointment(aid)
+                                    on_click=lambda _, aid=appt['id']: self.delete_appointment(aid)
                                 )
                             ]
                         )
@@ -375,12 +373,16 @@ class AppointmentsPage:
     def load_stats(self):
         """Günlük istatistikleri yükle"""
         try:
-            appointments = self.db.get_appointments_by_date(self.selected_date)
+            # load_appointments'ın az önce çektiği listeyi yeniden kullan
+            if self.day_schedule_date == self.selected_date:
+                appointments = self.day_schedule
+            else:
+                appointments = self.db.get_day_schedule(self.selected_date)
             
             total = len(appointments)
-            waiting = len([a for a in appointments if a.status == "Bekliyor"])
-            completed = len([a for a in appointments if a.status == "Tamamlandı"])
-            cancelled = len([a for a in appointments if a.status == "İptal"])
+            waiting = len([a for a in appointments if a['status'] == "Bekliyor"])
+            completed = len([a for a in appointments if a['status'] == "Tamamlandı"])
+            cancelled = len([a for a in appointments if a['status'] == "İptal"])
             
             self.stats_row.controls = [
                 self._stat_badge("Toplam", str(total), "blue"),
@@ -525,33 +527,43 @@ class AppointmentsPage:
                 ))
                 return
             
-            # Appointment objesi oluştur
-            appointment = Appointment(
-                id=None,
-                patient_id=int(self.dd_patient.value),
-                doctor_id=int(self.dd_doctor.value),
+            patient_id = int(self.dd_patient.value)
+            doctor_id = int(self.dd_doctor.value)
+            duration = int(self.txt_duration.value or 30)
+            
+            # Veritabanına kaydet (çakışma kontrolü dahil)
+            success, message, appt_id = self.db.create_appointment(
+                patient_id=patient_id,
+                doctor_id=doctor_id,
                 appointment_date=appointment_datetime,
-                status="Bekliyor",
-                notes=self.txt_notes.value,
-                reminder_sent=False,
-                active_user_id=self.page.session.get("user_id")
+                notes=self.txt_notes.value or "",
+                active_user_id=self.page.session.get("user_id"),
+                duration_minutes=duration
             )
             
-            # Veritabanına kaydet
-            appt_id = self.db.add_appointment(appointment)
+            if not success:
+                # Çakışmaysa aynı gün içindeki ilk boş saati öner
+                if self.db.find_conflicts(doctor_id, appointment_datetime, duration):
+                    free = self.db.find_free_slots(
+                        doctor_id, appointment_datetime,
+                        datetime.combine(self.selected_date, datetime.max.time()),
+                        duration, limit=1
+                    )
+                    if free:
+                        message += f" - ilk boş saat: {free[0][0]:%H:%M}"
+                self.page.open(ft.SnackBar(ft.Text(message), bgcolor="red"))
+                return
             
             # Google Calendar'a ekle
             if self.sw_google_sync.value:
                 try:
-                    patient = self.db.get_patient_by_id(appointment.patient_id)
-                    doctor = self.db.get_user_by_id(appointment.doctor_id)
+                    patient = self.db.get_patient_by_id(patient_id)
+                    doctor = self.db.get_user_info(doctor_id)
                     
                     event_title = f"Randevu: {patient.full_name}"
                     event_description = f"Doktor: Dr. {doctor.full_name}\n"
-                    if appointment.notes:
-                        event_description += f"Notlar: {appointment.notes}"
-                    
-                    duration = int(self.txt_duration.value)
+                    if self.txt_notes.value:
+                        event_description += f"Notlar: {self.txt_notes.value}"
                     
                     success, message = self.google_service.create_event(
                         title=event_title,
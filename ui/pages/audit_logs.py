@@ -256,6 +256,9 @@ class AuditLogsPage:
                     if search_term in str(log).lower()
                 ]
             
+            # Kullanıcı adlarını tek seferde al (satır başına sorgu yok)
+            users = self.db.get_users_by_ids(log[1] for log in logs[:100] if log[1])
+            
             # Tabloyu doldur
             for log in logs[:100]:  # Son 100 kayıt
                 # log: (id, user_id, action_type, description, timestamp, ip_address)
@@ -268,8 +271,9 @@ class AuditLogsPage:
                 
                 time_str = timestamp.strftime("%d.%m.%Y %H:%M") if isinstance(timestamp, datetime) else str(timestamp)
                 
-                # Kullanıcı adını çek
-                user_name = self.db.get_user_name(log[1]) if log[1] else "Sistem"
+                # Kullanıcı adı
+                user = users.get(log[1]) if log[1] else None
+                user_name = user.full_name if user else ("Bilinmeyen" if log[1] else "Sistem")
                 
                 # Renk kodlama
                 action_color = self._get_action_color(log[2])
@@ -356,8 +360,10 @@ class AuditLogsPage:
                 writer = csv.writer(f)
                 writer.writerow(['Tarih', 'Kullanıcı', 'İşlem', 'Açıklama', 'IP'])
                 
+                users = self.db.get_users_by_ids(log[1] for log in logs if log[1])
                 for log in logs:
-                    user_name = self.db.get_user_name(log[1]) if log[1] else "Sistem"
+                    user = users.get(log[1]) if log[1] else None
+                    user_name = user.full_name if user else ("Bilinmeyen" if log[1] else "Sistem")
                     writer.writerow([
                         log[4],  # timestamp
                         user_name,
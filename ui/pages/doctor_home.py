@@ -162,31 +162,21 @@ class DoctorHomePage:
     def load_stats(self):
         """İstatistik kartlarını yükle"""
         try:
-            # Bugünün verileri
-            today = datetime.now().date()
-            today_appointments = self.db.get_appointments_by_date(today)
-            waiting_count = len([a for a in today_appointments if a.status == "Bekliyor"])
-            completed_count = len([a for a in today_appointments if a.status == "Tamamlandı"])
-            
-            # Bu ayın geliri
-            month_start = datetime.now().replace(day=1)
-            month_revenue = self.db.get_total_revenue(month_start, datetime.now())
-            
-            # Toplam hasta
-            total_patients = self.db.get_patient_count()
+            # Tek sorgu (kısa süreli önbellekten)
+            stats = self.db.get_dashboard_stats()
             
             self.stats_row.controls = [
                 self._stat_card(
                     "Bugünkü Randevu",
-                    str(len(today_appointments)),
-                    f"{waiting_count} bekliyor",
+                    str(stats['today_appointments']),
+                    f"{stats['waiting']} bekliyor",
                     ft.Icons.CALENDAR_TODAY,
                     "blue",
                     "/appointments"
                 ),
                 self._stat_card(
                     "Tamamlanan",
-                    str(completed_count),
+                    str(stats['completed']),
                     "Bugün",
                     ft.Icons.CHECK_CIRCLE,
                     "green",
@@ -194,7 +184,7 @@ class DoctorHomePage:
                 ),
                 self._stat_card(
                     "Aylık Gelir",
-                    f"₺{month_revenue:,.0f}",
+                    f"₺{stats['month_income']:,.0f}",
                     "Bu ay",
                     ft.Icons.ATTACH_MONEY,
                     "purple",
@@ -202,7 +192,7 @@ class DoctorHomePage:
                 ),
                 self._stat_card(
                     "Toplam Hasta",
-                    str(total_patients),
+                    str(stats['total_patients']),
                     "Kayıtlı",
                     ft.Icons.PEOPLE,
                     "orange",
@@ -249,9 +239,9 @@ class DoctorHomePage:
         try:
             self.timeline_column.controls.clear()
             
-            # Bugünkü randevular
+            # Bugünkü randevular: hasta adlarıyla tek sorgu
             today = datetime.now().date()
-            appointments = self.db.get_appointments_by_date(today)
+            appointments = self.db.get_day_schedule(today)
             
             if not appointments:
                 self.timeline_column.controls.append(
@@ -265,16 +255,12 @@ class DoctorHomePage:
                     )
                 )
             else:
-                # Randevuları saate göre sırala
-                appointments.sort(key=lambda x: x.appointment_date)
-                
+                # Randevular saate göre sıralı gelir
                 for app in appointments:
-                    # Hasta bilgisini çek
-                    patient = self.db.get_patient_by_id(app.patient_id)
-                    patient_name = patient.full_name if patient else "Bilinmeyen"
+                    patient_name = app['patient_name'] or "Bilinmeyen"
                     
                     # Saat
-                    time_str = app.appointment_date.strftime("%H:%M")
+                    time_str = app['appointment_date'].strftime("%H:%M")
                     
                     # Durum rengi
                     status_colors = {
@@ -283,7 +269,7 @@ class DoctorHomePage:
                         "Görüşülüyor": "blue",
                         "İptal": "red"
                     }
-                    status_color = status_colors.get(app.status, "grey")
+                    status_color = status_colors.get(app['status'], "grey")
                     
                     # Timeline item
                     self.timeline_column.controls.append(
@@ -308,9 +294,9 @@ class DoctorHomePage:
                                 ft.Container(
                                     content=ft.Column([
                                         ft.Text(patient_name, weight="bold", size=15),
-                                        ft.Text(app.notes if app.notes else "Not yok", size=12, color="grey"),
+                                        ft.Text(app['notes'] or "Not yok", size=12, color="grey"),
                                         ft.Container(
-                                            content=ft.Text(app.status, size=10, color="white"),
+                                            content=ft.Text(app['status'], size=10, color="white"),
                                             bgcolor=status_color,
                                             padding=5,
                                             border_radius=5
@@ -324,17 +310,17 @@ class DoctorHomePage:
                                         ft.PopupMenuItem(
                                             text="Görüşmeye Başla",
                                             icon=ft.Icons.PLAY_ARROW,
-                                            on_click=lambda _, aid=app.id: self.start_appointment(aid)
+                                            on_click=lambda _, aid=app['id']: self.start_appointment(aid)
                                         ),
                                         ft.PopupMenuItem(
                                             text="Tamamla",
                                             icon=ft.Icons.CHECK,
-                                            on_click=lambda _, aid=app.id: self.complete_appointment(aid)
+                                            on_click=lambda _, aid=app['id']: self.complete_appointment(aid)
                                         ),
                                         ft.PopupMenuItem(
                                             text="İptal Et",
                                             icon=ft.Icons.CANCEL,
-                                            on_click=lambda _, aid=app.id: self.cancel_appointment(aid)
+                                            on_click=lambda _, aid=app['id']: self.cancel_appointment(aid)
                                         ),
                                     ]
                                 )
@@ -439,7 +425,7 @@ class DoctorHomePage:
             
             # Yarınki randevular
             tomorrow = datetime.now().date() + timedelta(days=1)
-            tomorrow_apps = self.db.get_appointments_by_date(tomorrow)
+            tomorrow_apps = self.db.get_day_schedule(tomorrow)
             if tomorrow_apps:
                 notifications.append({
                     "type": "info",
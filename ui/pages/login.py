@@ -1,6 +1,8 @@
 import flet as ft
 from database.db_manager import DatabaseManager
 from utils.logger import get_logger
+from utils.rate_limiter import rate_limiter
+from utils.exceptions import RateLimitException
 
 logger = get_logger(__name__)
 
@@ -36,6 +38,19 @@ class LoginPage:
             border_radius=10,
             on_submit=self.login_click
         )
+        
+        self.login_button = ft.ElevatedButton(
+            "Oturum Aç",
+            width=280,
+            height=50,
+            style=ft.ButtonStyle(
+                bgcolor="white",
+                color="black",
+                shape=ft.RoundedRectangleBorder(radius=10)
+            ),
+            on_click=self.login_click
+        )
+        self.progress = ft.ProgressRing(width=20, height=20, color="white", visible=False)
     
     def view(self) -> ft.View:
         # Glass effect login card
@@ -49,17 +64,8 @@ class LoginPage:
                 self.pass_input,
                 
                 ft.Container(height=20),
-                ft.ElevatedButton(
-                    "Oturum Aç",
-                    width=280,
-                    height=50,
-                    style=ft.ButtonStyle(
-                        bgcolor="white",
-                        color="black",
-                        shape=ft.RoundedRectangleBorder(radius=10)
-                    ),
-                    on_click=self.login_click
-                ),
+                self.login_button,
+                self.progress,
                 ft.Container(height=10),
                 # Erişilebilirlik Butonu
                 ft.TextButton(
@@ -123,6 +129,9 @@ class LoginPage:
         )
     
     def login_click(self, e):
+        if self.login_button.disabled:
+            return  # önceki deneme sürüyor
+        
         username = self.user_input.value
         password = self.pass_input.value
         
@@ -131,9 +140,24 @@ class LoginPage:
             return
         
         try:
-            user = self.db.authenticate_user(username, password)
+            rate_limiter.check_rate_limit(username.strip().lower(), limit="login")
+        except RateLimitException:
+            wait = int(rate_limiter.get_retry_after(username.strip().lower(), limit="login")) + 1
+            self.show_error(f"Çok fazla giriş denemesi. {wait} saniye sonra tekrar deneyin")
+            return
+        
+        # bcrypt arka planda çalışır, arayüz donmaz
+        self._set_busy(True)
+        future = self.db.authenticate_user_async(username, password)
+        future.add_done_callback(lambda f: self._on_login_done(f, username))
+    
+    def _on_login_done(self, future, username: str):
+        self._set_busy(False)
+        try:
+            user = future.result()
             
             if user:
+                rate_limiter.reset(username.strip().lower(), limit="login")
                 self.page.session.set("user_id", user.id)
                 self.page.session.set("user_name", user.full_name)
                 self.page.session.set("role", user.role.value)
@@ -148,6 +172,11 @@ class LoginPage:
             logger.error(f"Login error: {e}")
             self.show_error("Giriş sırasında bir hata oluştu")
     
+    def _set_busy(self, busy: bool):
+        self.login_button.disabled = busy
+        self.progress.visible = busy
+        self.page.update()
+    
     def toggle_access(self, e):
         if self.page.theme_mode == ft.ThemeMode.LIGHT:
             self.page.theme_mode = ft.ThemeMode.DARK
@@ -346,9 +346,11 @@ class PatientDetailPage:
                 )
             )
         else:
+            doctors = self.db.get_users_by_ids(record.doctor_id for record in records)
             for record in records:
                 # Doktor adı
-                doctor = self.db.get_user_name(record.doctor_id)
+                info = doctors.get(record.doctor_id)
+                doctor = info.full_name if info else "Bilinmeyen"
                 
                 records_list.controls.append(
                     ft.Card(
@@ -3,18 +3,21 @@ Patient List Page - Hasta Listesi
 Gelişmiş arama, filtreleme ve toplu işlemler
 """
 
+import threading
+
 import flet as ft
 from database.db_manager import DatabaseManager
+from services.patient_import_service import PatientImportService
 from utils.logger import app_logger
-from utils.encryption_manager import EncryptionManager
 
 
 
 class PatientListPage:
+    PAGE_SIZE = 60
+    
     def __init__(self, page: ft.Page, db: DatabaseManager):
         self.page = page
         self.db = db
-        self.encryption = EncryptionManager()
         
         # Filtreler
         self.current_filter = "active"
@@ -22,9 +25,10 @@ class PatientListPage:
         self.selected_source = "all"
         self.selected_gender = "all"
         
-        # Cache
-        self.all_patients = []
-        self.filtered_patients = []
+        # Yüklenen sayfalar
+        self.patients = []
+        self.next_cursor = None
+        self.total_count = 0
         
         # UI Components
         self.search_field = ft.TextField(
@@ -82,8 +86,34 @@ class PatientListPage:
             run_spacing=15
         )
         
+        # Izgaranın sonunda, sonraki sayfa varken gösterilir
+        self.load_more_button = ft.Container(
+            content=ft.TextButton(
+                "Daha fazla yükle",
+                icon=ft.Icons.EXPAND_MORE,
+                on_click=self.load_more
+            ),
+            alignment=ft.alignment.center
+        )
+        
+        # Arama sonuçları tek sayfa; kesildiyse kullanıcıya söylenir
+        self.search_capped_note = ft.Container(
+            content=ft.Text(
+                f"İlk {self.PAGE_SIZE} sonuç gösteriliyor, aramayı daraltın",
+                size=12,
+                color="grey"
+            ),
+            alignment=ft.alignment.center
+        )
+        
         self.stats_row = ft.Row(spacing=15)
         
+        # Toplu içe aktarma (CSV / Excel)
+        self.import_picker = ft.FilePicker(on_result=self.on_import_picked)
+        self.page.overlay.append(self.import_picker)
+        self.import_progress = ft.ProgressBar(value=0, color="teal", visible=False)
+        self.import_status = ft.Text("", size=12, color="grey", visible=False)
+        
     def view(self):
         """Ana görünüm"""
         self.load_patients()
@@ -96,12 +126,19 @@ class PatientListPage:
                 ft.Column([
                     ft.Text("Hasta Yönetimi", size=24, weight="bold"),
                     ft.Text(
-                        f"{len(self.all_patients)} hasta kayıtlı",
+                        f"{self.total_count} hasta kayıtlı",
                         size=12,
                         color="grey"
                     )
                 ], spacing=0),
                 ft.Container(expand=True),
+                ft.OutlinedButton(
+                    "İçe Aktar",
+                    icon=ft.Icons.UPLOAD_FILE,
+                    on_click=lambda _: self.import_picker.pick_files(
+                        allowed_extensions=["csv", "xlsx"]
+                    )
+                ),
                 ft.ElevatedButton(
                     "Yeni Hasta Ekle",
                     icon=ft.Icons.PERSON_ADD,
@@ -161,6 +198,8 @@ class PatientListPage:
                 ft.Container(
                     content=ft.Column([
                         header,
+                        self.import_progress,
+                        self.import_status,
                         stats_section,
                         filters_section,
                         grid_container
@@ -174,31 +213,12 @@ class PatientListPage:
         )
     
     def load_patients(self):
-        """Hastaları yükle"""
+        """Hastaları yükle (filtreler değişince ilk sayfadan başlar)"""
         try:
-            # Veritabanından çek
-            if self.current_filter == "active":
-                self.all_patients = self.db.get_active_patients()
-            else:
-                self.all_patients = self.db.get_archived_patients()
-            
-            # Decrypt
-            decrypted_patients = []
-            for patient in self.all_patients:
-                try:
-                    decrypted_patient = patient._replace(
-                        full_name=self.encryption.decrypt(patient.full_name),
-                        tc_no=self.encryption.decrypt(patient.tc_no) if patient.tc_no else "",
-                        phone=self.encryption.decrypt(patient.phone) if patient.phone else "",
-                        address=self.encryption.decrypt(patient.address) if patient.address else ""
-                    )
-                    decrypted_patients.append(decrypted_patient)
-                except Exception as e:
-                    app_logger.error(f"Decryption error for patient {patient.id}: {e}")
-                    decrypted_patients.append(patient)
-            
-            self.all_patients = decrypted_patients
-            self.apply_filters()
+            self.patients = []
+            self.next_cursor = None
+            self.fetch_page()
+            self.render_patients()
             
         except Exception as e:
             app_logger.error(f"Load patients error: {e}")
@@ -207,46 +227,52 @@ class PatientListPage:
                 bgcolor="red"
             ))
     
-    def apply_filters(self):
-        """Filtreleri uygula"""
+    def fetch_page(self):
+        """Sıradaki sayfayı veritabanından çek (filtreler SQL tarafında)
+        
+        Returns:
+            Yeni sayfadaki hastalar
+        """
+        source = self.selected_source
+        gender = self.selected_gender
+        
+        if self.search_term:
+            page = self.db.search_patients(
+                self.search_term, limit=self.PAGE_SIZE,
+                source=source, gender=gender, status=self.current_filter
+            )
+            self.next_cursor = None
+        else:
+            page, self.next_cursor = self.db.list_patients(
+                cursor=self.next_cursor, limit=self.PAGE_SIZE,
+                source=source, gender=gender, status=self.current_filter
+            )
+        
+        self.patients.extend(page)
+        return page
+    
+    def load_more(self, e):
+        """Sonraki sayfa (önceki kartlar yeniden çizilmez)"""
         try:
-            self.filtered_patients = self.all_patients
+            page = self.fetch_page()
             
-            # Arama
-            if self.search_term:
-                term = self.search_term.lower()
-                self.filtered_patients = [
-                    p for p in self.filtered_patients
-                    if term in p.full_name.lower() or
-                       term in (p.tc_no or "").lower() or
-                       term in (p.phone or "").lower()
-                ]
+            controls = self.patient_grid.controls
+            if controls and controls[-1] is self.load_more_button:
+                controls.pop()
+            controls.extend(self._patient_card(patient) for patient in page)
+            if self.next_cursor:
+                controls.append(self.load_more_button)
             
-            # Kaynak filtresi
-            if self.selected_source != "all":
-                self.filtered_patients = [
-                    p for p in self.filtered_patients
-                    if p.source == self.selected_source
-                ]
-            
-            # Cinsiyet filtresi
-            if self.selected_gender != "all":
-                self.filtered_patients = [
-                    p for p in self.filtered_patients
-                    if p.gender == self.selected_gender
-                ]
-            
-            self.render_patients()
-            
-        except Exception as e:
-            app_logger.error(f"Apply filters error: {e}")
+            self.patient_grid.update()
+        except Exception as ex:
+            app_logger.error(f"Load more patients error: {ex}")
     
     def render_patients(self):
         """Hastaları göster"""
         try:
             self.patient_grid.controls.clear()
             
-            if not self.filtered_patients:
+            if not self.patients:
                 self.patient_grid.controls.append(
                     ft.Container(
                         content=ft.Column([
@@ -263,10 +289,15 @@ class PatientListPage:
                     )
                 )
             else:
-                for patient in self.filtered_patients:
+                for patient in self.patients:
                     self.patient_grid.controls.append(
                         self._patient_card(patient)
                     )
+                
+                if self.next_cursor:
+                    self.patient_grid.controls.append(self.load_more_button)
+                elif self.search_term and len(self.patients) >= self.PAGE_SIZE:
+                    self.patient_grid.controls.append(self.search_capped_note)
             
             self.patient_grid.update()
             
@@ -357,19 +388,20 @@ class PatientListPage:
     def load_stats(self):
         """İstatistikleri yükle"""
         try:
-            total = len(self.all_patients)
-            new_count = len([p for p in self.all_patients if p.status == "Yeni"])
-            active_count = len([p for p in self.all_patients if p.status == "Aktif"])
+            if self.current_filter == "active":
+                self.total_count = self.db.count_patients(status="active")
+                new_count = self.db.count_patients(status="Yeni")
+                active_count = self.db.count_patients(status="Aktif")
+            else:
+                self.total_count = self.db.count_patients(status="archived")
+                new_count = active_count = 0
             
             # Kaynak dağılımı
-            sources = {}
-            for p in self.all_patients:
-                sources[p.source] = sources.get(p.source, 0) + 1
-            
-            top_source = max(sources.items(), key=lambda x: x[1]) if sources else ("", 0)
+            sources = self.db.get_patient_sources(status=self.current_filter)
+            top_source = max(sources, key=lambda x: x[1]) if sources else ("", 0)
             
             self.stats_row.controls = [
-                self._stat_badge("Toplam", str(total), "blue"),
+                self._stat_badge("Toplam", str(self.total_count), "blue"),
                 self._stat_badge("Yeni", str(new_count), "green"),
                 self._stat_badge("Aktif", str(active_count), "orange"),
                 self._stat_badge("En Çok", f"{top_source[0]} ({top_source[1]})", "purple")
@@ -394,7 +426,7 @@ class PatientListPage:
     def on_search(self, e):
         """Arama"""
         self.search_term = e.control.value
-        self.apply_filters()
+        self.load_patients()
     
     def on_tab_change(self, e):
         """Sekme değişimi"""
@@ -406,7 +438,7 @@ class PatientListPage:
         """Filtre değişimi"""
         self.selected_source = self.source_filter.value
         self.selected_gender = self.gender_filter.value
-        self.apply_filters()
+        self.load_patients()
     
     def clear_filters(self, e):
         """Filtreleri temizle"""
@@ -416,7 +448,7 @@ class PatientListPage:
         self.search_term = ""
         self.selected_source = "all"
         self.selected_gender = "all"
-        self.apply_filters()
+        self.load_patients()
         self.page.update()
     
     def toggle_archive(self, patient_id):
@@ -442,4 +474,59 @@ class PatientListPage:
             self.page.open(ft.SnackBar(
                 ft.Text(f"Hata: {e}"),
                 bgcolor="red"
-            ))
\ No newline at end of file
+            ))
+    
+    def on_import_picked(self, e: ft.FilePickerResultEvent):
+        """İçe aktarılacak dosya seçildiğinde"""
+        if not e.files:
+            return
+        
+        self.import_progress.value = 0
+        self.import_progress.visible = True
+        self.import_status.value = f"{e.files[0].name} içe aktarılıyor..."
+        self.import_status.visible = True
+        self.page.update()
+        
+        # Büyük dosyalar arayüzü kilitlemesin
+        threading.Thread(
+            target=self.run_import,
+            args=(e.files[0].path,),
+            daemon=True
+        ).start()
+    
+    def run_import(self, path):
+        """Dosyayı içe aktar (thread'de)"""
+        def on_progress(progress):
+            self.import_progress.value = progress.fraction
+            self.import_status.value = (
+                f"{progress.rows_read} satır okundu - "
+                f"{progress.imported} eklendi, {progress.rejected} hatalı"
+            )
+            self.page.update()
+        
+        try:
+            summary = PatientImportService(self.db).import_file(path, progress=on_progress)
+            
+            message = f"{summary.imported} hasta içe aktarıldı"
+            if summary.rejected:
+                message += f", {summary.rejected} satır hatalı (rapor: {summary.reject_path})"
+            self.import_status.value = message
+            
+            self.load_patients()
+            self.load_stats()
+            
+            self.page.open(ft.SnackBar(
+                ft.Text(message),
+                bgcolor="orange" if summary.rejected else "green"
+            ))
+            
+        except Exception as ex:
+            app_logger.error(f"Patient import error: {ex}")
+            self.import_status.value = f"İçe aktarma hatası: {ex}"
+            self.page.open(ft.SnackBar(
+                ft.Text(f"İçe aktarma hatası: {ex}"),
+                bgcolor="red"
+            ))
+        finally:
+            self.import_progress.visible = False
+            self.page.update()
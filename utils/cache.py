@@ -1,84 +1,274 @@
 # utils/cache.py
 
+import heapq
+import logging
+import math
+import sys
+import threading
 import time
-from typing import Any, Optional, Callable
+import weakref
+from typing import Any, Optional, Callable, Dict, Iterable, List, Set, Tuple
 from functools import wraps
 from collections import OrderedDict
 from threading import RLock
 from config import settings
 from .logger import get_logger
+from .disk_cache import DiskCache
 
 logger = get_logger(__name__)
 
+# Marks "not in cache" so that None can be a cached value
+MISSING = object()
+
+# Every cache, so table writes can evict matching tags everywhere
+_all_caches: "weakref.WeakSet" = weakref.WeakSet()
+
+
+# Containers longer than this are sized from an evenly spaced sample
+SAMPLE_THRESHOLD = 256
+SAMPLE_SIZE = 64
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a value in bytes
+    
+    Recursive sys.getsizeof over containers and instance attributes; shared
+    objects are counted once. SQLAlchemy instance state is skipped, it points
+    at the session rather than at data owned by the value. Long containers
+    (query results) are extrapolated from a sample of their elements, so
+    sizing a 20k row list costs about as much as sizing 64 rows.
+    """
+    return _walk([value], set())
+
+
+def _walk(stack: List[Any], seen: Set[int]) -> int:
+    """Internal: sum of sizes reachable from the stack"""
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj, 0)
+        
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(obj, dict):
+            if len(obj) > SAMPLE_THRESHOLD:
+                total += _sampled(list(obj.keys()), seen) + _sampled(list(obj.values()), seen)
+            else:
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            if len(obj) > SAMPLE_THRESHOLD:
+                total += _sampled(obj if isinstance(obj, (list, tuple)) else list(obj), seen)
+            else:
+                stack.extend(obj)
+        else:
+            attrs = getattr(obj, '__dict__', None)
+            if isinstance(attrs, dict):
+                total += sys.getsizeof(attrs, 0)
+                for name, attr in attrs.items():
+                    if not name.startswith('_sa_'):
+                        stack.append(attr)
+            for name in getattr(type(obj), '__slots__', ()):
+                if hasattr(obj, name):
+                    stack.append(getattr(obj, name))
+    return total
+
+
+def _sampled(items, seen: Set[int]) -> int:
+    """Internal: size of all items, extrapolated from SAMPLE_SIZE of them"""
+    step = len(items) / SAMPLE_SIZE
+    sample = [items[int(i * step)] for i in range(SAMPLE_SIZE)]
+    return _walk(sample, seen) * len(items) // SAMPLE_SIZE
+
 
 class LRUCache:
     """Thread-safe LRU (Least Recently Used) cache"""
     
-    def __init__(self, max_size: int = None, ttl_seconds: int = None):
+    def __init__(
+        self, max_size: int = None, ttl_seconds: int = None,
+        max_bytes: int = None, sizer: Callable[[Any], int] = None,
+        disk: Optional[DiskCache] = None, quiet: bool = False
+    ):
         """Initialize cache
         
         Args:
             max_size: Maximum number of items to cache
             ttl_seconds: Time-to-live for cached items in seconds
+            max_bytes: Byte budget (default CACHE_MAX_BYTES, 0 = count items only)
+            sizer: Estimates a value's size in bytes (default estimate_size)
+            disk: Persistent second tier; misses fall through to it and
+                every set is written through (values must be picklable)
+            quiet: Log init and clear at DEBUG (shards of a ShardedLRUCache,
+                which logs once for all of them)
         """
         self.max_size = max_size or settings.CACHE_MAX_SIZE
         self.ttl_seconds = ttl_seconds or settings.CACHE_TTL_SECONDS
+        self.max_bytes = settings.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.sizer = sizer or estimate_size
+        self.disk = disk
         self.enabled = settings.ENABLE_CACHE
+        self._log_level = logging.DEBUG if quiet else logging.INFO
         
         self._cache = OrderedDict()
-        self._timestamps = {}
+        self._sizes: Dict[str, int] = {}  # only filled in byte-budget mode
+        self._bytes = 0
+        self._expires: Dict[str, float] = {}  # key -> absolute expiry time
+        self._expiry_heap: List[Tuple[float, str]] = []  # may hold outdated pairs
         self._lock = RLock()
         
-        logger.info(f"Cache initialized - Max size: {self.max_size}, TTL: {self.ttl_seconds}s")
+        # Extra seconds an expired entry survives sweeps (stale-while-revalidate)
+        self.stale_grace = 0.0
+        
+        # Tag -> keys and key -> tags (e.g. table names an entry was built from)
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Tuple[str, ...]] = {}
+        self._tag_versions: Dict[str, int] = {}
+        self._clears = 0
+        self._invalidations = 0  # any invalidate_tags/clear, guards disk promotion
+        
+        # Counters for get_stats()
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._evictions = 0
+        self._disk_hits = 0
+        
+        _all_caches.add(self)
+        logger.log(
+            self._log_level,
+            f"Cache initialized - Max size: {self.max_size}, "
+            f"Max bytes: {self.max_bytes or '-'}, TTL: {self.ttl_seconds}s"
+        )
     
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
         """Get value from cache
         
         Args:
             key: Cache key
+            default: Returned if not found/expired (use MISSING to tell
+                a cached None apart from a miss)
+            
+        Returns:
+            Cached value or default if not found/expired
+        """
+        return self.lookup(key, default)[0]
+    
+    def lookup(self, key: str, default: Any = None, max_stale: float = 0) -> Tuple[Any, bool]:
+        """Get value and whether it is past its TTL
+        
+        Args:
+            key: Cache key
+            default: Returned if not found/expired
+            max_stale: Seconds past the TTL during which an expired value
+                is still returned (flagged as stale) instead of deleted
             
         Returns:
-            Cached value or None if not found/expired
+            Tuple of (value or default, is_stale)
         """
         if not self.enabled:
-            return None
+            return default, False
         
         with self._lock:
-            if key not in self._cache:
-                return None
-            
-            # Check TTL
-            if self._is_expired(key):
+            if key in self._cache:
+                # Check TTL
+                overdue = time.time() - self._expires[key]
+                stale = overdue > 0
+                if not stale or overdue <= max_stale:
+                    # Move to end (most recently used)
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    return self._cache[key], stale
+                
                 self._delete(key)
-                return None
-            
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            return self._cache[key]
+                self._expirations += 1
+            self._misses += 1
+            invalidations = self._invalidations
+        
+        # Second tier, read outside the lock
+        if self.disk is not None:
+            found = self.disk.lookup(key)
+            if found is not None:
+                value, expires_at, tags = found
+                size = self.sizer(value) if self.max_bytes else 0
+                with self._lock:
+                    self._disk_hits += 1
+                    # Promote unless an invalidation ran during the disk read
+                    if invalidations == self._invalidations:
+                        self._store(key, value, expires_at - time.time(), size, tags)
+                return value, False
+        
+        return default, False
     
-    def set(self, key: str, value: Any) -> None:
+    def set(
+        self, key: str, value: Any, tags: Iterable[str] = None,
+        version: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
         """Set value in cache
         
         Args:
             key: Cache key
             value: Value to cache
+            tags: Tags the value depends on (see invalidate_tags)
+            version: tags_version(tags) read before the value was computed;
+                the value is dropped if one of its tags was invalidated since
+            ttl: Time-to-live for this entry (default ttl_seconds)
         """
         if not self.enabled:
             return
         
+        # Measure outside the lock, sizing a large result takes a while
+        size = self.sizer(value) if self.max_bytes else 0
+        
         with self._lock:
-            # Update existing key
-            if key in self._cache:
-                self._cache.move_to_end(key)
-            
-            # Add new key
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
-            
-            # Evict oldest if over max size
-            if len(self._cache) > self.max_size:
-                oldest_key = next(iter(self._cache))
-                self._delete(oldest_key)
+            if version is not None and version != self.tags_version(tags or ()):
+                return
+            self._store(key, value, ttl, size, tags)
+        
+        if self.disk is not None:
+            self.disk.set(key, value, self.ttl_seconds if ttl is None else ttl, tags or ())
+    
+    def _store(
+        self, key: str, value: Any, ttl: Optional[float], size: int,
+        tags: Iterable[str] = None
+    ) -> None:
+        """Internal memory insert (not thread-safe)"""
+        # A value over the whole budget would only flush everything else
+        if size > self.max_bytes > 0:
+            self._delete(key)
+            logger.debug(f"Cache skip: {key} ({size} bytes > {self.max_bytes})")
+            return
+        
+        # Update existing key
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._untag(key)
+            self._bytes -= self._sizes.pop(key, 0)
+        
+        # Add new key
+        if size:
+            self._sizes[key] = size
+            self._bytes += size
+        expires_at = time.time() + (self.ttl_seconds if ttl is None else ttl)
+        self._cache[key] = value
+        self._expires[key] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._compact_heap()
+        if tags:
+            self._key_tags[key] = tuple(tags)
+            for tag in self._key_tags[key]:
+                self._tags.setdefault(tag, set()).add(key)
+        
+        # Evict oldest while over max size or byte budget
+        while len(self._cache) > self.max_size or (
+            self.max_bytes and self._bytes > self.max_bytes
+        ):
+            oldest_key = next(iter(self._cache))
+            self._delete(oldest_key)
+            self._evictions += 1
     
     def delete(self, key: str) -> bool:
         """Delete key from cache
@@ -90,50 +280,109 @@ class LRUCache:
             True if key was deleted, False if not found
         """
         with self._lock:
-            return self._delete(key)
+            deleted = self._delete(key)
+        if self.disk is not None:
+            deleted = self.disk.delete(key) or deleted
+        return deleted
     
     def clear(self) -> None:
         """Clear all cached items"""
         with self._lock:
             self._cache.clear()
-            self._timestamps.clear()
-            logger.info("Cache cleared")
+            self._expires.clear()
+            self._expiry_heap.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self._tags.clear()
+            self._key_tags.clear()
+            self._clears += 1
+            self._invalidations += 1
+            logger.log(self._log_level, "Cache cleared")
+        if self.disk is not None:
+            self.disk.clear()
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry carrying one of the tags
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._delete(key)
+            self._invalidations += 1
+        if self.disk is not None:
+            self.disk.invalidate_tags(*tags)
+        return len(keys)
+    
+    def tags_version(self, tags: Iterable[str]) -> int:
+        """Counter that grows whenever one of the tags is invalidated"""
+        return self._clears + sum(self._tag_versions.get(tag, 0) for tag in tags)
     
     def _delete(self, key: str) -> bool:
         """Internal delete method (not thread-safe)"""
         if key in self._cache:
             del self._cache[key]
-            del self._timestamps[key]
+            del self._expires[key]
+            self._bytes -= self._sizes.pop(key, 0)
+            self._untag(key)
             return True
         return False
     
+    def _untag(self, key: str) -> None:
+        """Internal tag cleanup (not thread-safe)"""
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+    
     def _is_expired(self, key: str) -> bool:
         """Check if cache entry has expired"""
-        if key not in self._timestamps:
+        if key not in self._expires:
             return True
-        
-        age = time.time() - self._timestamps[key]
-        return age > self.ttl_seconds
+        return time.time() > self._expires[key]
     
-    def cleanup_expired(self) -> int:
-        """Remove expired entries
+    def _compact_heap(self) -> None:
+        """Internal: rebuild the heap without outdated pairs (not thread-safe)"""
+        self._expiry_heap = [(expires_at, key) for key, expires_at in self._expires.items()]
+        heapq.heapify(self._expiry_heap)
+    
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """Remove expired entries, earliest expiry first
+        
+        Only due entries are touched (O(k log n) for k removals), so the
+        lock is never held for a scan of the whole cache.
         
+        Args:
+            max_items: Stop after this many removals (one sweep slice)
+            
         Returns:
             Number of entries removed
         """
+        removed = 0
         with self._lock:
-            expired_keys = [
-                key for key in self._cache.keys()
-                if self._is_expired(key)
-            ]
-            
-            for key in expired_keys:
+            deadline = time.time() - self.stale_grace
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= deadline:
+                if max_items is not None and removed >= max_items:
+                    break
+                expires_at, key = heapq.heappop(heap)
+                # Skip pairs left behind by re-set or deleted keys
+                if self._expires.get(key) != expires_at:
+                    continue
                 self._delete(key)
-            
-            if expired_keys:
-                logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
-            
-            return len(expired_keys)
+                removed += 1
+            self._expirations += removed
+        
+        if removed:
+            logger.debug(f"Cleaned up {removed} expired cache entries")
+        return removed
     
     def get_stats(self) -> dict:
         """Get cache statistics"""
@@ -141,43 +390,435 @@ class LRUCache:
             return {
                 'size': len(self._cache),
                 'max_size': self.max_size,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'tags': len(self._tags),
                 'enabled': self.enabled,
-                'ttl_seconds': self.ttl_seconds
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': _hit_ratio(self._hits, self._misses),
+                'expirations': self._expirations,
+                'evictions': self._evictions,
+                'expiry_heap': len(self._expiry_heap),
+                'disk_hits': self._disk_hits,
+                'disk': self.disk.get_stats() if self.disk is not None else None
             }
 
 
-def cached(ttl_seconds: int = None, key_prefix: str = ""):
+class ShardedLRUCache:
+    """LRU cache split into independently locked shards
+    
+    Keys are hashed to one of N LRUCache segments, so threads touching
+    different keys do not wait on a single lock. LRU order and max_size
+    are per shard (max_size is divided evenly). Same interface as LRUCache.
+    """
+    
+    def __init__(
+        self, max_size: int = None, ttl_seconds: int = None, shards: int = None,
+        max_bytes: int = None, sizer: Callable[[Any], int] = None
+    ):
+        """Initialize cache
+        
+        Args:
+            max_size: Maximum number of items across all shards
+            ttl_seconds: Time-to-live for cached items in seconds
+            shards: Number of segments (default CACHE_SHARDS)
+            max_bytes: Byte budget across all shards (default CACHE_MAX_BYTES);
+                each shard gets an equal part, which also caps a single value
+            sizer: Estimates a value's size in bytes (default estimate_size)
+        """
+        self.shard_count = max(1, shards or settings.CACHE_SHARDS)
+        self.max_size = max_size or settings.CACHE_MAX_SIZE
+        self.ttl_seconds = ttl_seconds or settings.CACHE_TTL_SECONDS
+        self.max_bytes = settings.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        
+        shard_size = max(1, math.ceil(self.max_size / self.shard_count))
+        shard_bytes = math.ceil(self.max_bytes / self.shard_count)
+        self._shards: List[LRUCache] = []
+        for _ in range(self.shard_count):
+            shard = LRUCache(
+                max_size=shard_size, ttl_seconds=self.ttl_seconds,
+                max_bytes=shard_bytes, sizer=sizer, quiet=True
+            )
+            # Tag invalidation must go through this object (see set)
+            _all_caches.discard(shard)
+            self._shards.append(shard)
+        
+        self._version_lock = RLock()
+        self._tag_versions: Dict[str, int] = {}
+        self._clears = 0
+        
+        _all_caches.add(self)
+        logger.info(
+            f"Sharded cache initialized - Shards: {self.shard_count}, Max size: {self.max_size}, "
+            f"Max bytes: {self.max_bytes or '-'}, TTL: {self.ttl_seconds}s"
+        )
+    
+    @property
+    def enabled(self) -> bool:
+        return self._shards[0].enabled
+    
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        for shard in self._shards:
+            shard.enabled = value
+    
+    def _shard(self, key: str) -> LRUCache:
+        return self._shards[hash(key) % self.shard_count]
+    
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Get value from cache (default if not found/expired)"""
+        return self._shard(key).get(key, default)
+    
+    def lookup(self, key: str, default: Any = None, max_stale: float = 0) -> Tuple[Any, bool]:
+        """Get value and whether it is past its TTL (see LRUCache.lookup)"""
+        return self._shard(key).lookup(key, default, max_stale)
+    
+    def set(
+        self, key: str, value: Any, tags: Iterable[str] = None,
+        version: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
+        """Set value in cache (see LRUCache.set)"""
+        tags = tuple(tags or ())
+        shard = self._shard(key)
+        if version is not None and version != self.tags_version(tags):
+            return
+        
+        shard.set(key, value, tags=tags, ttl=ttl)
+        # Re-check after inserting: invalidate_tags bumps versions before it
+        # deletes, so an invalidation racing this set removes the entry either way
+        if version is not None and version != self.tags_version(tags):
+            shard.delete(key)
+    
+    def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        return self._shard(key).delete(key)
+    
+    def clear(self) -> None:
+        """Clear all shards"""
+        with self._version_lock:
+            self._clears += 1
+        for shard in self._shards:
+            shard.clear()
+        logger.info("Cache cleared")
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry carrying one of the tags from all shards"""
+        with self._version_lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+        return sum(shard.invalidate_tags(*tags) for shard in self._shards)
+    
+    def tags_version(self, tags: Iterable[str]) -> int:
+        """Counter that grows whenever one of the tags is invalidated"""
+        with self._version_lock:
+            return self._clears + sum(self._tag_versions.get(tag, 0) for tag in tags)
+    
+    @property
+    def stale_grace(self) -> float:
+        return self._shards[0].stale_grace
+    
+    @stale_grace.setter
+    def stale_grace(self, value: float) -> None:
+        for shard in self._shards:
+            shard.stale_grace = value
+    
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """Remove expired entries from all shards (max_items per shard)"""
+        return sum(shard.cleanup_expired(max_items) for shard in self._shards)
+    
+    def get_stats(self) -> dict:
+        """Aggregate statistics plus the per-shard breakdown"""
+        shards = [shard.get_stats() for shard in self._shards]
+        totals = {
+            field: sum(stats[field] for stats in shards)
+            for field in ('size', 'bytes', 'tags', 'hits', 'misses', 'expirations', 'evictions')
+        }
+        return {
+            **totals,
+            'max_size': self.max_size,
+            'max_bytes': self.max_bytes,
+            'enabled': self.enabled,
+            'ttl_seconds': self.ttl_seconds,
+            'hit_ratio': _hit_ratio(totals['hits'], totals['misses']),
+            'shard_count': self.shard_count,
+            'shards': [
+                {field: stats[field] for field in (
+                    'size', 'bytes', 'hits', 'misses', 'hit_ratio', 'expirations', 'evictions'
+                )}
+                for stats in shards
+            ]
+        }
+
+
+def _hit_ratio(hits: int, misses: int) -> float:
+    lookups = hits + misses
+    return round(hits / lookups, 4) if lookups else 0.0
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on"""
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+    
+    def wait(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def cached(
+    ttl_seconds: int = None, key_prefix: str = "",
+    tags: Iterable[str] = None, cache_attr: str = None, shards: int = None,
+    stale_seconds: float = 0, cache_none: bool = False
+):
     """Decorator for caching function results
     
+    Concurrent misses on the same key are coalesced: one caller runs the
+    function, the others wait for its result (or its exception).
+    
     Args:
         ttl_seconds: Override default TTL
         key_prefix: Prefix for cache key
+        tags: Tags (table names) the result depends on; entries are evicted
+            when invalidate_tags() is called for one of them
+        cache_attr: For methods, name of the instance attribute holding the
+            LRUCache to use; ``self`` is then left out of the cache key
+        shards: Use a ShardedLRUCache with this many segments
+        stale_seconds: Stale-while-revalidate window; for this long after
+            the TTL an expired value is returned immediately while one
+            background thread refreshes it
+        cache_none: Also cache None results; by default a None result is
+            not stored, so the next call runs the function again (for
+            functions where None is a real answer rather than a failure)
     """
+    tags = tuple(tags or ())
+    
     def decorator(func: Callable) -> Callable:
-        cache = LRUCache(ttl_seconds=ttl_seconds)
+        if cache_attr:
+            own_cache = None
+        elif shards:
+            own_cache = ShardedLRUCache(ttl_seconds=ttl_seconds, shards=shards)
+        else:
+            own_cache = LRUCache(ttl_seconds=ttl_seconds)
+        if own_cache is not None and stale_seconds:
+            own_cache.stale_grace = stale_seconds
+        
+        inflight: Dict[Tuple[int, str], _Flight] = {}
+        inflight_lock = threading.Lock()
+        
+        def compute(cache, cache_key: str, args, kwargs) -> Any:
+            """Run func once per key, concurrent callers share the result"""
+            flight_key = (id(cache), cache_key)
+            with inflight_lock:
+                flight = inflight.get(flight_key)
+                leader = flight is None
+                if leader:
+                    flight = inflight[flight_key] = _Flight()
+            
+            if not leader:
+                logger.debug(f"Cache wait: {cache_key}")
+                return flight.wait()
+            
+            try:
+                version = cache.tags_version(tags)
+                result = func(*args, **kwargs)
+                
+                # Store in cache (skipped if a tag was invalidated meanwhile)
+                if result is not None or cache_none:
+                    cache.set(cache_key, result, tags=tags, version=version, ttl=ttl_seconds)
+                flight.result = result
+                return result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                flight.done.set()
+                with inflight_lock:
+                    inflight.pop(flight_key, None)
+        
+        def refresh(cache, cache_key: str, args, kwargs) -> None:
+            with inflight_lock:
+                if (id(cache), cache_key) in inflight:
+                    return
+            
+            def run():
+                try:
+                    compute(cache, cache_key, args, kwargs)
+                except Exception as e:
+                    logger.warning(f"Background cache refresh failed ({cache_key}): {e}")
+            
+            threading.Thread(target=run, name="cache-refresh", daemon=True).start()
         
         @wraps(func)
         def wrapper(*args, **kwargs):
+            if cache_attr:
+                cache = getattr(args[0], cache_attr)
+                key_args = args[1:]
+            else:
+                cache = own_cache
+                key_args = args
+            
             # Generate cache key
-            cache_key = f"{key_prefix}{func.__name__}:{str(args)}:{str(kwargs)}"
+            cache_key = f"{key_prefix}{func.__name__}:{str(key_args)}:{str(kwargs)}"
             
             # Try to get from cache
-            result = cache.get(cache_key)
-            if result is not None:
-                logger.debug(f"Cache hit: {cache_key}")
+            result, stale = cache.lookup(cache_key, MISSING, max_stale=stale_seconds)
+            if result is not MISSING:
+                if stale:
+                    logger.debug(f"Cache stale hit: {cache_key}")
+                    refresh(cache, cache_key, args, kwargs)
+                else:
+                    logger.debug(f"Cache hit: {cache_key}")
                 return result
             
             # Execute function
             logger.debug(f"Cache miss: {cache_key}")
-            result = func(*args, **kwargs)
-            
-            # Store in cache
-            cache.set(cache_key, result)
-            return result
+            return compute(cache, cache_key, args, kwargs)
         
+        wrapper.cache = own_cache
         return wrapper
     return decorator
 
 
-# Global cache instance
-global_cache = LRUCache()
\ No newline at end of file
+def invalidate_tags(*tags: str) -> int:
+    """Evict entries carrying any of the tags from every cache
+    
+    Returns:
+        Number of entries removed
+    """
+    return sum(cache.invalidate_tags(*tags) for cache in list(_all_caches))
+
+
+def invalidate_on_commit(session_factory, on_written: Callable[[Set[str]], None] = None):
+    """Evict cache tags for the tables a session wrote, once it commits
+    
+    Written tables are collected on flush (ORM objects) and on bulk
+    insert/update/delete statements, then invalidated after commit.
+    Rolled back writes invalidate nothing.
+    
+    Args:
+        session_factory: sessionmaker (or Session class) to listen on
+        on_written: Optional callback receiving the set of written tables
+    """
+    from sqlalchemy import event
+    
+    def written(session) -> set:
+        return session.info.setdefault('written_tables', set())
+    
+    @event.listens_for(session_factory, "after_flush")
+    def _after_flush(session, flush_context):
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            table = getattr(obj, '__table__', None)
+            if table is not None:
+                written(session).add(table.name)
+    
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _on_execute(orm_execute_state):
+        # Bulk statements bypass the flush
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            table = getattr(orm_execute_state.statement, 'table', None)
+            if table is not None:
+                written(orm_execute_state.session).add(table.name)
+    
+    @event.listens_for(session_factory, "after_commit")
+    def _after_commit(session):
+        tables = session.info.pop('written_tables', None)
+        if tables:
+            invalidate_tags(*tables)
+            if on_written:
+                on_written(tables)
+    
+    @event.listens_for(session_factory, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop('written_tables', None)
+
+
+class CacheSweeper:
+    """Daemon thread that evicts due entries from every cache
+    
+    Works in slices of at most slice_size removals per cache, releasing the
+    cache lock between slices so readers are never stalled by a full sweep.
+    """
+    
+    def __init__(self, interval: float = None, slice_size: int = None):
+        """
+        Args:
+            interval: Seconds between sweeps (default CACHE_SWEEP_INTERVAL_SECONDS)
+            slice_size: Max removals per cache per lock hold (default CACHE_SWEEP_SLICE)
+        """
+        self.interval = interval or settings.CACHE_SWEEP_INTERVAL_SECONDS or 30
+        self.slice_size = slice_size or settings.CACHE_SWEEP_SLICE
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="CacheSweeper", daemon=True)
+        self._thread.start()
+        logger.info(f"Cache sweeper started - interval: {self.interval}s, slice: {self.slice_size}")
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+    
+    def sweep(self) -> int:
+        """Run one sweep over all caches
+        
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for cache in list(_all_caches):
+            while not self._stop.is_set():
+                count = cache.cleanup_expired(self.slice_size)
+                removed += count
+                if count < self.slice_size:
+                    break
+                time.sleep(0)  # let waiting readers take the lock
+        return removed
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Cache sweep failed: {e}")
+
+
+_sweeper: Optional[CacheSweeper] = None
+
+
+def start_sweeper(interval: float = None, slice_size: int = None) -> CacheSweeper:
+    """Start the shared background sweeper (no-op if already running)"""
+    global _sweeper
+    if _sweeper is None or not _sweeper.is_running:
+        _sweeper = CacheSweeper(interval, slice_size)
+        _sweeper.start()
+    return _sweeper
+
+
+def stop_sweeper() -> None:
+    """Stop the shared background sweeper"""
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.stop()
+        _sweeper = None
+
+
+# Global cache instance (shared by UI and background threads)
+global_cache = ShardedLRUCache()
\ No newline at end of file
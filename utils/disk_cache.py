@@ -0,0 +1,330 @@
+# utils/disk_cache.py
+
+"""Persistent cache tier for slow external lookups
+
+Values are pickled, sealed with the application's Fernet key and stored in a
+small SQLite file keyed by a SHA-256 of the cache key, so RSS feeds and AI
+answers survive a restart. Fernet authenticates every blob, so a file edited
+by anyone without the key is never unpickled, and patient data in AI prompts
+is not stored in plaintext. Used behind LRUCache
+(``LRUCache(disk=get_disk_cache("news"))``): memory misses fall through to
+disk, and disk hits are promoted back into memory. Each name gets its own
+file, so clearing one service's cache leaves the others alone.
+"""
+
+import hashlib
+import pickle  # nosec B403 - only blobs authenticated by Fernet are unpickled
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from cryptography.fernet import InvalidToken
+
+from config import settings
+from .logger import get_logger
+from .encryption_manager import encryption_manager
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key_hash TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    tags TEXT NOT NULL DEFAULT '',
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires_at);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (accessed_at);
+"""
+
+
+class DiskCache:
+    """SQLite-backed cache with TTL and size-bounded LRU eviction
+
+    Disk errors never reach the caller: a failed read is a miss and a
+    failed write is skipped (both logged).
+    """
+
+    def __init__(self, path: Path = None, max_bytes: int = None):
+        """Initialize disk cache (the file is opened on first use)
+
+        Args:
+            path: SQLite file (default DISK_CACHE_PATH, relative to BASE_DIR)
+            max_bytes: Budget for stored values (default DISK_CACHE_MAX_BYTES)
+        """
+        path = Path(path or settings.DISK_CACHE_PATH)
+        self.path = path if path.is_absolute() else settings.BASE_DIR / path
+        self.max_bytes = max_bytes or settings.DISK_CACHE_MAX_BYTES
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._known_tags: Set[str] = set()
+
+        # Counters for get_stats()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def hash_key(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Internal: open the file and load totals (caller holds the lock)"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+
+            self._bytes = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()[0]
+            for (tags,) in conn.execute("SELECT DISTINCT tags FROM cache_entries WHERE tags != ''"):
+                self._known_tags.update(tag for tag in tags.split(",") if tag)
+
+            self._conn = conn
+            logger.info(f"Disk cache opened - {self.path} ({self._bytes} bytes)")
+        return self._conn
+
+    @staticmethod
+    def _seal(blob: bytes) -> bytes:
+        """Internal: encrypt and authenticate a pickled value"""
+        return encryption_manager.cipher.encrypt(blob)
+
+    @staticmethod
+    def _unseal(blob: bytes) -> bytes:
+        """Internal: verify and decrypt a stored value
+
+        Raises:
+            InvalidToken: If the blob was not sealed with this key
+        """
+        return encryption_manager.cipher.decrypt(blob)
+
+    def lookup(self, key: str) -> Optional[Tuple[Any, float, Tuple[str, ...]]]:
+        """Get a value with its absolute expiry time and tags
+
+        Returns:
+            (value, expires_at, tags) or None if not found/expired
+        """
+        key_hash = self.hash_key(key)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT value, expires_at, size, tags FROM cache_entries WHERE key_hash = ?",
+                    (key_hash,)
+                ).fetchone()
+
+                if row is None or row[1] <= now:
+                    if row is not None:
+                        conn.execute("DELETE FROM cache_entries WHERE key_hash = ?", (key_hash,))
+                        self._bytes -= row[2]
+                    self._misses += 1
+                    return None
+
+            try:
+                value = pickle.loads(self._unseal(row[0]))  # nosec B301 - authenticated first
+            except InvalidToken:
+                # Another key or a tampered file; never unpickle it
+                logger.warning(f"Disk cache entry failed authentication, dropped ({self.path.name})")
+                return self._drop_unreadable(key)
+            except Exception as e:
+                # E.g. a class renamed since the value was stored
+                logger.warning(f"Disk cache entry could not be unpickled, dropped: {e}")
+                return self._drop_unreadable(key)
+
+            with self._lock:
+                self._connection().execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE key_hash = ?", (now, key_hash)
+                )
+                self._hits += 1
+            return value, row[1], tuple(tag for tag in row[3].split(",") if tag)
+        except Exception as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return None
+
+    def _drop_unreadable(self, key: str) -> None:
+        """Internal: delete an entry that cannot be read back, counted as a miss"""
+        self.delete(key)
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get value (default if not found/expired)"""
+        found = self.lookup(key)
+        return default if found is None else found[0]
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> bool:
+        """Store a value for ttl seconds
+
+        Returns:
+            True if stored
+        """
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Disk cache skip (not picklable): {e}")
+            return False
+        blob = self._seal(blob)
+
+        size = len(blob)
+        if size > self.max_bytes:
+            return False
+
+        tags = tuple(tags or ())
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                old = conn.execute(
+                    "SELECT size FROM cache_entries WHERE key_hash = ?", (self.hash_key(key),)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(key_hash, value, size, tags, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.hash_key(key), blob, size,
+                     f",{','.join(tags)}," if tags else "", now + ttl, now)
+                )
+                self._bytes += size - (old[0] if old else 0)
+                self._known_tags.update(tags)
+
+                if self._bytes > self.max_bytes:
+                    self._evict(conn, now)
+            return True
+        except Exception as e:
+            logger.warning(f"Disk cache write failed: {e}")
+            return False
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Internal: drop expired, then least recently used rows until under budget"""
+        cursor = conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        if cursor.rowcount:
+            self._bytes = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()[0]
+
+        while self._bytes > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key_hash, size FROM cache_entries ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._bytes = 0
+                break
+            for key_hash, size in rows:
+                conn.execute("DELETE FROM cache_entries WHERE key_hash = ?", (key_hash,))
+                self._bytes -= size
+                self._evictions += 1
+                if self._bytes <= self.max_bytes:
+                    break
+
+    def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                key_hash = self.hash_key(key)
+                row = conn.execute(
+                    "SELECT size FROM cache_entries WHERE key_hash = ?", (key_hash,)
+                ).fetchone()
+                if row is None:
+                    return False
+                conn.execute("DELETE FROM cache_entries WHERE key_hash = ?", (key_hash,))
+                self._bytes -= row[0]
+                return True
+        except Exception as e:
+            logger.warning(f"Disk cache delete failed: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Delete all entries"""
+        try:
+            with self._lock:
+                self._connection().execute("DELETE FROM cache_entries")
+                self._bytes = 0
+                self._known_tags.clear()
+        except Exception as e:
+            logger.warning(f"Disk cache clear failed: {e}")
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry carrying one of the tags
+
+        Returns:
+            Number of entries removed
+        """
+        if self._conn is None and not self.path.exists():
+            return 0
+        if self._conn is not None and not self._known_tags.intersection(tags):
+            return 0  # nothing tagged like this, skip the disk round trip
+
+        removed = 0
+        try:
+            with self._lock:
+                conn = self._connection()
+                for tag in set(tags) & self._known_tags:
+                    pattern = f"%,{tag},%"
+                    freed = conn.execute(
+                        "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE tags LIKE ?",
+                        (pattern,)
+                    ).fetchone()[0]
+                    removed += conn.execute(
+                        "DELETE FROM cache_entries WHERE tags LIKE ?", (pattern,)
+                    ).rowcount
+                    self._bytes -= freed
+                    self._known_tags.discard(tag)
+        except Exception as e:
+            logger.warning(f"Disk cache invalidation failed: {e}")
+        return removed
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock:
+            entries = 0
+            if self._conn is not None:
+                entries = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                'path': str(self.path),
+                'entries': entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions
+            }
+
+    def close(self) -> None:
+        """Close the file (reopened on next use)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_shared: Dict[str, DiskCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_disk_cache(name: str) -> Optional[DiskCache]:
+    """Disk tier for one cache, or None when DISK_CACHE_ENABLED is off
+
+    Args:
+        name: Cache name; stored next to DISK_CACHE_PATH as <stem>_<name>.db
+    """
+    if not settings.DISK_CACHE_ENABLED:
+        return None
+    with _shared_lock:
+        if name not in _shared:
+            base = Path(settings.DISK_CACHE_PATH)
+            _shared[name] = DiskCache(base.with_name(f"{base.stem}_{name}{base.suffix}"))
+        return _shared[name]
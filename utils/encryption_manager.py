@@ -1,5 +1,10 @@
+import hashlib
+import hmac
 import logging
-from typing import Optional
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
 
 from cryptography.fernet import Fernet, InvalidToken
 
@@ -7,13 +12,33 @@ from config import settings
 
 logger = logging.getLogger("EncryptionManager")
 
+_decrypt_executor: Optional[ThreadPoolExecutor] = None
+_decrypt_executor_lock = threading.Lock()
+
+
+def _decrypt_workers() -> int:
+    return settings.DECRYPT_WORKERS or min(4, os.cpu_count() or 1)
+
+
+def _get_decrypt_executor() -> ThreadPoolExecutor:
+    """Toplu şifre çözme için paylaşılan iş parçacığı havuzu"""
+    global _decrypt_executor
+    with _decrypt_executor_lock:
+        if _decrypt_executor is None:
+            _decrypt_executor = ThreadPoolExecutor(
+                max_workers=_decrypt_workers(),
+                thread_name_prefix="decrypt"
+            )
+        return _decrypt_executor
+
 
 class EncryptionManager:
     """Uygulama genelinde kullanılan basit şifreleme yöneticisi."""
 
-    def __init__(self, key: Optional[str] = None):
+    def __init__(self, key: Optional[str] = None, index_key: Optional[str] = None):
         self.key = self._resolve_key(key)
         self.cipher = Fernet(self.key)
+        self.index_key = self._resolve_index_key(index_key)
 
     def _resolve_key(self, key: Optional[str]) -> bytes:
         if key:
@@ -29,6 +54,16 @@ class EncryptionManager:
         )
         return generated_key
 
+    def _resolve_index_key(self, index_key: Optional[str]) -> bytes:
+        if index_key:
+            return index_key.encode() if isinstance(index_key, str) else index_key
+
+        if settings.BLIND_INDEX_KEY:
+            return settings.BLIND_INDEX_KEY.encode()
+
+        # Ayrı bir anahtar verilmemişse şifreleme anahtarından türet
+        return hmac.new(self.key, b"krats-blind-index", hashlib.sha256).digest()
+
     def encrypt(self, plain_text: str) -> str:
         if not plain_text:
             return ""  # Allow empty strings for optional fields
@@ -50,5 +85,97 @@ class EncryptionManager:
             logger.error(f"Şifre çözme hatası: {exc}")
             raise RuntimeError(f"Decryption failed: {exc}") from exc
 
+    def decrypt_many(
+        self, values: Sequence[Optional[str]], parallel: Optional[bool] = None
+    ) -> List[str]:
+        """Birden çok değeri tek çağrıda çözer.
+
+        Büyük listeler iş parçacığı havuzuna parçalar halinde dağıtılır
+        (cryptography şifre çözerken GIL'i bırakır).
+
+        Args:
+            values: Şifreli değerler (boş/None değerler "" döner)
+            parallel: Havuz kullanımı; None ise DECRYPT_PARALLEL_THRESHOLD'a göre
+        """
+        return self._run_batched(self._decrypt_chunk, values, parallel)
+
+    def encrypt_many(
+        self, values: Sequence[Optional[str]], parallel: Optional[bool] = None
+    ) -> List[str]:
+        """Birden çok değeri tek çağrıda şifreler (toplu kayıt için).
+
+        decrypt_many ile aynı havuzu ve DECRYPT_PARALLEL_THRESHOLD eşiğini
+        kullanır; boş/None değerler "" döner.
+        """
+        return self._run_batched(self._encrypt_chunk, values, parallel)
+
+    def _run_batched(
+        self, chunk_function, values: Sequence[Optional[str]], parallel: Optional[bool]
+    ) -> List[str]:
+        """Değerleri tek parça halinde ya da havuza bölerek işler, sırayı korur"""
+        values = list(values)
+        workers = _decrypt_workers()
+        if parallel is None:
+            parallel = len(values) >= settings.DECRYPT_PARALLEL_THRESHOLD
+
+        if not parallel or workers < 2 or len(values) < 2:
+            return chunk_function(values)
+
+        chunk_size = -(-len(values) // workers)
+        chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+        result: List[str] = []
+        for part in _get_decrypt_executor().map(chunk_function, chunks):
+            result.extend(part)
+        return result
+
+    def decrypt_rows(
+        self, rows: Sequence[Dict[str, Any]], columns: Sequence[str],
+        parallel: Optional[bool] = None
+    ) -> Sequence[Dict[str, Any]]:
+        """Satırlardaki verilen sütunları yerinde çözer ve satırları döndürür"""
+        cells = [row[column] for row in rows for column in columns]
+        plain = iter(self.decrypt_many(cells, parallel=parallel))
+        for row in rows:
+            for column in columns:
+                row[column] = next(plain)
+        return rows
+
+    def _decrypt_chunk(self, values: Sequence[Optional[str]]) -> List[str]:
+        decrypt = self.cipher.decrypt
+        try:
+            return [decrypt(value).decode() if value else "" for value in values]
+        except InvalidToken as exc:
+            logger.error(f"Şifre çözme hatası (anahtar uyumsuz): {exc}")
+            raise RuntimeError(f"Decryption failed - invalid token: {exc}") from exc
+        except Exception as exc:
+            logger.error(f"Şifre çözme hatası: {exc}")
+            raise RuntimeError(f"Decryption failed: {exc}") from exc
+
+    def _encrypt_chunk(self, values: Sequence[Optional[str]]) -> List[str]:
+        encrypt = self.cipher.encrypt
+        try:
+            return [encrypt(str(value).encode()).decode() if value else "" for value in values]
+        except Exception as exc:
+            logger.error(f"Şifreleme hatası: {exc}")
+            raise RuntimeError(f"Encryption failed: {exc}") from exc
+
+    def blind_index(self, value: str, purpose: str = "", length: Optional[int] = None) -> str:
+        """Aranabilir alanlar için deterministik HMAC-SHA256 özeti üretir.
+
+        Fernet rastgele IV kullandığından aynı değer her seferinde farklı
+        şifrelenir; eşitlik sorguları bu özet üzerinden yapılır.
+
+        Args:
+            value: Normalize edilmiş düz metin
+            purpose: Alan ayracı (aynı değerin farklı alanlarda eşleşmemesi için)
+            length: Hex özetin kırpılacağı uzunluk (None = tam uzunluk)
+        """
+        if not value:
+            return ""
+        message = f"{purpose}:{value}".encode()
+        digest = hmac.new(self.index_key, message, hashlib.sha256).hexdigest()
+        return digest[:length] if length else digest
+
 
-encryption_manager = EncryptionManager()
\ No newline at end of file
+encryption_manager = EncryptionManager()
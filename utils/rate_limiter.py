@@ -1,8 +1,9 @@
 # utils/rate_limiter.py
 
+import math
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from threading import Lock
 from config import settings
 from .logger import get_logger
@@ -11,104 +12,223 @@ from .exceptions import RateLimitException
 logger = get_logger(__name__)
 
 
-class RateLimiter:
-    """Token bucket rate limiter"""
-    
+class RateLimit(NamedTuple):
+    """A limit class: `requests` per `period_seconds`, bursting up to `burst`"""
+    requests: int
+    period_seconds: float
+    burst: Optional[int] = None  # default: requests
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds one request 'costs'"""
+        return self.period_seconds / self.requests
+
+    @property
+    def tolerance(self) -> float:
+        """How far the theoretical arrival time may run ahead of now"""
+        return self.emission_interval * (self.burst or self.requests)
+
+
+def default_limits() -> Dict[str, RateLimit]:
+    """Limit classes configured in settings"""
+    return {
+        'default': RateLimit(settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW_SECONDS),
+        'login': RateLimit(settings.RATE_LIMIT_LOGIN_ATTEMPTS, settings.RATE_LIMIT_LOGIN_WINDOW_SECONDS),
+        'sms': RateLimit(settings.RATE_LIMIT_SMS_REQUESTS, settings.RATE_LIMIT_SMS_WINDOW_SECONDS),
+    }
+
+
+class _Stripe:
+    """One lock and its identifiers -> theoretical arrival time (LRU order)"""
+    __slots__ = ('lock', 'tats')
+
     def __init__(self):
-        self.enabled = settings.RATE_LIMIT_ENABLED
-        self.max_requests = settings.RATE_LIMIT_REQUESTS
-        self.window_seconds = settings.RATE_LIMIT_WINDOW_SECONDS
-        
-        # Storage: {identifier: (count, window_start_time)}
-        self.storage: Dict[str, Tuple[int, float]] = defaultdict(lambda: (0, time.time()))
         self.lock = Lock()
-    
-    def check_rate_limit(self, identifier: str) -> bool:
-        """Check if request is within rate limit
-        
+        self.tats: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+
+
+class RateLimiter:
+    """GCRA (generic cell rate algorithm) rate limiter
+
+    Each identifier costs one float: its theoretical arrival time (TAT).
+    A request is allowed while TAT - now stays within the limit's
+    tolerance, which is a smooth sliding window without fixed-window
+    edge bursts. Identifiers are spread over independently locked
+    stripes, each capped in LRU order so memory stays bounded.
+    """
+
+    def __init__(
+        self, limits: Dict[str, RateLimit] = None,
+        max_identifiers: int = None, stripes: int = None
+    ):
+        """Initialize limiter
+
+        Args:
+            limits: Limit classes by name (default: default_limits())
+            max_identifiers: Tracked identifiers across all stripes
+                (default RATE_LIMIT_MAX_IDENTIFIERS)
+            stripes: Number of lock stripes (default RATE_LIMIT_SHARDS)
+        """
+        self.enabled = settings.RATE_LIMIT_ENABLED
+        self.limits: Dict[str, RateLimit] = dict(limits or default_limits())
+        self.limits.setdefault(
+            'default', RateLimit(settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW_SECONDS)
+        )
+        self.max_requests = self.limits['default'].requests
+        self.window_seconds = self.limits['default'].period_seconds
+
+        self.stripe_count = max(1, stripes or settings.RATE_LIMIT_SHARDS)
+        self.max_identifiers = max_identifiers or settings.RATE_LIMIT_MAX_IDENTIFIERS
+        self._stripe_capacity = max(1, math.ceil(self.max_identifiers / self.stripe_count))
+        self._stripes: List[_Stripe] = [_Stripe() for _ in range(self.stripe_count)]
+
+    def add_limit(self, name: str, requests: int, period_seconds: float, burst: int = None) -> None:
+        """Register or replace a limit class"""
+        self.limits[name] = RateLimit(requests, period_seconds, burst)
+
+    def _limit(self, name: str) -> RateLimit:
+        try:
+            return self.limits[name]
+        except KeyError:
+            raise ValueError(f"Unknown rate limit class: {name}")
+
+    def _stripe(self, key: Tuple[str, str]) -> _Stripe:
+        return self._stripes[hash(key) % self.stripe_count]
+
+    def check_rate_limit(self, identifier: str, limit: str = 'default') -> bool:
+        """Check if request is within rate limit (and count it)
+
         Args:
             identifier: Unique identifier (user_id, ip_address, etc.)
-            
+            limit: Limit class name (e.g. 'login', 'sms')
+
         Returns:
-            True if within limit, False otherwise
-            
+            True if within limit
+
         Raises:
             RateLimitException: If rate limit exceeded
         """
         if not self.enabled:
             return True
-        
-        with self.lock:
-            current_time = time.time()
-            count, window_start = self.storage[identifier]
-            
-            # Check if window has expired
-            if current_time - window_start >= self.window_seconds:
-                # Reset window
-                self.storage[identifier] = (1, current_time)
-                return True
-            
-            # Within window
-            if count >= self.max_requests:
-                logger.warning(f"Rate limit exceeded for {identifier}")
+
+        rule = self._limit(limit)
+        key = (limit, identifier)
+        stripe = self._stripe(key)
+
+        with stripe.lock:
+            now = time.monotonic()
+            new_tat = max(stripe.tats.get(key, now), now) + rule.emission_interval
+
+            if new_tat - now > rule.tolerance + 1e-6:  # float slack
+                retry_after = new_tat - rule.tolerance - now
+                logger.warning(f"Rate limit exceeded for {identifier} ({limit})")
                 raise RateLimitException(
-                    f"Rate limit exceeded. Max {self.max_requests} requests per {self.window_seconds} seconds"
+                    f"Rate limit exceeded. Max {rule.requests} requests per "
+                    f"{rule.period_seconds:g} seconds, retry in {math.ceil(retry_after)} s"
                 )
-            
-            # Increment counter
-            self.storage[identifier] = (count + 1, window_start)
+
+            stripe.tats[key] = new_tat
+            stripe.tats.move_to_end(key)
+            if len(stripe.tats) > self._stripe_capacity:
+                stripe.tats.popitem(last=False)
             return True
-    
-    def get_remaining_requests(self, identifier: str) -> int:
-        """Get remaining requests in current window
-        
+
+    def get_remaining_requests(self, identifier: str, limit: str = 'default') -> int:
+        """Get requests that would be allowed right now (read-only)
+
         Args:
             identifier: Unique identifier
-            
+            limit: Limit class name
+
         Returns:
             Number of remaining requests
         """
+        rule = self._limit(limit)
         if not self.enabled:
-            return self.max_requests
-        
-        with self.lock:
-            current_time = time.time()
-            count, window_start = self.storage.get(identifier, (0, current_time))
-            
-            # Window expired
-            if current_time - window_start >= self.window_seconds:
-                return self.max_requests
-            
-            return max(0, self.max_requests - count)
-    
-    def reset(self, identifier: str = None):
+            return rule.requests
+
+        key = (limit, identifier)
+        stripe = self._stripe(key)
+        with stripe.lock:
+            now = time.monotonic()
+            tat = stripe.tats.get(key, now)
+
+        used = max(0.0, tat - now)
+        return max(0, int((rule.tolerance - used) / rule.emission_interval + 1e-9))
+
+    def get_retry_after(self, identifier: str, limit: str = 'default') -> float:
+        """Seconds until the next request would be allowed (0 if now)"""
+        rule = self._limit(limit)
+        key = (limit, identifier)
+        stripe = self._stripe(key)
+        with stripe.lock:
+            now = time.monotonic()
+            tat = stripe.tats.get(key, now)
+        return max(0.0, tat + rule.emission_interval - rule.tolerance - now)
+
+    def reset(self, identifier: str = None, limit: str = None):
         """Reset rate limiter for specific identifier or all
-        
+
         Args:
             identifier: Specific identifier to reset, or None for all
+            limit: Only this limit class (default: every class)
         """
-        with self.lock:
-            if identifier:
-                if identifier in self.storage:
-                    del self.storage[identifier]
-            else:
-                self.storage.clear()
-    
-    def cleanup_expired(self):
-        """Remove expired entries from storage"""
-        with self.lock:
-            current_time = time.time()
-            expired = [
-                key for key, (_, window_start) in self.storage.items()
-                if current_time - window_start >= self.window_seconds
-            ]
-            
-            for key in expired:
-                del self.storage[key]
-            
-            if expired:
-                logger.debug(f"Cleaned up {len(expired)} expired rate limit entries")
+        if identifier is not None and limit is not None:
+            key = (limit, identifier)
+            stripe = self._stripe(key)
+            with stripe.lock:
+                stripe.tats.pop(key, None)
+            return
+
+        for stripe in self._stripes:
+            with stripe.lock:
+                if identifier is None and limit is None:
+                    stripe.tats.clear()
+                    continue
+                for key in [
+                    key for key in stripe.tats
+                    if (identifier is None or key[1] == identifier)
+                    and (limit is None or key[0] == limit)
+                ]:
+                    del stripe.tats[key]
+
+    def cleanup_expired(self) -> int:
+        """Remove identifiers whose TAT has passed (they carry no state)
+
+        Not required for bounded memory (the LRU cap handles that), only
+        to release it early.
+
+        Returns:
+            Number of identifiers removed
+        """
+        removed = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                now = time.monotonic()
+                expired = [key for key, tat in stripe.tats.items() if tat <= now]
+                for key in expired:
+                    del stripe.tats[key]
+                removed += len(expired)
+
+        if removed:
+            logger.debug(f"Cleaned up {removed} expired rate limit entries")
+        return removed
+
+    def get_stats(self) -> dict:
+        """Tracked identifiers per limit class"""
+        counts: Dict[str, int] = {name: 0 for name in self.limits}
+        for stripe in self._stripes:
+            with stripe.lock:
+                for limit, _ in stripe.tats:
+                    counts[limit] = counts.get(limit, 0) + 1
+        return {
+            'enabled': self.enabled,
+            'tracked': sum(counts.values()),
+            'max_identifiers': self.max_identifiers,
+            'stripes': self.stripe_count,
+            'by_limit': counts
+        }
 
 
 # Global instance
-rate_limiter = RateLimiter()
\ No newline at end of file
+rate_limiter = RateLimiter()
@@ -1,13 +1,37 @@
 import os
+import time
 import logging
 import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import bcrypt  # Şifreler için (Login)
 from cryptography.fernet import Fernet # Veriler için (TC, Tel vb.)
 
+from config import settings
+
 # Loglama ayarı
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger("SecurityManager")
 
+# Kalibrasyonun seçebileceği bcrypt maliyet aralığı
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+# bcrypt GIL'i bıraktığı için thread havuzu yeterli; tüm örnekler paylaşır
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _hash_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.PASSWORD_HASH_WORKERS),
+                thread_name_prefix="bcrypt"
+            )
+        return _executor
+
 class SecurityManager:
     def __init__(self):
         # 1. Veri Şifreleme Anahtarını Yükle (Fernet)
@@ -17,6 +41,9 @@ class SecurityManager:
         except Exception as e:
             logger.critical(f"Şifreleme anahtarı hatalı! Hata: {e}")
             raise e
+        
+        # bcrypt maliyeti: hedef süre verilmişse ilk kullanımda kalibre edilir
+        self.rounds = None if settings.PASSWORD_HASH_TARGET_MS > 0 else settings.PASSWORD_SALT_ROUNDS
 
     def _load_key(self):
         """
@@ -42,6 +69,58 @@ class SecurityManager:
 
     # --- PASSWORD BÖLÜMÜ (BCRYPT - GÜVENLİ) ---
     
+    @property
+    def target_rounds(self) -> int:
+        """Yeni hash'lerde kullanılan bcrypt maliyeti"""
+        if self.rounds is None:
+            self.rounds = self.calibrate_rounds()
+        return self.rounds
+    
+    @staticmethod
+    def _measure_hash_ms(rounds: int) -> float:
+        """Tek bir hashpw süresi (ms), 3 denemenin en hızlısı"""
+        salt = bcrypt.gensalt(rounds=rounds)
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            bcrypt.hashpw(b"calibration", salt)
+            best = min(best, (time.perf_counter() - started) * 1000)
+        return best
+    
+    def calibrate_rounds(self, target_ms: float = None, sample_rounds: int = 8) -> int:
+        """Bu makinede hedef süreyi aşmayan en yüksek bcrypt maliyetini seçer
+        
+        Ucuz bir maliyette ölçüp her +1 maliyetin süreyi ikiye katlamasından
+        tahmin eder, sonuç MIN_ROUNDS..MAX_ROUNDS aralığına sıkıştırılır.
+        """
+        target_ms = target_ms or settings.PASSWORD_HASH_TARGET_MS or 250
+        sample_ms = max(self._measure_hash_ms(sample_rounds), 0.001)
+        
+        rounds = sample_rounds
+        while rounds < MAX_ROUNDS and sample_ms * 2 ** (rounds + 1 - sample_rounds) <= target_ms:
+            rounds += 1
+        rounds = max(MIN_ROUNDS, min(MAX_ROUNDS, rounds))
+        
+        logger.info(
+            f"bcrypt kalibrasyonu: {rounds} tur "
+            f"(~{sample_ms * 2 ** (rounds - sample_rounds):.0f} ms, hedef {target_ms} ms)"
+        )
+        return rounds
+    
+    @staticmethod
+    def hash_rounds(stored_hash: str):
+        """Kayıtlı hash'in bcrypt maliyeti ($2b$12$... -> 12), geçersizse None"""
+        try:
+            prefix, version, cost = stored_hash.split('$')[:3]
+            return int(cost) if prefix == '' and version.startswith('2') else None
+        except (AttributeError, ValueError):
+            return None
+    
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """Hash'in maliyeti hedeften farklıysa True (girişte yeniden hashlenir)"""
+        rounds = self.hash_rounds(stored_hash)
+        return rounds is not None and rounds != self.target_rounds
+    
     def hash_password(self, password: str) -> str:
         """Şifreyi BCrypt ile güvenli hashler (Yavaş ve Tuzlu)"""
         if not password:
@@ -50,7 +129,7 @@ class SecurityManager:
             # String -> Bytes
             password_bytes = password.encode('utf-8')
             # Salt + Hash
-            salt = bcrypt.gensalt()
+            salt = bcrypt.gensalt(rounds=self.target_rounds)
             hashed = bcrypt.hashpw(password_bytes, salt)
             # Bytes -> String (Veritabanı için)
             return hashed.decode('utf-8')
@@ -70,6 +149,20 @@ class SecurityManager:
         except Exception as e:
             logger.error(f"Doğrulama hatası: {e}")
             return False
+    
+    # --- ARKA PLAN (UI thread'ini bloklamamak için) ---
+    
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """fn'i şifre işçi havuzunda çalıştırır"""
+        return _hash_executor().submit(fn, *args, **kwargs)
+    
+    def hash_password_async(self, password: str) -> Future:
+        """hash_password'ün arka plan sürümü (asyncio için: asyncio.wrap_future)"""
+        return self.submit(self.hash_password, password)
+    
+    def verify_password_async(self, provided_password: str, stored_hash: str) -> Future:
+        """verify_password'ün arka plan sürümü; Future sonucu bool'dur"""
+        return self.submit(self.verify_password, provided_password, stored_hash)
 
     def validate_password_strength(self, password: str) -> tuple:
         if len(password) < 4:
@@ -1,10 +1,18 @@
 # utils/validators.py
 
 import re
-from typing import Tuple, Optional
+from enum import IntEnum
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Tuple, Optional
 from datetime import datetime
 from .logger import get_logger
 
+# Optional: batch validators use array arithmetic when NumPy is installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Email and URL validation using simple regex patterns
 # If validators library is needed, install: pip install validators
 EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
@@ -20,6 +28,59 @@ URL_PATTERN = re.compile(
 logger = get_logger(__name__)
 
 
+class ValidationCode(IntEnum):
+    """Error codes returned by the batch validators"""
+    OK = 0
+    EMPTY = 1
+    LENGTH = 2
+    LEADING_ZERO = 3
+    CHECKSUM = 4
+    FORMAT = 5
+
+
+TC_MESSAGES = {
+    ValidationCode.EMPTY: "TC Kimlik No boş olamaz",
+    ValidationCode.LENGTH: "TC Kimlik No 11 haneli olmalıdır",
+    ValidationCode.LEADING_ZERO: "TC Kimlik No 0 ile başlayamaz",
+    ValidationCode.CHECKSUM: "Geçersiz TC Kimlik No",
+    ValidationCode.FORMAT: "TC Kimlik No doğrulanamadı",
+}
+PHONE_MESSAGES = {
+    ValidationCode.EMPTY: "Telefon numarası boş olamaz",
+    ValidationCode.FORMAT: "Geçersiz telefon numarası (5XXXXXXXXX formatında olmalı)",
+}
+INTERNATIONAL_PHONE_MESSAGES = {
+    ValidationCode.EMPTY: "Telefon numarası boş olamaz",
+    ValidationCode.FORMAT: "Geçersiz telefon numarası",
+}
+EMAIL_MESSAGES = {
+    ValidationCode.EMPTY: "E-posta adresi boş olamaz",
+    ValidationCode.FORMAT: "Geçersiz e-posta adresi",
+}
+
+# Longer values are rare and go through the scalar validator instead of
+# widening the whole digit matrix
+_MAX_BATCH_WIDTH = 32
+
+
+class BatchValidation(NamedTuple):
+    """Result of a batch validator, aligned with its input
+
+    valid and codes are NumPy arrays when NumPy is installed, lists otherwise.
+    """
+    valid: Any  # bool mask
+    codes: Any  # ValidationCode per value (OK where valid)
+    messages: Mapping[int, str]  # code -> message of the scalar validator
+
+    def errors(self) -> Dict[int, str]:
+        """{position: error message} for the invalid values"""
+        if np is not None and isinstance(self.codes, np.ndarray):
+            positions = np.flatnonzero(self.codes).tolist()
+        else:
+            positions = [i for i, code in enumerate(self.codes) if code]
+        return {i: self.messages[int(self.codes[i])] for i in positions}
+
+
 class Validators:
     """Data validation utilities"""
     
@@ -250,4 +311,166 @@ class Validators:
             return True, None
             
         except (ValueError, TypeError):
-            return False, "Geçersiz sayısal değer"
\ No newline at end of file
+            return False, "Geçersiz sayısal değer"
+    
+    # ==================== BATCH ====================
+    
+    @staticmethod
+    def validate_tc_no_many(values: Iterable[Any]) -> BatchValidation:
+        """Validate many Turkish ID numbers at once (imports, data audits)
+        
+        Same rules and messages as validate_tc_no; with NumPy the digits of
+        all values are checked as one matrix.
+        
+        Args:
+            values: Sequence or NumPy array of TC numbers (str, int or None)
+            
+        Returns:
+            BatchValidation
+        """
+        texts = _texts(values)
+        if np is None:
+            return _scalar_batch(Validators.validate_tc_no, texts, TC_MESSAGES)
+        
+        digits, lengths, empty, scalar = _digit_matrix(texts, 11)
+        lead_zero = digits[:, 0] == 0
+        check1 = (digits[:, 0:9:2].sum(axis=1) * 7 - digits[:, 1:8:2].sum(axis=1)) % 10 == digits[:, 9]
+        check2 = digits[:, 0:10].sum(axis=1) % 10 == digits[:, 10]
+        
+        codes = np.select(
+            [empty, lengths != 11, lead_zero, ~(check1 & check2)],
+            [ValidationCode.EMPTY, ValidationCode.LENGTH, ValidationCode.LEADING_ZERO,
+             ValidationCode.CHECKSUM],
+            ValidationCode.OK
+        ).astype(np.uint8)
+        return _finish_batch(codes, scalar, texts, Validators.validate_tc_no, TC_MESSAGES)
+    
+    @staticmethod
+    def validate_phone_many(values: Iterable[Any], country_code: str = 'TR') -> BatchValidation:
+        """Validate many phone numbers at once
+        
+        Args:
+            values: Sequence or NumPy array of phone numbers
+            country_code: Country code, as in validate_phone
+            
+        Returns:
+            BatchValidation
+        """
+        texts = _texts(values)
+        messages = PHONE_MESSAGES if country_code == 'TR' else INTERNATIONAL_PHONE_MESSAGES
+        validate = partial(Validators.validate_phone, country_code=country_code)
+        if np is None:
+            return _scalar_batch(validate, texts, messages)
+        
+        digits, lengths, empty, scalar = _digit_matrix(texts, 2)
+        if country_code == 'TR':
+            valid = ((lengths == 10) & (digits[:, 0] == 5)) | (
+                (lengths == 12) & (digits[:, 0] == 9) & (digits[:, 1] == 0)
+            )
+        else:
+            valid = (lengths >= 10) & (lengths <= 15)
+        
+        codes = np.select(
+            [empty, ~valid], [ValidationCode.EMPTY, ValidationCode.FORMAT], ValidationCode.OK
+        ).astype(np.uint8)
+        return _finish_batch(codes, scalar, texts, validate, messages)
+    
+    @staticmethod
+    def validate_email_many(values: Iterable[Any]) -> BatchValidation:
+        """Validate many email addresses at once
+        
+        A regex has no array form, so this is one compiled match per value;
+        it exists so imports can treat all fields the same way.
+        
+        Args:
+            values: Sequence or NumPy array of email addresses
+            
+        Returns:
+            BatchValidation
+        """
+        match = EMAIL_PATTERN.match
+        ok, empty, invalid = int(ValidationCode.OK), int(ValidationCode.EMPTY), int(ValidationCode.FORMAT)
+        codes = (
+            empty if not text else ok if match(text.strip()) else invalid
+            for text in _texts(values)
+        )
+        if np is not None:
+            codes = np.fromiter(codes, dtype=np.uint8)
+            return BatchValidation(codes == ok, codes, EMAIL_MESSAGES)
+        codes = list(codes)
+        return BatchValidation([code == ok for code in codes], codes, EMAIL_MESSAGES)
+
+
+# ==================== BATCH HELPERS ====================
+
+def _texts(values: Iterable[Any]) -> List[str]:
+    """Values as strings; None becomes "" (empty)"""
+    if np is not None and isinstance(values, np.ndarray):
+        values = values.tolist()
+    return ["" if value is None else str(value) for value in values]
+
+
+def _digit_matrix(texts: List[str], min_width: int):
+    """Digits of every value as rows of one matrix
+    
+    Non-digits are dropped as in the scalar validators (re.sub on \\D): a
+    stable sort moves each row's digits to the front, in order.
+    
+    Returns:
+        (digits, lengths, empty, scalar) where digits is (n, width) with
+        garbage after each row's length, and scalar marks values the matrix
+        cannot represent (very long or non-ASCII), to be checked one by one
+    """
+    count = len(texts)
+    text_lengths = np.fromiter(map(len, texts), dtype=np.int64, count=count)
+    too_long = np.flatnonzero(text_lengths > _MAX_BATCH_WIDTH)
+    if too_long.size:
+        texts = list(texts)
+        for i in too_long.tolist():
+            texts[i] = ""
+    
+    width = max(min_width, int(text_lengths.max(initial=0, where=text_lengths <= _MAX_BATCH_WIDTH)))
+    packed = np.array(texts, dtype=f"U{width}")
+    codepoints = packed.view(np.uint32).reshape(count, width)
+    
+    is_digit = (codepoints >= 48) & (codepoints <= 57)
+    digits = codepoints.astype(np.int16) - 48
+    # Only rows with separators ("532 123 45 67") need their digits moved up;
+    # the zero padding after short values is not a separator
+    dirty = np.flatnonzero((~is_digit & (codepoints != 0)).any(axis=1))
+    if dirty.size:
+        order = np.argsort(~is_digit[dirty], axis=1, kind="stable")
+        digits[dirty] = np.take_along_axis(digits[dirty], order, axis=1)
+    lengths = is_digit.sum(axis=1)
+    empty = text_lengths == 0
+    
+    # Python's \d also matches non-ASCII digits; leave those to the scalar path
+    scalar = (codepoints > 127).any(axis=1)
+    scalar[too_long] = True
+    return digits, lengths, empty, scalar
+
+
+def _finish_batch(
+    codes, scalar, texts: List[str], validate: Callable[[str], Tuple[bool, Optional[str]]],
+    messages: Mapping[int, str]
+) -> BatchValidation:
+    """Fill in the rows marked for the scalar validator"""
+    for i in np.flatnonzero(scalar).tolist():
+        codes[i] = _scalar_code(validate, texts[i], messages)
+    return BatchValidation(codes == ValidationCode.OK, codes, messages)
+
+
+def _scalar_batch(validate, texts: List[str], messages: Mapping[int, str]) -> BatchValidation:
+    """Batch result from the scalar validator (without NumPy)"""
+    codes = [_scalar_code(validate, text, messages) for text in texts]
+    return BatchValidation([code == ValidationCode.OK for code in codes], codes, messages)
+
+
+def _scalar_code(validate, text: str, messages: Mapping[int, str]) -> ValidationCode:
+    is_valid, error = validate(text)
+    if is_valid:
+        return ValidationCode.OK
+    for code, message in messages.items():
+        if message == error:
+            return code
+    return ValidationCode.FORMAT